@@ -0,0 +1,119 @@
+"""
+Benchmark the hot paths of :class:`rainwaveclient.RainwaveClient` against the
+local stand-in API in ``mock_api.py``, so no network access or API key is
+needed. For each scenario it reports the median and best wall time, the number
+of API calls, and the memory allocated at the peak, as measured by
+:mod:`tracemalloc` in a separate run. Every run starts from a new client, so
+nothing is cached yet; the setup of a scenario is not measured.
+
+    uv run benchmarks/client.py [--latency SECONDS] [--repeat N]
+
+Use ``--latency`` to see how the paths that make many calls behave on a real
+network.
+"""
+
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+import tracemalloc
+import typing
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1] / "src"))
+
+from mock_api import MockRainwaveAPI
+
+import rainwaveclient
+
+ALBUM_ID = 42
+ARTIST_ID = 7
+
+
+def channel(rw: rainwaveclient.RainwaveClient) -> rainwaveclient.RainwaveChannel:
+    return rw.channels[0]
+
+
+def catalog_album(rw: rainwaveclient.RainwaveClient) -> rainwaveclient.RainwaveAlbum:
+    """Return an album from the catalog, which does not include its songs."""
+
+    chan = channel(rw)
+    chan.albums
+    return chan.get_album_by_id(ALBUM_ID)
+
+
+def catalog_artist(
+    rw: rainwaveclient.RainwaveClient,
+) -> rainwaveclient.RainwaveArtist:
+    """Return an artist from the catalog, which does not include its songs."""
+
+    chan = channel(rw)
+    chan.artists
+    return chan.get_artist_by_id(ARTIST_ID)
+
+
+def candidates(chan: rainwaveclient.RainwaveChannel) -> list:
+    return [c.title for c in chan.schedule_current.candidates]
+
+
+# name, setup (returns the argument of run), run
+SCENARIOS = [
+    ("channels", lambda rw: rw, lambda rw: rw.channels),
+    ("albums", channel, lambda chan: chan.albums),
+    ("RainwaveAlbum.songs", catalog_album, lambda album: album.songs),
+    ("RainwaveArtist.songs", catalog_artist, lambda artist: artist.songs),
+    ("requests", channel, lambda chan: chan.requests),
+    ("user_requests", channel, lambda chan: chan.user_requests),
+    ("election candidates", channel, candidates),
+]
+
+
+def measure(
+    api: MockRainwaveAPI,
+    setup: typing.Callable,
+    run: typing.Callable,
+    trace: bool = False,
+) -> tuple[float, int, int]:
+    """Run a scenario once on a new client and return the wall time, the
+    number of API calls, and the peak memory allocated in bytes (if
+    ``trace``)."""
+
+    rw = rainwaveclient.RainwaveClient(1, "benchmark")
+    rw.base_url = api.base_url
+    arg = setup(rw)
+    calls = api.calls.total()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    run(arg)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    calls = api.calls.total() - calls
+    rw.pool.clear()
+    return elapsed, calls, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'scenario':22} {'median':>9} {'best':>9} {'calls':>6} {'peak':>10}")
+    with MockRainwaveAPI(latency=args.latency) as api:
+        for name, setup, run in SCENARIOS:
+            times = []
+            for _ in range(args.repeat):
+                elapsed, calls, _ = measure(api, setup, run)
+                times.append(elapsed)
+            _, _, peak = measure(api, setup, run, trace=True)
+            print(
+                f"{name:22} {statistics.median(times) * 1000:7.1f}ms "
+                f"{min(times) * 1000:7.1f}ms {calls:6} {peak / 1024:7.0f}KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
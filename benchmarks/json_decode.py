@@ -0,0 +1,136 @@
+"""
+Benchmark the JSON decoders in :mod:`rainwaveclient.decoder` on API responses.
+Pass the paths of recorded responses (the raw bodies of ``all_albums``,
+``sync``, and so on) to measure those; otherwise payloads shaped like
+``all_albums`` and ``sync`` are generated. Decoders that are not installed are
+skipped.
+
+    uv run benchmarks/json_decode.py [FILE ...]
+"""
+
+import json
+import pathlib
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1] / "src"))
+
+from rainwaveclient.decoder import stdlib_decoder
+
+ALBUMS = 6000
+
+
+def song(song_id: int) -> dict:
+    return {
+        "id": song_id,
+        "title": f"Song {song_id} (Arranged Version)",
+        "length": 180 + song_id % 120,
+        "albums": [{"id": song_id // 10, "name": f"Album {song_id // 10}"}],
+        "artists": [{"id": song_id % 900, "name": f"Artist {song_id % 900}"}],
+        "rating": 4.1,
+        "rating_user": None,
+        "fave": False,
+        "entry_id": song_id * 3,
+        "entry_votes": song_id % 40,
+        "elec_request_user_id": 0,
+    }
+
+
+def event(event_id: int) -> dict:
+    return {
+        "id": event_id,
+        "type": "Election",
+        "start": 1700000000 + event_id * 200,
+        "start_actual": None,
+        "end": 1700000200 + event_id * 200,
+        "length": 200,
+        "songs": [song(event_id * 3 + i) for i in range(3)],
+    }
+
+
+def generated() -> dict[str, bytes]:
+    all_albums = {
+        "all_albums": [
+            {
+                "id": i,
+                "name": f"Album {i}: Original Soundtrack",
+                "rating": 3.9,
+                "rating_user": None,
+                "cool": False,
+                "cool_lowest": 1700000000 + i,
+                "fave": False,
+                "rating_complete": False,
+            }
+            for i in range(ALBUMS)
+        ]
+    }
+    sync = {
+        "sched_current": event(10),
+        "sched_next": [event(11), event(12)],
+        "sched_history": [event(i) for i in range(5, 10)],
+        "request_line": [
+            {"user_id": i, "username": f"user{i}", "song_id": i, "song": song(i)}
+            for i in range(40)
+        ],
+        "requests": [],
+    }
+    return {
+        "all_albums (generated)": json.dumps(all_albums).encode(),
+        "sync (generated)": json.dumps(sync).encode(),
+    }
+
+
+def decoders() -> dict:
+    found = {"json": stdlib_decoder}
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        found["orjson"] = orjson.loads
+    try:
+        import msgspec.json
+    except ImportError:
+        pass
+    else:
+        found["msgspec"] = msgspec.json.decode
+    return found
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        payloads = {path: pathlib.Path(path).read_bytes() for path in sys.argv[1:]}
+    else:
+        payloads = generated()
+    for name, payload in payloads.items():
+        print(f"{name}: {len(payload) / 1024:.0f} KiB")
+        expected = stdlib_decoder(payload)
+        baseline = None
+        for decoder_name, decoder in decoders().items():
+            if decoder(payload) != expected:
+                print(f"  {decoder_name:8} returned different data, skipped")
+                continue
+            timings = []
+            for _ in range(20):
+                start = time.perf_counter()
+                decoder(payload)
+                timings.append(time.perf_counter() - start)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(
+                f"  {decoder_name:8} median {median * 1000:7.2f} ms  "
+                f"{baseline / median:4.1f}x"
+            )
+        # what RainwaveClient.call did before decoders took bytes
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            json.loads(payload.decode(encoding="utf-8"))
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        print(f"  {'str':8} median {median * 1000:7.2f} ms  (decode, then json.loads)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compare the memory used by the catalog objects of six channels with and without
+``RainwaveClient(compact=True)``. Each run decodes the catalog payloads and
+builds every album, song, and artist object from them, and reports the memory
+still in use afterwards and the peak along the way. The catalog is generated,
+so no network access is needed.
+
+    uv run benchmarks/memory.py
+"""
+
+import json
+import pathlib
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1] / "src"))
+
+import rainwaveclient
+
+# (albums, artists) per channel, about the size of the Rainwave playlists
+CHANNELS = [
+    (2800, 2100),
+    (1100, 900),
+    (900, 800),
+    (1300, 1000),
+    (6000, 4500),
+    (200, 300),
+]
+SONGS_PER_ALBUM = 12
+
+
+def raw_album(sid: int, album_id: int) -> dict:
+    return {
+        "id": album_id,
+        "name": f"Album {sid}-{album_id}",
+        "rating": 3.9,
+        "rating_user": None,
+        "cool": False,
+        "cool_lowest": 1700000000 + album_id,
+        "fave": False,
+        "rating_complete": False,
+    }
+
+
+def raw_song(sid: int, song_id: int) -> dict:
+    """Return the data of a song as it appears in the data of an album."""
+
+    return {
+        "id": song_id,
+        "title": f"Song {sid}-{song_id}",
+        "length": 180 + song_id % 120,
+        "sid": sid,
+        "origin_sid": sid,
+        "rating": 4.1,
+        "rating_count": 30 + song_id % 50,
+        "rating_user": None,
+        "rating_allowed": False,
+        "fave": None,
+        "cool": False,
+        "request_count": song_id % 20,
+        "url": None,
+        "link_text": None,
+        "artists": [{"id": song_id % 5000, "name": f"Artist {sid}-{song_id % 5000}"}],
+    }
+
+
+def raw_catalog() -> list[tuple[dict, list[dict], list[dict]]]:
+    """Return decoded API data for each channel: the station, the albums with
+    their songs, and the artists."""
+
+    catalog = []
+    for sid, (albums, artists) in enumerate(CHANNELS, start=1):
+        station = {"id": sid, "name": f"Channel {sid}", "description": "", "key": ""}
+        raw_albums = [raw_album(sid, i) for i in range(albums)]
+        for album in raw_albums:
+            first = album["id"] * SONGS_PER_ALBUM
+            album["songs"] = [raw_song(sid, first + j) for j in range(SONGS_PER_ALBUM)]
+        raw_artists = [{"id": i, "name": f"Artist {sid}-{i}"} for i in range(artists)]
+        catalog.append((station, raw_albums, raw_artists))
+    return catalog
+
+
+def load(compact: bool, catalog: list) -> tuple[rainwaveclient.RainwaveClient, int]:
+    """Build every album, song, and artist object of the catalog and return the
+    client and the number of objects."""
+
+    rw = rainwaveclient.RainwaveClient(compact=compact)
+    rw._raw_channels = [station for station, _, _ in catalog]
+    count = 0
+    for channel, (_, raw_albums, raw_artists) in zip(rw.channels, catalog):
+        channel._raw_albums = raw_albums
+        channel._raw_artists = raw_artists
+        for album in channel.albums:
+            count += 1 + len(album.songs)
+        count += len(channel.artists)
+    return rw, count
+
+
+def main() -> None:
+    payload = json.dumps(raw_catalog())
+    results = {}
+    for compact in (False, True):
+        tracemalloc.start()
+        start = time.perf_counter()
+        rw, count = load(compact, json.loads(payload))
+        elapsed = time.perf_counter() - start
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[compact] = size
+        print(
+            f"compact={compact!s:5}  {count} objects  {size / 2**20:6.1f} MiB "
+            f"(peak {peak / 2**20:6.1f} MiB, {size / count:5.0f} bytes per object)  "
+            f"built in {elapsed:.2f} s"
+        )
+        del rw
+    print(f"compact mode uses {1 - results[True] / results[False]:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
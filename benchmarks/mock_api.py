@@ -0,0 +1,378 @@
+"""
+A local stand-in for the Rainwave API, for benchmarks and offline experiments.
+It serves generated payloads shaped like the real ones for ``stations``,
+``all_albums``, ``all_artists``, ``album``, ``song``, ``artist``,
+``listener``, ``current_listeners``, ``info``, and the long-poll ``sync``,
+which answers with a new timeline every ``sync_interval`` seconds. Every
+response can be delayed to simulate network latency. Other paths answer with an
+error message, as the API does for unknown methods.
+
+Run it on its own:
+
+    uv run benchmarks/mock_api.py [--port PORT] [--latency SECONDS]
+
+and point a client at it:
+
+    >>> rw = RainwaveClient(1, "key")
+    >>> rw.base_url = "http://127.0.0.1:8000/api4/"
+
+or start it from Python, as ``benchmarks/client.py`` does:
+
+    with MockRainwaveAPI(latency=0.02) as api:
+        rw = RainwaveClient(1, "key")
+        rw.base_url = api.base_url
+"""
+
+import argparse
+import collections
+import functools
+import http.server
+import json
+import sys
+import threading
+import time
+from urllib.parse import parse_qs
+
+# (name, albums, artists) per channel, about the size of the Rainwave playlists
+CHANNELS = [
+    ("Game", 2800, 2100),
+    ("OC ReMix", 1100, 900),
+    ("Covers", 900, 800),
+    ("Chiptune", 1300, 1000),
+    ("All", 6000, 4500),
+    ("Retro", 200, 300),
+]
+SONGS_PER_ALBUM = 12
+SONGS_PER_ARTIST = 8
+REQUEST_LINE = 15
+USER_REQUESTS = 5
+
+
+def raw_song(sid: int, song_id: int, election: bool = False) -> dict:
+    """Return the full data of a song. Songs are numbered by album, so song
+    ``album_id * 100 + n`` is on album ``album_id``."""
+
+    album_id = song_id // 100
+    artist_id = song_id % 997 + 1
+    d = {
+        "id": song_id,
+        "title": f"Song {song_id} (Arranged Version)",
+        "length": 180 + song_id % 120,
+        "albums": [
+            {
+                "id": album_id,
+                "name": f"Album {album_id}: Original Soundtrack",
+                "art": f"/album_art/{sid}_{album_id}",
+                "rating": 3.9,
+                "rating_user": None,
+                "fave": False,
+            }
+        ],
+        "artists": [{"id": artist_id, "name": f"Artist {artist_id}"}],
+        "groups": [{"id": song_id % 50 + 1, "name": f"Group {song_id % 50 + 1}"}],
+        "sid": sid,
+        "origin_sid": sid,
+        "cool": False,
+        "cool_end": 0,
+        "fave": False,
+        "rating": 4.1,
+        "rating_user": None,
+        "rating_allowed": False,
+        "rating_count": 30 + song_id % 50,
+        "rating_histogram": {"3.5": 10, "4.0": 20, "4.5": 5},
+        "rating_rank": song_id % 500,
+        "rating_rank_percentile": 50,
+        "request_count": song_id % 20,
+        "request_rank": song_id % 400,
+        "request_rank_percentile": 50,
+        "link_text": None,
+        "url": None,
+    }
+    if election:
+        d.update(entry_id=song_id * 3, entry_votes=song_id % 40, elec_request_user_id=0)
+    return d
+
+
+def raw_album(sid: int, album_id: int, songs: bool = False) -> dict:
+    """Return the data of an album, as in ``all_albums``, or with its songs and
+    details, as in ``album``."""
+
+    d = {
+        "id": album_id,
+        "name": f"Album {album_id}: Original Soundtrack",
+        "rating": 3.9,
+        "rating_user": None,
+        "cool": False,
+        "cool_lowest": 1700000000 + album_id,
+        "fave": False,
+        "rating_complete": False,
+    }
+    if songs:
+        d.update(
+            art=f"/album_art/{sid}_{album_id}",
+            added_on=1600000000 + album_id,
+            genres=[{"id": album_id % 50 + 1, "name": f"Group {album_id % 50 + 1}"}],
+            fave_count=album_id % 30,
+            played_last=1700000000 + album_id,
+            rating_count=50,
+            rating_histogram={"3.5": 20, "4.0": 30},
+            rating_rank=album_id % 500,
+            request_count=album_id % 70,
+            request_rank=album_id % 400,
+            vote_count=album_id % 90,
+            songs=[raw_song(sid, album_id * 100 + i) for i in range(SONGS_PER_ALBUM)],
+        )
+        # the songs of an album do not repeat the album
+        for song in d["songs"]:
+            del song["albums"]
+    return d
+
+
+def raw_artist(sid: int, artist_id: int) -> dict:
+    all_songs = collections.defaultdict(list)
+    for i in range(SONGS_PER_ARTIST):
+        song = raw_song(sid, (artist_id * 7 + i * 131) % 100000 + 100)
+        all_songs[str(song["albums"][0]["id"])].append(song)
+    return {
+        "id": artist_id,
+        "name": f"Artist {artist_id}",
+        "all_songs": {str(sid): all_songs},
+    }
+
+
+def raw_listener(user_id: int) -> dict:
+    return {
+        "user_id": user_id,
+        "name": f"listener{user_id}",
+        "avatar": "/static/images4/user.svg",
+        "colour": "4fc3f7",
+        "rank": "Rainwave Rookie",
+        "total_votes": user_id % 900,
+        "total_ratings": user_id % 400,
+        "total_requests": user_id % 300,
+        "mind_changes": user_id % 20,
+        "winning_votes": user_id % 500,
+        "losing_votes": user_id % 400,
+        "winning_requests": user_id % 100,
+        "losing_requests": user_id % 80,
+    }
+
+
+def raw_event(sid: int, event_id: int, start: int) -> dict:
+    return {
+        "id": event_id,
+        "type": "Election",
+        "start": start,
+        "start_actual": None,
+        "end": start + 200,
+        "length": 200,
+        "songs": [
+            raw_song(sid, (event_id * 3 + i) % 100000 + 100, election=True)
+            for i in range(3)
+        ],
+    }
+
+
+def raw_timeline(sid: int, generation: int) -> dict:
+    """Return the timeline of a channel after ``generation`` song changes."""
+
+    now = int(time.time())
+    event_id = generation + 10
+    current = raw_event(sid, event_id, now - 20)
+    current["start_actual"] = now - 20
+    current["end"] = now + 180
+    return {
+        "sched_current": current,
+        "sched_next": [raw_event(sid, event_id + i, now + 180 * i) for i in (1, 2)],
+        "sched_history": [
+            raw_event(sid, event_id - i, now - 200 * i) for i in range(1, 6)
+        ],
+        "request_line": [
+            {
+                "user_id": 1000 + i,
+                "username": f"listener{1000 + i}",
+                "position": i + 1,
+                "skip": False,
+                "song_id": 200 + i * 100,
+                "song": raw_song(sid, 200 + i * 100),
+            }
+            for i in range(REQUEST_LINE)
+        ],
+        "requests": [
+            dict(raw_song(sid, 300 + i * 100), elec_blocked_by=None)
+            for i in range(USER_REQUESTS)
+        ],
+    }
+
+
+@functools.cache
+def catalog(name: str, sid: int | None = None) -> bytes:
+    """Return the encoded ``stations``, ``all_albums``, or ``all_artists``
+    response. They are large and never change, so they are built once."""
+
+    if name == "stations":
+        stations = [
+            {
+                "id": i,
+                "name": f"{channel} Radio",
+                "key": channel.lower().replace(" ", ""),
+                "description": f"{channel} music online radio!",
+                "stream": f"https://relay.rainwave.cc/{i}.mp3",
+            }
+            for i, (channel, _, _) in enumerate(CHANNELS, start=1)
+        ]
+        return json.dumps({"stations": stations}).encode()
+    _, albums, artists = CHANNELS[(sid - 1) % len(CHANNELS)]
+    if name == "all_albums":
+        payload = [raw_album(sid, i) for i in range(1, albums + 1)]
+    else:
+        payload = [{"id": i, "name": f"Artist {i}"} for i in range(1, artists + 1)]
+    return json.dumps({name: payload}).encode()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and the body are written separately; do not hold back the
+    # body until the client acknowledges the headers
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("content-length", 0)))
+        args = {k: v[0] for k, v in parse_qs(body.decode()).items()}
+        path = self.path.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+        self.server.api.serve(self, path, args)
+
+    do_GET = do_POST
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    api: "MockRainwaveAPI"
+
+    def handle_error(self, request: object, client_address: tuple) -> None:
+        # clients hang up on long-poll calls when they stop syncing
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MockRainwaveAPI:
+    """A stand-in Rainwave API server running in a background thread.
+
+    :param latency: (optional) the number of seconds to wait before each
+        response, default `0`.
+    :param sync_interval: (optional) the number of seconds a ``sync`` call
+        waits before answering with the next timeline, default `5`.
+    :param host: (optional) the address to listen on, default `127.0.0.1`.
+    :param port: (optional) the port to listen on, default any free port.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        sync_interval: float = 5.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.sync_interval = sync_interval
+        #: The number of calls to each path.
+        self.calls = collections.Counter()
+        self._generations = collections.Counter()
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.api = self
+        self._thread = None
+
+    def __enter__(self) -> "MockRainwaveAPI":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """The value for :attr:`RainwaveClient.base_url`."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api4/"
+
+    def respond(self, path: str, args: dict) -> bytes:
+        """Return the encoded response to a call."""
+
+        with self._lock:
+            self.calls[path] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        sid = int(args.get("sid", 1))
+        if path == "stations":
+            return catalog(path)
+        if path in ("all_albums", "all_artists"):
+            return catalog(path, sid)
+        if path == "sync":
+            time.sleep(self.sync_interval)
+            with self._lock:
+                self._generations[sid] += 1
+        if path in ("info", "sync"):
+            return json.dumps(raw_timeline(sid, self._generations[sid])).encode()
+        item_id = int(args.get("id", 0))
+        if path == "album":
+            d = {"album": raw_album(sid, item_id, songs=True)}
+        elif path == "song":
+            d = {"song": raw_song(sid, item_id)}
+        elif path == "artist":
+            d = {"artist": raw_artist(sid, item_id)}
+        elif path == "listener":
+            d = {"listener": raw_listener(item_id)}
+        elif path == "current_listeners":
+            d = {"current_listeners": [raw_listener(i) for i in range(1, 51)]}
+        else:
+            d = {"error": {"tl_key": "api_not_found", "text": f"Unknown: {path}"}}
+        return json.dumps(d).encode()
+
+    def serve(
+        self, handler: http.server.BaseHTTPRequestHandler, path: str, args: dict
+    ) -> None:
+        """Write the response to a call with ``handler``. Override it to answer
+        some calls differently, as the offline tests do."""
+
+        data = self.respond(path, args)
+        handler.send_response(200)
+        handler.send_header("content-type", "application/json")
+        handler.send_header("content-length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving."""
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a stand-in Rainwave API.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--sync-interval", type=float, default=5.0)
+    args = parser.parse_args()
+    with MockRainwaveAPI(args.latency, args.sync_interval, port=args.port) as api:
+        print(f"Serving on {api.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark for :class:`rainwaveclient.RainwaveSearch` over a generated catalog
+about the size of all six Rainwave channels combined. No network access is
+needed.
+
+    uv run benchmarks/search.py
+"""
+
+import itertools
+import pathlib
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1] / "src"))
+
+import rainwaveclient
+
+ALBUMS = 12000
+ARTISTS = 9000
+SONGS_PER_ALBUM = 12
+RARE_WORDS = 20000
+
+COMMON_WORDS = (
+    "adventure battle castle chrono crystal dark dawn dragon dream dungeon "
+    "emerald eternal fantasy final fire forest frontier galaxy ghost guardian "
+    "harvest hero island kingdom knight legend light lost magic mana memories "
+    "metal moon mountain mystic night ocean origins phantom quest rain realm "
+    "requiem revolution saga secret shadow sky soul star storm sword tales "
+    "temple theme thunder time tower trials twilight valley wind wings world"
+).split()
+SYLLABLES = "ka ri to na me su ro lu mi da ze ko ya shi ve tor an el gar mor".split()
+QUERIES = [
+    "final fantasy",
+    "fnial fantsy",
+    "chrono",
+    "dragon quest saga",
+    "shadow of the moon",
+    "legnd of mana",
+    "twilight",
+    "zzzz",
+]
+
+
+def vocabulary(rng: random.Random) -> tuple[list[str], list[float]]:
+    """Return a vocabulary and cumulative weights following Zipf's law: a few
+    words such as "fantasy" are very common, most words are rare."""
+
+    rare = {
+        "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(RARE_WORDS)
+    }
+    words = COMMON_WORDS + sorted(rare)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    return words, weights
+
+
+def name(rng: random.Random, words: list[str], weights: list[float]) -> str:
+    words = rng.choices(words, cum_weights=weights, k=rng.randint(1, 4))
+    if rng.random() < 0.3:
+        words.append(rng.choice(["II", "III", "IV", "Remix", "OST", "Arranged"]))
+    return " ".join(w.title() for w in words)
+
+
+def build_catalog(rng: random.Random) -> tuple[list, list, list]:
+    vocab = vocabulary(rng)
+    albums = [
+        rainwaveclient.RainwaveAlbum(None, {"id": i, "name": name(rng, *vocab)})
+        for i in range(ALBUMS)
+    ]
+    artists = [
+        rainwaveclient.RainwaveArtist(None, {"id": i, "name": name(rng, *vocab)})
+        for i in range(ARTISTS)
+    ]
+    songs = []
+    for album in albums:
+        for j in range(SONGS_PER_ALBUM):
+            song_id = album.id * SONGS_PER_ALBUM + j
+            raw_song = {"id": song_id, "title": name(rng, *vocab)}
+            songs.append(rainwaveclient.RainwaveSong(album, raw_song))
+    return albums, artists, songs
+
+
+def main() -> None:
+    rng = random.Random(5049)  # noqa: S311
+    albums, artists, songs = build_catalog(rng)
+    vocab = vocabulary(rng)
+
+    start = time.perf_counter()
+    search = rainwaveclient.RainwaveSearch()
+    search.sync("album", albums)
+    search.sync("artist", artists)
+    for song in songs:
+        search.add("song", song)
+    build = time.perf_counter() - start
+    print(f"indexed {len(search)} items in {build:.2f} s")
+
+    start = time.perf_counter()
+    for album in rng.sample(albums, 100):
+        album["name"] = name(rng, *vocab)
+    search.sync("album", albums)
+    print(f"re-indexed 100 renamed albums in {time.perf_counter() - start:.3f} s")
+
+    for kinds in (None, ["album"]):
+        print(f"\nkinds={kinds}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(50):
+                start = time.perf_counter()
+                results = search.search(query, kinds=kinds)
+                timings.append(time.perf_counter() - start)
+            top = ""
+            if results:
+                _, kind, item = results[0]
+                top = f"{kind} {item.title if kind == 'song' else item.name!r}"
+            ms = statistics.median(timings) * 1000
+            print(
+                f"  {query!r:24} median {ms:6.3f} ms  {len(results):2} results  {top}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,58 @@
 from .album import RainwaveAlbum
 from .artist import RainwaveArtist
+from .cache import RainwaveCache
 from .category import RainwaveCategory
 from .channel import RainwaveChannel
 from .client import RainwaveClient
 from .listener import RainwaveListener
+from .metrics import RainwaveMetrics
+from .pool import RainwaveConnectionPool
+from .ratelimit import RainwaveRateLimiter
 from .request import RainwaveRequest, RainwaveUserRequest, RainwaveUserRequestQueue
+from .retry import (
+    RainwaveAPIError,
+    RainwaveCircuitBreaker,
+    RainwaveCircuitOpenError,
+    RainwaveRetryPolicy,
+)
 from .schedule import RainwaveElection, RainwaveOneTimePlay, RainwaveSchedule
+from .scheduler import RainwaveSyncScheduler
+from .search import RainwaveSearch, RainwaveSearchResult
+from .snapshot import RainwaveSnapshotCache
 from .song import RainwaveCandidate, RainwaveSong
+from .timeline import RainwaveTimeline, RainwaveTimelineDiff
+from .transport import RainwaveCassetteError, RainwavePlayer, RainwaveRecorder
 
 __all__ = [
     RainwaveAlbum,
+    RainwaveAPIError,
     RainwaveArtist,
+    RainwaveCache,
     RainwaveCandidate,
+    RainwaveCassetteError,
     RainwaveCategory,
     RainwaveChannel,
+    RainwaveCircuitBreaker,
+    RainwaveCircuitOpenError,
     RainwaveClient,
+    RainwaveConnectionPool,
     RainwaveElection,
     RainwaveListener,
+    RainwaveMetrics,
     RainwaveOneTimePlay,
+    RainwavePlayer,
+    RainwaveRateLimiter,
+    RainwaveRecorder,
     RainwaveRequest,
+    RainwaveRetryPolicy,
     RainwaveSchedule,
+    RainwaveSearch,
+    RainwaveSearchResult,
+    RainwaveSnapshotCache,
     RainwaveSong,
+    RainwaveSyncScheduler,
+    RainwaveTimeline,
+    RainwaveTimelineDiff,
     RainwaveUserRequest,
     RainwaveUserRequestQueue,
 ]
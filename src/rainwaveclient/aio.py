@@ -0,0 +1,664 @@
+"""
+An asyncio interface to the Rainwave API.
+
+:class:`AsyncRainwaveClient` and :class:`AsyncRainwaveChannel` mirror
+:class:`RainwaveClient` and :class:`RainwaveChannel`, but every method that
+talks to the API is a coroutine, so many channels and lookups can run
+concurrently on one event loop:
+
+    import asyncio
+    from rainwaveclient.aio import AsyncRainwaveClient
+
+    async def main():
+        async with AsyncRainwaveClient(5049, 'abcde12345') as rw:
+            channels = await rw.channels()
+            songs = await asyncio.gather(*[c.get_song_by_id(8151) for c in channels])
+
+The objects returned (:class:`RainwaveAlbum`, :class:`RainwaveSong`, and so on)
+are the usual model classes. Properties on those objects that are loaded lazily
+make blocking API calls; use the coroutines here to fetch what you need first.
+"""
+
+import asyncio
+import collections
+import contextlib
+import http.client
+import logging
+import socket
+import ssl
+import time
+import typing
+from urllib.parse import urlencode, urlsplit
+
+from .album import RainwaveAlbum
+from .artist import RainwaveArtist
+from .channel import RainwaveChannel, post_sync, pre_sync
+from .client import RainwaveClient
+from .flight import AsyncSingleFlight
+from .listener import RainwaveListener
+from .pool import _proxy_for
+from .song import RainwaveSong
+
+if typing.TYPE_CHECKING:
+    from email.message import Message
+
+    from . import RainwaveSchedule
+    from .transport import RainwavePlayer, RainwaveRecorder
+
+log = logging.getLogger(__name__)
+
+
+class AsyncRainwaveClient:
+    """An :class:`AsyncRainwaveClient` object provides an asyncio interface to
+    the Rainwave API.
+
+    :param user_id: the User ID to use when communicating with the API.
+    :type user_id: int
+    :param key: the API key to use when communicating with the API.
+    :type key: str
+    :param max_connections: (optional) the maximum number of API calls in
+        flight at once, default `10`.
+    :type max_connections: int
+    :param client: (optional) the blocking :class:`RainwaveClient` to share
+        settings, counters, and channels with. By default a new one is created
+        with ``user_id`` and ``key``, which are ignored otherwise.
+    :type client: RainwaveClient
+    """
+
+    def __init__(
+        self,
+        user_id: int | None = None,
+        key: str | None = None,
+        max_connections: int = 10,
+        client: RainwaveClient | None = None,
+    ) -> None:
+        #: The blocking :class:`RainwaveClient` that model objects use to load
+        #: lazy properties. It shares :attr:`user_id`, :attr:`key`, and
+        #: :attr:`base_url` with this client.
+        self.client = client or RainwaveClient(user_id, key)
+        self.max_connections = max_connections
+        self._channels = None
+        self._flights = AsyncSingleFlight()
+        # the semaphore and the idle connections belong to the event loop they
+        # were made on, see _for_loop()
+        self._loop = None
+        self._idle = collections.defaultdict(list)
+        self._semaphore = None
+        self._ssl_context = None
+
+    def __repr__(self) -> str:
+        return f"AsyncRainwaveClient(user_id={self.user_id!r}, key={self.key!r})"
+
+    async def __aenter__(self) -> "AsyncRainwaveClient":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    def _for_loop(self) -> asyncio.Semaphore:
+        """Return the semaphore that limits calls in flight, made for the
+        running event loop. When the client is first used on another loop, as
+        after a new :func:`asyncio.run`, the connections kept for the old loop
+        are closed; if that loop is closed already they can only be left to the
+        garbage collector, so :meth:`close` the client before its loop ends."""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            for idle in self._idle.values():
+                for _, writer in idle:
+                    with contextlib.suppress(RuntimeError):
+                        # the old loop may be closed already
+                        writer.close()
+            self._idle.clear()
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+            self._loop = loop
+        return self._semaphore
+
+    def _grow(self, max_connections: int) -> None:
+        """Allow up to ``max_connections`` calls in flight, if that is more
+        than before. Call it on the event loop the client is used on."""
+
+        extra = max_connections - self.max_connections
+        if extra <= 0:
+            return
+        self.max_connections = max_connections
+        if self._semaphore is not None:
+            for _ in range(extra):
+                self._semaphore.release()
+
+    async def _open(self, origin: tuple) -> tuple:
+        scheme, host, port = origin
+        proxy = _proxy_for(scheme, host)
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            if proxy is None:
+                return await asyncio.open_connection(
+                    host, port or 443, ssl=self._ssl_context
+                )
+            sock = await asyncio.to_thread(
+                self._tunnel, proxy, host, port or 443, self.client.pool.timeout
+            )
+            return await asyncio.open_connection(
+                sock=sock, ssl=self._ssl_context, server_hostname=host
+            )
+        if proxy is None:
+            return await asyncio.open_connection(host, port or 80)
+        proxy_host, proxy_port, _ = proxy
+        return await asyncio.open_connection(proxy_host, proxy_port)
+
+    async def _request(
+        self, method: str, url: str, body: bytes, headers: dict
+    ) -> tuple[int, dict, bytes]:
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        if parts.scheme == "http":
+            proxy = _proxy_for(parts.scheme, parts.hostname)
+            if proxy is not None:
+                # plain HTTP requests are sent to the proxy with the absolute URL
+                target = url
+                headers = {**headers, **proxy[2]}
+        head = [f"{method} {target} HTTP/1.1", f"host: {parts.netloc}"]
+        head.extend(f"{k}: {v}" for k, v in headers.items())
+        head.append(f"content-length: {len(body)}")
+        message = "\r\n".join(head).encode() + b"\r\n\r\n" + body
+
+        idle = self._idle[origin]
+        while True:
+            reused = False
+            while idle and not reused:
+                reader, writer = idle.pop()
+                # the server may have closed the connection while it was idle
+                reused = not (reader.at_eof() or writer.is_closing())
+                if not reused:
+                    writer.close()
+            if not reused:
+                reader, writer = await self._open(origin)
+            try:
+                writer.write(message)
+                await writer.drain()
+            except ConnectionError:
+                writer.close()
+                if reused:
+                    # the request was not sent, so try again with another one
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            break
+
+        # once the request is sent, whether it may be sent again is up to the
+        # caller: the server may have acted on it before the connection broke
+        try:
+            status, response_headers, keep_alive, data = await self._read_response(
+                reader
+            )
+        except asyncio.IncompleteReadError as e:
+            writer.close()
+            err = "Connection closed before the response was complete"
+            raise ConnectionResetError(err) from e
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive and len(idle) < self.max_connections:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, response_headers, data
+
+    @staticmethod
+    def _tunnel(
+        proxy: tuple[str, int, dict], host: str, port: int, timeout: float | None
+    ) -> socket.socket:
+        """Open a connection to ``proxy`` and ask it to tunnel to ``host``;
+        return the socket to start TLS on."""
+
+        proxy_host, proxy_port, proxy_headers = proxy
+        conn = http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+        conn.set_tunnel(host, port, proxy_headers)
+        conn.connect()
+        sock, conn.sock = conn.sock, None
+        return sock
+
+    @staticmethod
+    async def _read_response(
+        reader: asyncio.StreamReader,
+    ) -> tuple[int, dict, bool, bytes]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+        # the reason phrase after the status code may be missing
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1"
+        if headers.get("connection", "").lower() == "close":
+            keep_alive = False
+        elif headers.get("connection", "").lower() == "keep-alive":
+            keep_alive = True
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # skip trailers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return int(status), headers, keep_alive, data
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        data: bytes,
+        headers: dict,
+        timeout: float | None,
+        retry: bool,
+    ) -> dict:
+        if timeout is None:
+            timeout = self.client.pool.timeout
+        policy = self.client.retry
+        breaker = self.client.breaker
+        limiter = self.client.rate_limiter
+        transport = self.client.transport
+        attempt = 1
+        while True:
+            breaker.before_call(path)
+            try:
+                if limiter is not None and await limiter.acquire_async(path):
+                    self.client._count(path, rate_limited=1)
+                async with self._for_loop():
+                    log.debug(f"Calling {url}")
+                    start = time.perf_counter()
+                    if transport is self.client.pool:
+                        request = self._request(method, url, data, headers)
+                    else:
+                        # recorded and replayed calls use the client transport
+                        request = self._transport_request(
+                            transport, method, url, data, headers, timeout
+                        )
+                    status, response_headers, body = await asyncio.wait_for(
+                        request, timeout
+                    )
+                self.client.metrics.observe_call(
+                    path, status, time.perf_counter() - start, len(data), len(body)
+                )
+                self.client._count(
+                    path, calls=1, received_bytes=len(body), decoded_bytes=len(body)
+                )
+                api_response = self.client._decode(
+                    path, status, body, response_headers.get("retry-after")
+                )
+            except Exception as e:
+                self.client.metrics.observe_error(path, e)
+                if not policy.retryable(e):
+                    breaker.record_abort(path)
+                    raise
+                breaker.record_failure(path)
+                self.client._count(path, errors=1)
+                if (
+                    not retry
+                    or attempt >= policy.attempts
+                    or not policy.safe_to_repeat(path, e)
+                ):
+                    raise
+                delay = policy.delay(attempt, e)
+                log.warning(f"Calling {url} failed ({e!r}), retrying in {delay:.1f} s")
+                self.client._count(path, retries=1)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # a cancelled trial call must not leave the circuit half-open
+                breaker.record_abort(path)
+                raise
+            breaker.record_success(path)
+            log.debug(api_response)
+            return api_response
+
+    @staticmethod
+    async def _transport_request(
+        transport: "RainwaveRecorder | RainwavePlayer",
+        method: str,
+        url: str,
+        data: bytes,
+        headers: dict,
+        timeout: float | None,
+    ) -> tuple[int, "Message", bytes]:
+        status, response_headers, body, _ = await asyncio.to_thread(
+            transport.request, method, url, data, headers, timeout=timeout
+        )
+        return status, response_headers, body
+
+    @property
+    def base_url(self) -> str:
+        """See :attr:`RainwaveClient.base_url`."""
+        return self.client.base_url
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        self.client.base_url = value
+
+    async def call(
+        self,
+        path: str,
+        args: dict | None = None,
+        method: str = "POST",
+        timeout: float | None = None,
+        retry: bool = True,
+    ) -> dict:
+        """Make a direct call to the API. This is the awaitable equivalent of
+        :meth:`RainwaveClient.call`.
+
+        :param path: the URL path of the API method to call.
+        :type path: str
+        :param args: (optional) any arguments required by the API method.
+        :type args: dict
+        :param method: (optional) the HTTP method to use for the API call,
+            default `POST`
+        :type method: str
+        :param timeout: (optional) the number of seconds to wait for the API,
+            default the ``timeout`` of :attr:`client`.
+        :type timeout: float
+        :param retry: (optional) try failed calls again, default `True`.
+        :type retry: bool
+        :return: The raw data returned from the API call.
+        :rtype: dict
+
+        Failed calls are retried, circuits opened, and identical calls in
+        flight at the same time coalesced as described for
+        :meth:`RainwaveClient.call`, using the :attr:`RainwaveClient.retry`
+        policy and :attr:`RainwaveClient.breaker` of :attr:`client`.
+        """
+
+        path = path.lstrip("/")
+        url = f"{self.base_url}{path}"
+
+        if args is None:
+            args = {}
+        if "user_id" not in args and self.user_id:
+            args["user_id"] = self.user_id
+        if "key" not in args and self.key:
+            args["key"] = self.key
+
+        data = urlencode(args).encode()
+        headers = {
+            "content-type": "application/x-www-form-urlencoded",
+            "user-agent": self.client.user_agent,
+        }
+        if not self.client.coalesce:
+            return await self._send(method, path, url, data, headers, timeout, retry)
+        key = (method, path, urlencode(sorted(args.items())))
+        api_response, shared = await self._flights.do(
+            key, lambda: self._send(method, path, url, data, headers, timeout, retry)
+        )
+        if shared:
+            self.client._count(path, coalesced=1)
+        return api_response
+
+    async def channels(self) -> list["AsyncRainwaveChannel"]:
+        """Return a list of :class:`AsyncRainwaveChannel` objects associated
+        with this client."""
+
+        if self._channels is None:
+            if self.client._raw_channels is None:
+                d = await self.call("stations")
+                if "stations" in d:
+                    self.client._raw_channels = d["stations"]
+                else:
+                    raise Exception
+            self._channels = [
+                AsyncRainwaveChannel(self, channel) for channel in self.client.channels
+            ]
+        return self._channels
+
+    async def close(self) -> None:
+        """Stop syncing all channels and close all idle connections."""
+
+        for channel in self._channels or []:
+            channel.stop_sync()
+        self._for_loop()
+        for idle in self._idle.values():
+            while idle:
+                _, writer = idle.pop()
+                writer.close()
+
+    @property
+    def key(self) -> str:
+        """See :attr:`RainwaveClient.key`."""
+        return self.client.key
+
+    @key.setter
+    def key(self, value: str) -> None:
+        self.client.key = value
+
+    @property
+    def user_id(self) -> int:
+        """See :attr:`RainwaveClient.user_id`."""
+        return self.client.user_id
+
+    @user_id.setter
+    def user_id(self, value: int) -> None:
+        self.client.user_id = value
+
+
+class AsyncRainwaveChannel:
+    """An :class:`AsyncRainwaveChannel` object is the asyncio counterpart of a
+    :class:`RainwaveChannel`.
+
+    .. note::
+
+        You should not instantiate an object of this class directly, but rather
+        obtain one from :meth:`AsyncRainwaveClient.channels`.
+    """
+
+    def __init__(
+        self, client: "AsyncRainwaveClient", channel: "RainwaveChannel"
+    ) -> None:
+        self._client = client
+
+        #: The :class:`RainwaveChannel` that model objects belong to. Its
+        #: timeline is kept up to date by this object.
+        self.channel = channel
+        self._sync_task = None
+
+    def __repr__(self) -> str:
+        return f"<AsyncRainwaveChannel [{self.name}]>"
+
+    async def _refresh(self) -> None:
+        if not self.channel._stale():
+            return
+        d = await self.client.call("info", {"sid": self.id}, method="GET")
+        diff = self.channel._update_timeline(d)
+        post_sync.send(self.channel, diff=diff)
+
+    async def _sync_loop(self) -> None:
+        failures = 0
+        while True:
+            error = None
+            try:
+                synced = await self.sync()
+            except Exception as e:
+                log.error(f"Sync failed: {e!r}")
+                synced = False
+                error = e
+            self.client.client.metrics.observe_sync(self.id, synced)
+            if synced:
+                failures = 0
+                continue
+            # wait longer after each failure instead of calling again at once
+            failures += 1
+            self.client.client._count("sync", sync_backoffs=1)
+            await asyncio.sleep(self.client.client.retry.delay(failures, error))
+
+    async def albums(self) -> list["RainwaveAlbum"]:
+        """Return a list of :class:`RainwaveAlbum` objects in the playlist of
+        the channel."""
+
+        if self.channel._albums is None and self.channel._raw_albums is None:
+            d = await self.client.call("all_albums", {"sid": self.id})
+            if "all_albums" in d:
+                self.channel._raw_albums = d["all_albums"]
+        return self.channel.albums
+
+    async def artists(self) -> list["RainwaveArtist"]:
+        """Return a list of :class:`RainwaveArtist` objects in the playlist of
+        the channel."""
+
+        if self.channel._artists is None and self.channel._raw_artists is None:
+            d = await self.client.call("all_artists", {"sid": self.id})
+            if "all_artists" in d:
+                self.channel._raw_artists = d["all_artists"]
+        return self.channel.artists
+
+    @property
+    def client(self) -> "AsyncRainwaveClient":
+        """The :class:`AsyncRainwaveClient` object that the channel belongs
+        to."""
+        return self._client
+
+    async def get_album_by_id(self, album_id: int) -> "RainwaveAlbum":
+        """See :meth:`RainwaveChannel.get_album_by_id`."""
+
+        known = self.channel._known_album(album_id)
+        if known is not None:
+            return known
+        d = await self.client.call("album", {"sid": self.id, "id": album_id})
+        raw_album = self.channel._album_raw_from_response(d)
+        album = self.channel._model(RainwaveAlbum)(self.channel, raw_album)
+        return self.channel.cache.put("album", album_id, album)
+
+    async def get_artist_by_id(self, artist_id: int) -> "RainwaveArtist":
+        """See :meth:`RainwaveChannel.get_artist_by_id`."""
+
+        known = self.channel._known_artist(artist_id)
+        if known is not None:
+            return known
+        d = await self.client.call("artist", {"sid": self.id, "id": artist_id})
+        raw_artist = self.channel._artist_raw_from_response(d, artist_id)
+        artist = self.channel._model(RainwaveArtist)(self.channel, raw_artist)
+        return self.channel.cache.put("artist", artist_id, artist)
+
+    async def get_listener_by_id(self, listener_id: int) -> "RainwaveListener":
+        """See :meth:`RainwaveChannel.get_listener_by_id`."""
+
+        cached = self.channel.cache.get("listener", listener_id)
+        if cached is not None:
+            return cached
+        d = await self.client.call("listener", {"id": listener_id, "sid": self.id})
+        raw_listener = self.channel._listener_raw_from_response(d, listener_id)
+        listener = self.channel._model(RainwaveListener)(self.channel, raw_listener)
+        return self.channel.cache.put("listener", listener_id, listener)
+
+    async def get_song_by_id(self, song_id: int) -> "RainwaveSong":
+        """See :meth:`RainwaveChannel.get_song_by_id`."""
+
+        cached = self.channel.cache.get("song", song_id)
+        if cached is not None:
+            return cached
+        d = await self.client.call("song", {"sid": self.id, "id": song_id})
+        raw_song = self.channel._song_raw_from_response(d, song_id)
+        alb = await self.get_album_by_id(raw_song["albums"][0]["id"])
+        song = self.channel._model(RainwaveSong)(alb, raw_song)
+        return self.channel.cache.put("song", song_id, song)
+
+    @property
+    def id(self) -> int:
+        """The ID of the channel."""
+        return self.channel.id
+
+    @property
+    def key(self) -> str:
+        """The channel key, a short string that identifies the channel."""
+        return self.channel.key
+
+    async def listeners(self) -> list["RainwaveListener"]:
+        """Return a list of :class:`RainwaveListener` objects listening to the
+        channel."""
+
+        d = await self.client.call("current_listeners", {"sid": self.id})
+        listener_cls = self.channel._model(RainwaveListener)
+        return [listener_cls(self.channel, x) for x in d["current_listeners"]]
+
+    @property
+    def name(self) -> str:
+        """The name of the channel."""
+        return self.channel.name
+
+    async def schedule_current(self) -> "RainwaveSchedule":
+        """Return the current :class:`RainwaveSchedule` for the channel."""
+
+        await self._refresh()
+        return self.channel.schedule_current
+
+    async def schedule_history(self) -> list["RainwaveSchedule"]:
+        """Return a list of the past :class:`RainwaveSchedule` objects for the
+        channel, most recent first."""
+
+        await self._refresh()
+        return self.channel.schedule_history
+
+    async def schedule_next(self) -> list["RainwaveSchedule"]:
+        """Return a list of the next :class:`RainwaveSchedule` objects for the
+        channel, soonest first."""
+
+        await self._refresh()
+        return self.channel.schedule_next
+
+    def start_sync(self) -> None:
+        """Begin syncing the timeline for the channel in a task on the running
+        event loop."""
+
+        self.stop_sync()
+        self._sync_task = asyncio.get_running_loop().create_task(self._sync_loop())
+
+    def stop_sync(self) -> None:
+        """Stop syncing the timeline for the channel."""
+
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+        self._sync_task = None
+
+    async def sync(self) -> bool:
+        """Wait for the next timeline update from the API and apply it. This is
+        one iteration of the loop run by :meth:`start_sync`.
+
+        :return: ``True`` if the timeline was updated, ``False`` if the API
+            response was incomplete.
+        :rtype: bool
+        """
+
+        pre_sync.send(self.channel)
+        # the sync loop waits after failures itself
+        d = await self.client.call(
+            "sync",
+            self.channel._sync_args(),
+            timeout=self.client.client.sync_timeout,
+            retry=False,
+        )
+        if not self.channel._timeline_complete(d):
+            return False
+        diff = self.channel._update_timeline(d)
+        post_sync.send(self.channel, channel=self.channel, diff=diff)
+        return True
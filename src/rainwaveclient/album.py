@@ -2,12 +2,14 @@ import datetime
 import typing
 
 from .category import RainwaveCategory
+from .model import RainwaveModel
+from .song import RainwaveSong
 
 if typing.TYPE_CHECKING:
-    from . import RainwaveChannel, RainwaveSong
+    from . import RainwaveChannel
 
 
-class RainwaveAlbum(dict):
+class RainwaveAlbum(RainwaveModel):
     """A :class:`RainwaveAlbum` object represents one album.
 
     .. note::
@@ -16,6 +18,32 @@ class RainwaveAlbum(dict):
         obtain one from :attr:`RainwaveChannel.albums`.
     """
 
+    _attributes = ("_channel",)
+    _fields = (
+        "added_on",
+        "art",
+        "category_objects",
+        "cool",
+        "cool_lowest",
+        "fave",
+        "fave_count",
+        "genres",
+        "id",
+        "name",
+        "played_last",
+        "rating",
+        "rating_complete",
+        "rating_count",
+        "rating_histogram",
+        "rating_rank",
+        "rating_user",
+        "request_count",
+        "request_rank",
+        "song_objects",
+        "songs",
+        "vote_count",
+    )
+
     def __init__(self, channel: "RainwaveChannel", raw_info: dict) -> None:
         self._channel = channel
         super().__init__(raw_info)
@@ -27,7 +55,7 @@ class RainwaveAlbum(dict):
         return f"{self.channel.name} // {self.name}"
 
     def _update(self) -> None:
-        self.update(self.channel.get_album_by_id(self.id))
+        self.update(self.channel._get_album_raw_info(self.id))
 
     @property
     def art(self) -> str:
@@ -201,9 +229,13 @@ class RainwaveAlbum(dict):
             self["song_objects"] = []
             if "songs" not in self:
                 self._update()
+            song_cls = self.channel._model(RainwaveSong)
             for raw_song in self["songs"]:
-                new_song = self.channel.get_song_by_id(raw_song["id"])
+                new_song = song_cls(self, raw_song)
                 self["song_objects"].append(new_song)
+            # the song objects hold the same data, so keep only one copy of it
+            self["songs"] = self["song_objects"]
+            self.channel._index_songs(self["song_objects"])
         return self["song_objects"]
 
     @property
@@ -1,10 +1,12 @@
 import typing
 
+from .model import RainwaveModel
+
 if typing.TYPE_CHECKING:
     from . import RainwaveChannel, RainwaveSong
 
 
-class RainwaveArtist(dict):
+class RainwaveArtist(RainwaveModel):
     """A :class:`RainwaveArtist` object represents one artist.
 
     .. note::
@@ -14,6 +16,9 @@ class RainwaveArtist(dict):
         :attr:`RainwaveSong.artists`.
     """
 
+    _attributes = ("_channel",)
+    _fields = ("all_songs", "id", "name", "song_objects")
+
     def __init__(self, channel: "RainwaveChannel", raw_info: dict) -> None:
         self._channel = channel
         super().__init__(raw_info)
@@ -24,6 +29,9 @@ class RainwaveArtist(dict):
     def __str__(self) -> str:
         return self.name
 
+    def _update(self) -> None:
+        self.update(self.channel._get_artist_raw_info(self.id))
+
     @property
     def channel(self) -> "RainwaveChannel":
         """The :class:`RainwaveChannel` object associated with the artist."""
@@ -49,6 +57,8 @@ class RainwaveArtist(dict):
         """A list of :class:`RainwaveSong` objects attributed to the artist."""
         if "song_objects" not in self:
             self["song_objects"] = []
+            if "all_songs" not in self:
+                self._update()
             for albums in self["all_songs"].values():
                 for album_songs in albums.values():
                     for raw_song in album_songs:
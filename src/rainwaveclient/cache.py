@@ -0,0 +1,139 @@
+import collections
+import threading
+import time
+import typing
+
+#: The default number of seconds each kind of object stays in a
+#: :class:`RainwaveCache`. Listener statistics change often, the catalog rarely.
+DEFAULT_TTL = {
+    "album": 600.0,
+    "artist": 3600.0,
+    "listener": 60.0,
+    "song": 600.0,
+}
+
+
+class RainwaveCache:
+    """A thread-safe identity map for objects fetched from the API. While an
+    object is cached, looking it up again by ID returns the very same object
+    instead of calling the API. Least recently used objects are evicted when
+    the cache is full, and each kind of object expires after its own time to
+    live.
+
+    Every :class:`RainwaveChannel` has one of these as
+    :attr:`RainwaveChannel.cache`.
+
+    :param max_size: (optional) the maximum number of objects to keep, default
+        `1024`. Use `0` to disable caching.
+    :type max_size: int
+    :param ttl: (optional) the number of seconds objects of each kind (`album`,
+        `artist`, `listener`, `song`) stay in the cache. Kinds that are not
+        given use :data:`DEFAULT_TTL`. A value of ``None`` never expires.
+    :type ttl: dict
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: dict | None = None) -> None:
+        self.max_size = max_size
+        self.ttl = dict(DEFAULT_TTL)
+        if ttl is not None:
+            self.ttl.update(ttl)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<RainwaveCache [{len(self)}/{self.max_size}]>"
+
+    def clear(self) -> None:
+        """Remove all objects from the cache."""
+
+        self.invalidate()
+
+    def get(self, kind: str, entity_id: int) -> typing.Any:  # noqa: ANN401
+        """Return the cached object of the given kind and ID, or ``None`` if it
+        is not cached or has expired.
+
+        :param kind: the kind of object, for example `album`.
+        :type kind: str
+        :param entity_id: the ID of the object.
+        :type entity_id: int
+        """
+
+        key = (kind, entity_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            obj, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return obj
+
+    def invalidate(self, kind: str | None = None, entity_id: int | None = None) -> None:
+        """Remove objects from the cache. With no arguments, remove everything.
+        With only ``kind``, remove every object of that kind. With both, remove
+        one object.
+
+        :param kind: (optional) the kind of object, for example `album`.
+        :type kind: str
+        :param entity_id: (optional) the ID of the object.
+        :type entity_id: int
+        """
+
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            elif entity_id is None:
+                for key in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[key]
+            else:
+                self._entries.pop((kind, entity_id), None)
+
+    def put(self, kind: str, entity_id: int, obj: typing.Any) -> typing.Any:  # noqa: ANN401
+        """Add an object to the cache and return the object that is now cached
+        for the kind and ID. If another thread cached the same object in the
+        meantime, that object is kept and returned instead so that callers
+        always share one object per ID.
+
+        :param kind: the kind of object, for example `album`.
+        :type kind: str
+        :param entity_id: the ID of the object.
+        :type entity_id: int
+        :param obj: the object to cache.
+        """
+
+        if self.max_size <= 0:
+            return obj
+        key = (kind, entity_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] >= now):
+                self._entries.move_to_end(key)
+                return entry[0]
+            ttl = self.ttl.get(kind)
+            self._entries[key] = (obj, None if ttl is None else now + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+            return obj
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """A dictionary of cache counters: ``hits``, ``misses``, ``evictions``
+        (objects dropped because the cache was full), ``expirations`` (objects
+        dropped because their time to live passed), and ``size`` (the number of
+        objects currently cached)."""
+
+        with self._lock:
+            return dict(self._counters, size=len(self._entries))
@@ -1,21 +1,37 @@
-import datetime
+import array
+import collections.abc
+import concurrent.futures
 import logging
 import threading
+import time
 import typing
 
 from .album import RainwaveAlbum
 from .artist import RainwaveArtist
+from .cache import RainwaveCache
 from .dispatch import Signal
+from .index import RainwaveIndex
 from .listener import RainwaveListener
+from .model import compact_class
 from .request import RainwaveRequest, RainwaveUserRequest, RainwaveUserRequestQueue
 from .schedule import RainwaveElection, RainwaveOneTimePlay
+from .search import RainwaveSearch, RainwaveSearchResult
 from .song import RainwaveSong
+from .stats import ALBUM_DETAIL_STATS, ALBUM_STATS, columns, to_numpy
+from .timeline import RainwaveTimeline, RainwaveTimelineDiff, diff_timeline
 
 if typing.TYPE_CHECKING:
     from . import RainwaveClient, RainwaveSchedule
 
 
+#: The default number of API calls the bulk lookup methods make at once.
+BULK_MAX_WORKERS = 8
+
+#: Sent before each ``sync`` call of a channel that is syncing.
 pre_sync = Signal()
+
+#: Sent after the timeline of a channel was updated. Receivers get the
+#: :class:`RainwaveTimelineDiff` of the update as the ``diff`` keyword argument.
 post_sync = Signal()
 
 log = logging.getLogger(__name__)
@@ -37,22 +53,32 @@ class RainwaveChannel(dict):
             super().__init__(raw_info)
         except ValueError:
             raise Exception(f"Cannot create channel from raw_info {raw_info!r}")
-        self._do_sync = False
-        self._sync_thread = None
+
+        #: The :class:`RainwaveCache` of albums, artists, listeners and songs
+        #: fetched by ID on this channel.
+        self.cache = RainwaveCache(client.cache_size, client.cache_ttl)
 
         self._raw_albums = None
         self._albums = None
+        self._album_index = None
         self._raw_artists = None
         self._artists = None
+        self._artist_index = None
+        # the IDs of catalog objects of each kind that have been put in the cache
+        self._cached_catalog = {"album": set(), "artist": set()}
+        self._search = None
+        self._models = {}
 
         self._sched_current = {}
         self._sched_next = []
         self._sched_history = []
         self._sched_lock = threading.Lock()
+        self._timeline = RainwaveTimeline(None, (), ())
 
         self._raw_requests = []
         self._raw_user_requests = []
         self._requests_lock = threading.Lock()
+        self._catalog_lock = threading.RLock()
 
     def __repr__(self) -> str:
         return f"<RainwaveChannel [{self.name}]>"
@@ -64,53 +90,178 @@ class RainwaveChannel(dict):
         if not self._stale():
             return
         d = self.client.call("info", {"sid": self.id}, method="GET")
-        with self._sched_lock:
-            self._sched_current = d["sched_current"]
-            self._sched_next = d["sched_next"]
-            self._sched_history = d["sched_history"]
-        with self._requests_lock:
-            self._raw_requests = d["request_line"]
-            self._raw_user_requests = d["requests"]
-        post_sync.send(self)
-
-    def _do_sync_thread(self) -> None:
-        self._do_sync = True
-        while self._do_sync:
-            pre_sync.send(self)
-            args = {"sid": self.id}
-            if not self._sched_current:
-                args["resync"] = "true"
-            d = self.client.call("sync", args)
-            missing_data = False
-            for key in ["sched_current", "sched_next", "sched_history"]:
-                if key not in d:
-                    missing_data = True
-                    log.error(f"Missing {key} data in API response")
-            if missing_data:
-                continue
-            if self._do_sync:
-                with self._sched_lock:
-                    self._sched_current = d["sched_current"]
-                    self._sched_next = d["sched_next"]
-                    self._sched_history = d["sched_history"]
-                with self._requests_lock:
-                    self._raw_requests = d["request_line"]
-                    self._raw_user_requests = d["requests"]
-                post_sync.send(self, channel=self)
+        if d.get("sched_current") is self._sched_current:
+            # another thread shared this response and has already applied it
+            return
+        diff = self._update_timeline(d)
+        post_sync.send(self, diff=diff)
+
+    def _album_from_stub(self, raw_album: dict) -> "RainwaveAlbum":
+        """Return the known album for a partial album payload embedded in
+        another response, or a new :class:`RainwaveAlbum` that loads the
+        missing details when they are first needed."""
+
+        known = self._known_album(raw_album["id"])
+        if known is not None:
+            return known
+        return self._model(RainwaveAlbum)(self, raw_album)
+
+    @staticmethod
+    def _album_raw_from_response(d: dict) -> dict:
+        if "album_error" in d:
+            raise IndexError(d["album_error"]["text"])
+        album_data = d["album"]
+        if "text" in album_data:
+            raise IndexError(album_data["text"])
+        return album_data
+
+    @staticmethod
+    def _artist_raw_from_response(d: dict, artist_id: int) -> dict:
+        if "id" in d["artist"]:
+            return d["artist"]
+        err = f"Channel does not contain artist with id: {artist_id}"
+        raise IndexError(err)
+
+    def _get_album_raw_info(self, album_id: int) -> dict:
+        args = {"sid": self.id, "id": album_id}
+        d = self.client.call("album", args)
+        return self._album_raw_from_response(d)
+
+    def _get_artist_raw_info(self, artist_id: int) -> dict:
+        args = {"sid": self.id, "id": artist_id}
+        d = self.client.call("artist", args)
+        return self._artist_raw_from_response(d, artist_id)
 
     def _get_listener_raw_info(self, listener_id: int) -> dict:
         args = {"id": listener_id, "sid": self.id}
         d = self.client.call("listener", args)
+        return self._listener_raw_from_response(d, listener_id)
+
+    def _get_song_raw_info(self, song_id: int) -> dict:
+        args = {"sid": self.id, "id": song_id}
+        d = self.client.call("song", args)
+        return self._song_raw_from_response(d, song_id)
+
+    @staticmethod
+    def _get_many(
+        getter: typing.Callable,
+        ids: collections.abc.Iterable,
+        max_workers: int,
+    ) -> list:
+        """Call ``getter`` once for each distinct ID, at most ``max_workers`` at
+        a time, and return the results in the order of ``ids``. An ID that
+        raises :exc:`IndexError` gets the exception in place of a result."""
+
+        ids = list(ids)
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return []
+
+        def _get(_id: int) -> typing.Any:  # noqa: ANN401
+            try:
+                return getter(_id)
+            except IndexError as e:
+                return e
+
+        workers = min(max_workers, len(unique_ids))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(unique_ids, executor.map(_get, unique_ids)))
+        return [results[_id] for _id in ids]
+
+    def _get_raw_songs(
+        self,
+        song_ids: collections.abc.Iterable[int],
+        max_workers: int = BULK_MAX_WORKERS,
+    ) -> list["dict | RainwaveSong | IndexError"]:
+        """Return the cached :class:`RainwaveSong` or the song data from the
+        API for each of the given song IDs, without building new song
+        objects. A missing ID gets an :exc:`IndexError` in its place."""
+
+        def _get_raw_song(song_id: int) -> "dict | RainwaveSong":
+            cached = self.cache.get("song", song_id)
+            if cached is not None:
+                return cached
+            return self._get_song_raw_info(song_id)
+
+        return self._get_many(_get_raw_song, song_ids, max_workers)
+
+    def _index_songs(self, songs: list["RainwaveSong"]) -> None:
+        """Add songs to :attr:`search_index` if it has been built."""
+
+        with self._catalog_lock:
+            if self._search is not None:
+                for song in songs:
+                    self._search.add("song", song)
+
+    def _known(
+        self, kind: str, index: RainwaveIndex | None, item_id: int
+    ) -> "RainwaveAlbum | RainwaveArtist | None":
+        """Return the object of the given kind and ID from the cache or the
+        loaded catalog, without calling the API. A catalog object is put in the
+        cache the first time it is returned. Once its entry has expired or has
+        been invalidated, ``None`` is returned so that fresh data is fetched,
+        until the catalog is reloaded."""
+
+        item = self.cache.get(kind, item_id)
+        if item is not None or index is None:
+            return item
+        item = index.by_id.get(item_id)
+        if item is None or self.cache.max_size <= 0:
+            return item
+        cached = self._cached_catalog[kind]
+        if item_id in cached:
+            return None
+        cached.add(item_id)
+        return self.cache.put(kind, item_id, item)
+
+    def _known_album(self, album_id: int) -> "RainwaveAlbum | None":
+        """Return the album with the given ID from the cache or the loaded
+        catalog, without calling the API. See :meth:`_known`."""
+
+        return self._known("album", self._album_index, album_id)
+
+    def _known_artist(self, artist_id: int) -> "RainwaveArtist | None":
+        """Return the artist with the given ID from the cache or the loaded
+        catalog, without calling the API. See :meth:`_known`."""
+
+        return self._known("artist", self._artist_index, artist_id)
+
+    @staticmethod
+    def _listener_raw_from_response(d: dict, listener_id: int) -> dict:
         if "listener" in d:
             return d["listener"]
         err = f"There is no listener with id: {listener_id}"
         raise IndexError(err)
 
-    def _new_schedule(self, raw_schedule: dict) -> "RainwaveSchedule":
+    def _new_schedule(self, raw_schedule: dict) -> "RainwaveSchedule | None":
+        if not raw_schedule:
+            return None
         if raw_schedule["type"] == "Election":
-            return RainwaveElection(self, raw_schedule)
+            return self._model(RainwaveElection)(self, raw_schedule)
         if raw_schedule["type"] == "OneUp":
-            return RainwaveOneTimePlay(self, raw_schedule)
+            return self._model(RainwaveOneTimePlay)(self, raw_schedule)
+
+    def _model(self, cls: type) -> type:
+        """Return the class to create ``cls`` objects of this channel from:
+        ``cls`` itself, or its compact variant (see :func:`compact_class`) if
+        the client was created with ``compact=True``."""
+
+        model = self._models.get(cls)
+        if model is None:
+            model = compact_class(cls) if self.client.compact else cls
+            self._models[cls] = model
+        return model
+
+    def _refresh_albums(self, d: dict) -> None:
+        # a newer catalog arrived from the snapshot cache; rebuild on next use
+        with self._catalog_lock:
+            self._raw_albums = d["all_albums"]
+            self._albums = None
+
+    def _refresh_artists(self, d: dict) -> None:
+        with self._catalog_lock:
+            self._raw_artists = d["all_artists"]
+            self._artists = None
 
     def _stale(self) -> bool:
         """Return True if timeline information (:attr:`schedule_current`,
@@ -119,42 +270,179 @@ class RainwaveChannel(dict):
 
         if len(self._sched_next) < 1:
             return True
-        now = datetime.datetime.now(datetime.timezone.utc)
-        ts = self._sched_current["end"]
-        ts = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc)
-        return now > ts
+        return time.time() > self._sched_current["end"]
+
+    @staticmethod
+    def _song_raw_from_response(d: dict, song_id: int) -> dict:
+        if "albums" in d["song"]:
+            return d["song"]
+        err = f"Channel does not contain song with id: {song_id}"
+        raise IndexError(err)
+
+    def _sync_args(self) -> dict:
+        args = {"sid": self.id}
+        if not self._sched_current:
+            args["resync"] = "true"
+        return args
+
+    @staticmethod
+    def _timeline_complete(d: dict) -> bool:
+        missing_data = False
+        for key in ["sched_current", "sched_next", "sched_history"]:
+            if key not in d:
+                missing_data = True
+                log.error(f"Missing {key} data in API response")
+        return not missing_data
+
+    def _update_timeline(self, d: dict) -> RainwaveTimelineDiff:
+        """Apply the timeline of a ``sync`` or ``info`` response and return
+        what changed."""
+
+        with self._sched_lock:
+            old = {
+                "sched_current": self._sched_current,
+                "sched_next": self._sched_next,
+                "sched_history": self._sched_history,
+            }
+        with self._requests_lock:
+            old["request_line"] = self._raw_requests
+        diff = diff_timeline(old, d)
+        # build the schedule objects before taking the lock, readers use the
+        # previous timeline until the new one is swapped in
+        timeline = RainwaveTimeline(
+            self._new_schedule(d["sched_current"]),
+            tuple(self._new_schedule(x) for x in d["sched_next"]),
+            tuple(self._new_schedule(x) for x in d["sched_history"]),
+        )
+        with self._sched_lock:
+            self._sched_current = d["sched_current"]
+            self._sched_next = d["sched_next"]
+            self._sched_history = d["sched_history"]
+            self._timeline = timeline
+        with self._requests_lock:
+            self._raw_requests = d["request_line"]
+            self._raw_user_requests = d["requests"]
+        return diff
+
+    def _wrap_catalog(self, cls: type, raw_items: list) -> list:
+        """Return a list with an object of type ``cls`` for every item of a
+        catalog payload. The payload is left as it is, since coalesced calls
+        share it with other callers; callers drop their own reference to it
+        afterwards so it is not kept alive next to the objects."""
+
+        cls = self._model(cls)
+        return [cls(self, raw_item) for raw_item in raw_items]
+
+    def album_stats(
+        self, hydrate: bool = False, max_workers: int = BULK_MAX_WORKERS
+    ) -> dict[str, array.array]:
+        """Return statistics about every album in the playlist of the channel
+        as columns: a dictionary of :class:`array.array` objects with one entry
+        per album, in the order of :attr:`albums`. The columns are ``id``
+        (integers), and ``rating``, ``rating_count``, ``fave_count``,
+        ``request_count``, ``vote_count``, ``cool_lowest``, and ``played_last``
+        (floats). Times are seconds since the epoch, as in the API. The values
+        are read from the album data directly, without creating
+        :class:`datetime.datetime` objects or calling the API.
+
+        The catalog list does not include ``rating_count``, ``fave_count``,
+        ``request_count``, ``vote_count``, or ``played_last``; those are `NaN`
+        for albums whose full data has not been loaded. Use ``hydrate=True`` to
+        load it first for every album that needs it, in parallel.
+
+        Usage::
+
+          >>> stats = rw.channels[0].album_stats(hydrate=True)
+          >>> statistics.median(stats["rating"])
+          3.98
+
+        :param hydrate: (optional) load the full data of albums that are missing
+            any statistic first, default `False`. This makes one API call per
+            album the first time.
+        :type hydrate: bool
+        :param max_workers: (optional) the maximum number of API calls to make
+            at once when hydrating, default `8`.
+        :type max_workers: int
+        """
+
+        albums = self.albums
+        if hydrate:
+            missing = [
+                album
+                for album in albums
+                if any(key not in album for key in ALBUM_DETAIL_STATS)
+            ]
+            ids = [album.id for album in missing]
+            details = self._get_many(self._get_album_raw_info, ids, max_workers)
+            for album, raw_album in zip(missing, details):
+                if not isinstance(raw_album, IndexError):
+                    album.update(raw_album)
+        return columns(albums, ALBUM_STATS)
+
+    def album_stats_array(
+        self, hydrate: bool = False, max_workers: int = BULK_MAX_WORKERS
+    ) -> typing.Any:  # noqa: ANN401
+        """Return the statistics of :meth:`album_stats` as a NumPy structured
+        array with one record per album, so that sorting, aggregation, and
+        percentiles are vectorized operations::
+
+          >>> stats = rw.channels[0].album_stats_array(hydrate=True)
+          >>> numpy.nanpercentile(stats["rating"], 90)
+          4.21
+          >>> stats[numpy.argsort(stats["request_count"])[-10:]]["id"]
+
+        NumPy is not a requirement of this library; this raises
+        :exc:`ImportError` if it is not installed.
+
+        :param hydrate: (optional) see :meth:`album_stats`.
+        :type hydrate: bool
+        :param max_workers: (optional) see :meth:`album_stats`.
+        :type max_workers: int
+        """
+
+        return to_numpy(self.album_stats(hydrate, max_workers))
 
     @property
     def albums(self) -> list["RainwaveAlbum"]:
         """A list of :class:`RainwaveAlbum` objects in the playlist of the
         channel."""
 
-        if self._raw_albums is None:
-            d = self.client.call("all_albums", {"sid": self.id})
-            if "all_albums" in d:
-                self._raw_albums = d["all_albums"]
-        if self._albums is None:
-            self._albums = []
-            for raw_album in self._raw_albums:
-                new_album = RainwaveAlbum(self, raw_album)
-                self._albums.append(new_album)
-        return self._albums
+        with self._catalog_lock:
+            if self._albums is None:
+                if self._raw_albums is None:
+                    args = {"sid": self.id}
+                    d = self.client._catalog("all_albums", args, self._refresh_albums)
+                    if "all_albums" in d:
+                        self._raw_albums = d["all_albums"]
+                albums = self._wrap_catalog(RainwaveAlbum, self._raw_albums)
+                self._raw_albums = None
+                self._album_index = RainwaveIndex(albums)
+                self._cached_catalog["album"].clear()
+                self._albums = albums
+                if self._search is not None:
+                    self._search.sync("album", albums)
+            return self._albums
 
     @property
     def artists(self) -> list["RainwaveArtist"]:
         """A list of :class:`RainwaveArtist` objects in the playlist of the
         channel."""
 
-        if self._raw_artists is None:
-            d = self.client.call("all_artists", {"sid": self.id})
-            if "all_artists" in d:
-                self._raw_artists = d["all_artists"]
-        if self._artists is None:
-            self._artists = []
-            for raw_artist in self._raw_artists:
-                new_artist = RainwaveArtist(self, raw_artist)
-                self._artists.append(new_artist)
-        return self._artists
+        with self._catalog_lock:
+            if self._artists is None:
+                if self._raw_artists is None:
+                    args = {"sid": self.id}
+                    d = self.client._catalog("all_artists", args, self._refresh_artists)
+                    if "all_artists" in d:
+                        self._raw_artists = d["all_artists"]
+                artists = self._wrap_catalog(RainwaveArtist, self._raw_artists)
+                self._raw_artists = None
+                self._artist_index = RainwaveIndex(artists)
+                self._cached_catalog["artist"].clear()
+                self._artists = artists
+                if self._search is not None:
+                    self._search.sync("artist", artists)
+            return self._artists
 
     def clear_rating(self, song_id: int) -> dict:
         args = {"sid": self.id, "song_id": song_id}
@@ -188,6 +476,60 @@ class RainwaveChannel(dict):
         args = {"song_id": song_id, "fave": fave}
         return self.client.call("fave_song", args)
 
+    def find_albums(self, name: str) -> list["RainwaveAlbum"]:
+        """Return a list of :class:`RainwaveAlbum` objects whose names match
+        ``name``, ignoring case, punctuation, and extra whitespace.
+
+        :param name: the name of the desired albums.
+        :type name: str
+        """
+
+        self.albums  # loads the catalog and its index
+        return self._album_index.find(name)
+
+    def find_albums_by_prefix(
+        self, prefix: str, limit: int | None = None
+    ) -> list["RainwaveAlbum"]:
+        """Return a list of :class:`RainwaveAlbum` objects whose names start
+        with ``prefix``, ignoring case, punctuation, and extra whitespace. The
+        albums are sorted by name. Useful for autocompletion.
+
+        :param prefix: the start of the names of the desired albums.
+        :type prefix: str
+        :param limit: (optional) the maximum number of albums to return.
+        :type limit: int
+        """
+
+        self.albums  # loads the catalog and its index
+        return self._album_index.find_prefix(prefix, limit)
+
+    def find_artists(self, name: str) -> list["RainwaveArtist"]:
+        """Return a list of :class:`RainwaveArtist` objects whose names match
+        ``name``, ignoring case, punctuation, and extra whitespace.
+
+        :param name: the name of the desired artists.
+        :type name: str
+        """
+
+        self.artists  # loads the catalog and its index
+        return self._artist_index.find(name)
+
+    def find_artists_by_prefix(
+        self, prefix: str, limit: int | None = None
+    ) -> list["RainwaveArtist"]:
+        """Return a list of :class:`RainwaveArtist` objects whose names start
+        with ``prefix``, ignoring case, punctuation, and extra whitespace. The
+        artists are sorted by name.
+
+        :param prefix: the start of the names of the desired artists.
+        :type prefix: str
+        :param limit: (optional) the maximum number of artists to return.
+        :type limit: int
+        """
+
+        self.artists  # loads the catalog and its index
+        return self._artist_index.find_prefix(prefix, limit)
+
     def get_album_by_id(self, album_id: int) -> "RainwaveAlbum":
         """Return a :class:`RainwaveAlbum` for the given album ID. Raise an
         :exc:`IndexError` if there is no album with the given ID in the
@@ -197,14 +539,12 @@ class RainwaveChannel(dict):
         :type album_id: int
         """
 
-        args = {"sid": self.id, "id": album_id}
-        d = self.client.call("album", args)
-        if "album_error" in d:
-            raise IndexError(d["album_error"]["text"])
-        album_data = d["album"]
-        if "text" in album_data:
-            raise IndexError(album_data["text"])
-        return RainwaveAlbum(self, album_data)
+        known = self._known_album(album_id)
+        if known is not None:
+            return known
+        raw_album = self._get_album_raw_info(album_id)
+        album = self._model(RainwaveAlbum)(self, raw_album)
+        return self.cache.put("album", album_id, album)
 
     def get_album_by_name(self, name: str) -> "RainwaveAlbum":
         """Return a :class:`RainwaveAlbum` for the given album name. Raise an
@@ -215,12 +555,33 @@ class RainwaveChannel(dict):
         :type name: str
         """
 
-        for alb in self.albums:
-            if alb.name == name:
-                return alb
+        self.albums  # loads the catalog and its index
+        alb = self._album_index.by_name.get(name)
+        if alb is not None:
+            return alb
         error = f"Channel does not contain album with name: {name}"
         raise IndexError(error)
 
+    def get_albums_by_ids(
+        self,
+        album_ids: collections.abc.Iterable[int],
+        max_workers: int = BULK_MAX_WORKERS,
+    ) -> list["RainwaveAlbum | IndexError"]:
+        """Return a list of :class:`RainwaveAlbum` objects for the given album
+        IDs, in the same order. The albums are fetched in parallel and each
+        distinct ID is fetched only once. If there is no album with one of the
+        IDs, the list holds the :exc:`IndexError` for that ID instead of an
+        album; no exception is raised.
+
+        :param album_ids: the IDs of the desired albums.
+        :type album_ids: iterable of int
+        :param max_workers: (optional) the maximum number of API calls to make
+            at once, default `8`.
+        :type max_workers: int
+        """
+
+        return self._get_many(self.get_album_by_id, album_ids, max_workers)
+
     def get_artist_by_id(self, artist_id: int) -> "RainwaveArtist":
         """Return a :class:`RainwaveArtist` for the given artist ID. Raise an
         :exc:`IndexError` if there is no artist with the given ID in the
@@ -230,11 +591,27 @@ class RainwaveChannel(dict):
         :type artist_id: int
         """
 
-        args = {"sid": self.id, "id": artist_id}
-        d = self.client.call("artist", args)
-        if "id" in d["artist"]:
-            return RainwaveArtist(self, d["artist"])
-        err = f"Channel does not contain artist with id: {artist_id}"
+        known = self._known_artist(artist_id)
+        if known is not None:
+            return known
+        raw_artist = self._get_artist_raw_info(artist_id)
+        artist = self._model(RainwaveArtist)(self, raw_artist)
+        return self.cache.put("artist", artist_id, artist)
+
+    def get_artist_by_name(self, name: str) -> "RainwaveArtist":
+        """Return a :class:`RainwaveArtist` for the given artist name. Raise an
+        :exc:`IndexError` if there is no artist with the given name in the
+        playlist of the channel.
+
+        :param name: the name of the desired artist.
+        :type name: str
+        """
+
+        self.artists  # loads the catalog and its index
+        artist = self._artist_index.by_name.get(name)
+        if artist is not None:
+            return artist
+        err = f"Channel does not contain artist with name: {name}"
         raise IndexError(err)
 
     def get_listener_by_id(self, listener_id: int) -> "RainwaveListener":
@@ -245,8 +622,12 @@ class RainwaveChannel(dict):
         :type listener_id: int
         """
 
+        cached = self.cache.get("listener", listener_id)
+        if cached is not None:
+            return cached
         raw_listener = self._get_listener_raw_info(listener_id)
-        return RainwaveListener(self, raw_listener)
+        listener = self._model(RainwaveListener)(self, raw_listener)
+        return self.cache.put("listener", listener_id, listener)
 
     def get_listener_by_name(self, name: str) -> "RainwaveListener":
         """Return a :class:`RainwaveListener` for the given listener name. Raise
@@ -263,6 +644,24 @@ class RainwaveChannel(dict):
         err = f"No current listener named {name}"
         raise IndexError(err)
 
+    def get_listeners_by_ids(
+        self,
+        listener_ids: collections.abc.Iterable[int],
+        max_workers: int = BULK_MAX_WORKERS,
+    ) -> list["RainwaveListener | IndexError"]:
+        """Return a list of :class:`RainwaveListener` objects for the given
+        listener IDs, in the same order. See :meth:`get_albums_by_ids` for how
+        the listeners are fetched and how missing IDs are reported.
+
+        :param listener_ids: the IDs of the desired listeners.
+        :type listener_ids: iterable of int
+        :param max_workers: (optional) the maximum number of API calls to make
+            at once, default `8`.
+        :type max_workers: int
+        """
+
+        return self._get_many(self.get_listener_by_id, listener_ids, max_workers)
+
     def get_song_by_id(self, song_id: int) -> "RainwaveSong":
         """Return a :class:`RainwaveSong` for the given song ID. Raise an
         :exc:`IndexError` if there is no song with the given ID in the playlist
@@ -272,13 +671,53 @@ class RainwaveChannel(dict):
         :type song_id: int
         """
 
-        args = {"sid": self.id, "id": song_id}
-        d = self.client.call("song", args)
-        if "albums" in d["song"]:
-            alb = self.get_album_by_id(d["song"]["albums"][0]["id"])
-            return RainwaveSong(alb, d["song"])
-        err = f"Channel does not contain song with id: {song_id}"
-        raise IndexError(err)
+        cached = self.cache.get("song", song_id)
+        if cached is not None:
+            return cached
+        raw_song = self._get_song_raw_info(song_id)
+        alb = self.get_album_by_id(raw_song["albums"][0]["id"])
+        song = self._model(RainwaveSong)(alb, raw_song)
+        return self.cache.put("song", song_id, song)
+
+    def get_songs_by_ids(
+        self,
+        song_ids: collections.abc.Iterable[int],
+        max_workers: int = BULK_MAX_WORKERS,
+    ) -> list["RainwaveSong | IndexError"]:
+        """Return a list of :class:`RainwaveSong` objects for the given song
+        IDs, in the same order. See :meth:`get_albums_by_ids` for how the songs
+        are fetched and how missing IDs are reported. The albums of all the
+        songs are fetched together afterwards, once per distinct album.
+
+        :param song_ids: the IDs of the desired songs.
+        :type song_ids: iterable of int
+        :param max_workers: (optional) the maximum number of API calls to make
+            at once, default `8`.
+        :type max_workers: int
+        """
+
+        raw_songs = self._get_raw_songs(song_ids, max_workers)
+        album_ids = [
+            raw_song["albums"][0]["id"]
+            for raw_song in raw_songs
+            if not isinstance(raw_song, IndexError | RainwaveSong)
+        ]
+        albums = self._get_many(self.get_album_by_id, album_ids, max_workers)
+        albums = dict(zip(album_ids, albums))
+
+        song_cls = self._model(RainwaveSong)
+        songs = []
+        for raw_song in raw_songs:
+            if isinstance(raw_song, IndexError | RainwaveSong):
+                songs.append(raw_song)
+                continue
+            alb = albums[raw_song["albums"][0]["id"]]
+            if isinstance(alb, IndexError):
+                songs.append(alb)
+            else:
+                song = song_cls(alb, raw_song)
+                songs.append(self.cache.put("song", song.id, song))
+        return songs
 
     @property
     def id(self) -> int:
@@ -294,7 +733,8 @@ class RainwaveChannel(dict):
     def listeners(self) -> list["RainwaveListener"]:
         """A list of :class:`RainwaveListener` objects listening to the channel."""
         d = self.client.call("current_listeners", {"sid": self.id})
-        return [RainwaveListener(self, x) for x in d["current_listeners"]]
+        listener_cls = self._model(RainwaveListener)
+        return [listener_cls(self, x) for x in d["current_listeners"]]
 
     @property
     def name(self) -> str:
@@ -340,63 +780,124 @@ class RainwaveChannel(dict):
         the channel."""
         if self._stale():
             self._do_async_get()
-        rqs = []
         with self._requests_lock:
-            for raw_request in self._raw_requests:
-                if raw_request.get("song_id") is None:
-                    continue
-                _song = self.get_song_by_id(raw_request["song_id"])
-                _requester = self.get_listener_by_id(raw_request["user_id"])
-                rq = RainwaveRequest.request_from_song(_song, _requester)
-                rqs.append(rq)
+            raw_requests = [x for x in self._raw_requests if x.get("song_id")]
+
+        # songs are usually embedded in the request line, fetch the rest together
+        def _embedded_song(raw_request: dict) -> dict | None:
+            raw_song = raw_request.get("song")
+            if raw_song and raw_song.get("albums"):
+                return raw_song
+            return None
+
+        song_ids = [x["song_id"] for x in raw_requests if not _embedded_song(x)]
+        songs = dict(zip(song_ids, self.get_songs_by_ids(song_ids)))
+
+        request_cls = self._model(RainwaveRequest)
+        rqs = []
+        for raw_request in raw_requests:
+            raw_song = _embedded_song(raw_request)
+            if raw_song:
+                alb = self._album_from_stub(raw_song["albums"][0])
+            else:
+                raw_song = songs[raw_request["song_id"]]
+                if isinstance(raw_song, IndexError):
+                    raise raw_song
+                alb = raw_song.album
+            rq = request_cls(alb, raw_song)
+            rq["requester_id"] = raw_request["user_id"]
+            rq["requester_name"] = raw_request.get("username")
+            rqs.append(rq)
         return rqs
 
     @property
     def schedule_current(self) -> "RainwaveSchedule":
         """The current :class:`RainwaveSchedule` for the channel."""
-        if self._stale():
-            self._do_async_get()
-        with self._sched_lock:
-            sched_current = self._new_schedule(self._sched_current)
-        return sched_current
+        return self.timeline.current
 
     @property
     def schedule_history(self) -> list["RainwaveSchedule"]:
         """A list of the past :class:`RainwaveSchedule` objects for the channel. The
         events are sorted reverse-chronologically: the first event in the list was the
         most recent event."""
-        if self._stale():
-            self._do_async_get()
-        sched_history = []
-        with self._sched_lock:
-            sched_history.extend([self._new_schedule(x) for x in self._sched_history])
-        return sched_history
+        return list(self.timeline.history)
 
     @property
     def schedule_next(self) -> list["RainwaveSchedule"]:
         """A list of the next :class:`RainwaveSchedule` objects for the channel. The
         events are sorted chronologically: the first event in the list will happen
         soonest."""
-        if self._stale():
-            self._do_async_get()
-        sched_next = []
-        with self._sched_lock:
-            sched_next.extend([self._new_schedule(x) for x in self._sched_next])
-        return sched_next
+        return list(self.timeline.next)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kinds: collections.abc.Iterable[str] | None = None,
+    ) -> list["RainwaveSearchResult"]:
+        """Search the playlist of the channel for albums, artists, and songs
+        matching ``query`` without calling the API. Matching tolerates typos,
+        missing words, case and punctuation. Returns a list of
+        :class:`RainwaveSearchResult` tuples, best match first.
+
+        Songs are searchable once :attr:`RainwaveAlbum.songs` has been loaded
+        for their album.
+
+        :param query: the text to search for.
+        :type query: str
+        :param limit: (optional) the maximum number of results, default `10`.
+        :type limit: int
+        :param kinds: (optional) only return these kinds of results: `album`,
+            `artist`, or `song`.
+        :type kinds: iterable of str
+
+        Usage::
+
+          >>> game = rw.channels[0]
+          >>> game.search('chrono trigegr', kinds=['album'])[0].item
+          <RainwaveAlbum [Game // Chrono Trigger]>
+        """
+
+        return self.search_index.search(query, limit, kinds)
+
+    @property
+    def search_index(self) -> "RainwaveSearch":
+        """The :class:`RainwaveSearch` index used by :meth:`search`. It is built
+        from :attr:`albums` and :attr:`artists` the first time it is used and
+        kept up to date when they are reloaded."""
+
+        if self._search is None:
+            with self._catalog_lock:
+                if self._search is None:
+                    search = RainwaveSearch()
+                    search.sync("album", self.albums)
+                    search.sync("artist", self.artists)
+                    for album in self.albums:
+                        for song in album.get("song_objects", []):
+                            search.add("song", song)
+                    self._search = search
+        return self._search
 
     def start_sync(self) -> None:
-        """Begin syncing the timeline for the channel."""
+        """Begin syncing the timeline for the channel in the background, with
+        the :attr:`RainwaveClient.sync_scheduler` of the client. Receivers of
+        :data:`pre_sync` and :data:`post_sync` are called from its dispatch
+        thread."""
 
-        self.stop_sync()
-        self._sync_thread = threading.Thread(target=self._do_sync_thread)
-        self._sync_thread.daemon = True
-        self._sync_thread.start()
+        self.client.sync_scheduler.start(self)
 
     def stop_sync(self) -> None:
         """Stop syncing the timeline for the channel."""
 
-        self._do_sync = False
-        self._sync_thread = None
+        self.client.sync_scheduler.stop(self)
+
+    @property
+    def sync_stats(self) -> dict[str, float] | None:
+        """The counters of the background sync of the channel, see
+        :meth:`RainwaveSyncScheduler.stats`, or ``None`` if the channel is not
+        syncing."""
+
+        return self.client.sync_scheduler.stats(self)
 
     @property
     def mp3_stream(self) -> str:
@@ -409,6 +910,17 @@ class RainwaveChannel(dict):
         """The URL of the web interface for the channel."""
         return f"https://rainwave.cc/{self.key}/"
 
+    @property
+    def timeline(self) -> RainwaveTimeline:
+        """The current, next, and past :class:`RainwaveSchedule` objects for the
+        channel as one :class:`RainwaveTimeline`, all from the same update. The
+        objects are built once per update, so reading them again until the
+        next update is free, and an election keeps its
+        :attr:`RainwaveElection.candidates`."""
+        if self._stale():
+            self._do_async_get()
+        return self._timeline
+
     @property
     def user_requests(self) -> "RainwaveUserRequestQueue":
         """A :class:`RainwaveUserRequestQueue` of :class:`RainwaveUserRequest`
@@ -416,12 +928,13 @@ class RainwaveChannel(dict):
         if self._stale():
             self._do_async_get()
         rqs = RainwaveUserRequestQueue(self)
+        request_cls = self._model(RainwaveUserRequest)
         with self._requests_lock:
-            for raw_request in self._raw_user_requests:
-                album_id = raw_request["albums"][0]["id"]
-                alb = self.get_album_by_id(album_id)
-                rq = RainwaveUserRequest(alb, raw_request)
-                rqs.append(rq)
+            raw_requests = list(self._raw_user_requests)
+        for raw_request in raw_requests:
+            alb = self._album_from_stub(raw_request["albums"][0])
+            rq = request_cls(alb, raw_request)
+            rqs.append(rq)
         return rqs
 
     def vote(self, entry_id: int) -> dict:
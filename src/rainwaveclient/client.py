@@ -1,11 +1,24 @@
-import json
+import collections
+import hashlib
+import http.client
 import logging
+import os
+import threading
+import time
+import typing
 import uuid
-from urllib.error import HTTPError
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
 from .channel import RainwaveChannel
+from .decoder import JSONDecoder, default_decoder
+from .flight import SingleFlight
+from .metrics import RainwaveMetrics
+from .pool import ACCEPT_ENCODING, RainwaveConnectionPool
+from .ratelimit import RainwaveRateLimiter
+from .retry import RainwaveAPIError, RainwaveCircuitBreaker, RainwaveRetryPolicy
+from .scheduler import RainwaveSyncScheduler
+from .snapshot import RainwaveSnapshotCache
+from .transport import RainwavePlayer, RainwaveRecorder
 
 log = logging.getLogger(__name__)
 
@@ -18,6 +31,76 @@ class RainwaveClient:
     :type user_id: int
     :param key: the API key to use when communicating with the API.
     :type key: str
+    :param pool_size: (optional) the maximum number of idle connections to keep
+        open to the API, default `10`.
+    :type pool_size: int
+    :param pool_idle_timeout: (optional) the number of seconds an idle
+        connection is kept open, default `60`.
+    :type pool_idle_timeout: float
+    :param cache_size: (optional) the maximum number of objects each channel
+        keeps in its :attr:`RainwaveChannel.cache`, default `1024`.
+    :type cache_size: int
+    :param cache_ttl: (optional) the number of seconds each kind of object stays
+        in a channel cache, see :class:`RainwaveCache`.
+    :type cache_ttl: dict
+    :param cache_dir: (optional) a directory in which to save the station list
+        and channel catalogs between runs, see :class:`RainwaveSnapshotCache`.
+        By default nothing is saved.
+    :type cache_dir: str or path-like
+    :param cache_max_age: (optional) the number of seconds after which a saved
+        catalog is refreshed in the background, default `86400` (one day).
+    :type cache_max_age: float
+    :param compact: (optional) keep the documented fields of albums, artists,
+        songs, listeners, and schedule events in fixed slots instead of in a
+        hash table per object, default `False`. This needs much less memory for
+        large catalogs, at the cost of slower item access. The objects work the
+        same either way, except that code reading the dictionary storage
+        directly, such as :func:`json.dumps`, needs ``dict(obj)`` first. Run
+        ``benchmarks/memory.py`` to compare both modes.
+    :type compact: bool
+    :param compress: (optional) ask the API for `gzip` or `deflate` compressed
+        responses, default `True`. See :attr:`transfer_stats`.
+    :type compress: bool
+    :param json_decoder: (optional) a callable that decodes a response body
+        from :class:`bytes`, default the fastest decoder installed, see
+        :func:`rainwaveclient.decoder.default_decoder`.
+    :type json_decoder: callable
+    :param retry: (optional) the :class:`RainwaveRetryPolicy` that decides
+        which failed calls are tried again and how long to wait first, and how
+        long :meth:`RainwaveChannel.start_sync` waits after a failed sync.
+        Default three attempts per call.
+    :type retry: RainwaveRetryPolicy
+    :param breaker: (optional) the :class:`RainwaveCircuitBreaker` that stops
+        calling API paths that keep failing. Default a circuit breaker that
+        opens after five consecutive failures for 30 seconds.
+    :type breaker: RainwaveCircuitBreaker
+    :param timeout: (optional) the number of seconds to wait for the API before
+        a call fails with :exc:`TimeoutError`, default `30`.
+    :type timeout: float
+    :param sync_timeout: (optional) the timeout for ``sync`` calls, which wait
+        for the next timeline change, default `600`.
+    :type sync_timeout: float
+    :param coalesce: (optional) let identical calls made at the same time from
+        several threads share one API request and its result, default `True`.
+        See :meth:`call`.
+    :type coalesce: bool
+    :param sync_scheduler: (optional) the :class:`RainwaveSyncScheduler` that
+        syncs the channels of this client in the background. Pass the same one
+        to several clients to share its threads. By default each client has
+        its own.
+    :type sync_scheduler: RainwaveSyncScheduler
+    :param rate_limiter: (optional) the :class:`RainwaveRateLimiter` that
+        limits how fast this client calls the API. Pass the same one to several
+        clients to share one limit. By default calls are not limited.
+    :type rate_limiter: RainwaveRateLimiter
+    :param metrics: (optional) the :class:`RainwaveMetrics` that records the
+        calls of this client. Pass the same one to several clients to record
+        them together. By default each client has its own.
+    :type metrics: RainwaveMetrics
+    :param transport: (optional) the object that sends the HTTP requests of
+        API calls, such as a :class:`RainwaveRecorder` or a
+        :class:`RainwavePlayer`. Default :attr:`pool`.
+    :type transport: RainwaveRecorder or RainwavePlayer
     """
 
     #: The URL upon which all API calls are based.
@@ -26,7 +109,29 @@ class RainwaveClient:
     #: The format string used to build canonical album art URLs.
     art_fmt = "https://rainwave.cc{0}_320.jpg"
 
-    def __init__(self, user_id: int | None = None, key: str | None = None) -> None:
+    def __init__(
+        self,
+        user_id: int | None = None,
+        key: str | None = None,
+        pool_size: int = 10,
+        pool_idle_timeout: float = 60.0,
+        cache_size: int = 1024,
+        cache_ttl: dict | None = None,
+        cache_dir: str | os.PathLike | None = None,
+        cache_max_age: float = 86400.0,
+        compact: bool = False,
+        compress: bool = True,
+        json_decoder: JSONDecoder | None = None,
+        retry: RainwaveRetryPolicy | None = None,
+        breaker: RainwaveCircuitBreaker | None = None,
+        timeout: float | None = 30.0,
+        sync_timeout: float | None = 600.0,
+        coalesce: bool = True,
+        sync_scheduler: RainwaveSyncScheduler | None = None,
+        rate_limiter: RainwaveRateLimiter | None = None,
+        metrics: RainwaveMetrics | None = None,
+        transport: RainwaveRecorder | RainwavePlayer | None = None,
+    ) -> None:
         if user_id is not None:
             self._user_id = int(user_id)
         if key is not None:
@@ -34,11 +139,172 @@ class RainwaveClient:
         self._raw_channels = None
         self._channels = None
         self.user_agent = uuid.uuid4().hex
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.compact = compact
+        self.compress = compress
+        self.coalesce = coalesce
+        self._flights = SingleFlight()
+
+        #: The callable used to decode API responses from :class:`bytes`.
+        self.json_decoder = json_decoder or default_decoder()
+        self._transfer = collections.defaultdict(collections.Counter)
+        self._transfer_lock = threading.Lock()
+
+        #: The :class:`RainwaveRetryPolicy` for API calls and syncs.
+        self.retry = retry or RainwaveRetryPolicy()
+
+        #: The :class:`RainwaveCircuitBreaker` for API calls.
+        self.breaker = breaker or RainwaveCircuitBreaker()
+        self.sync_timeout = sync_timeout
+
+        #: The :class:`RainwaveSyncScheduler` used by
+        #: :meth:`RainwaveChannel.start_sync`.
+        self.sync_scheduler = sync_scheduler or RainwaveSyncScheduler()
+
+        #: The :class:`RainwaveRateLimiter` for API calls, or ``None``.
+        self.rate_limiter = rate_limiter
+
+        #: The :class:`RainwaveMetrics` for API calls and syncs.
+        self.metrics = metrics or RainwaveMetrics()
+
+        #: The :class:`RainwaveConnectionPool` used for all API calls.
+        self.pool = RainwaveConnectionPool(pool_size, pool_idle_timeout, timeout)
+
+        #: The object that sends the HTTP requests of API calls, by default
+        #: :attr:`pool`. Anything with a ``request`` method like
+        #: :meth:`RainwaveConnectionPool.request` will do.
+        self.transport = transport or self.pool
+
+        #: The :class:`RainwaveSnapshotCache` used for the station list and
+        #: channel catalogs, or ``None`` if ``cache_dir`` was not given.
+        self.snapshots = None
+        if cache_dir is not None:
+            self.snapshots = RainwaveSnapshotCache(
+                cache_dir, cache_max_age, self._snapshot_owner, self.json_decoder
+            )
 
     def __repr__(self) -> str:
         return f"RainwaveClient(user_id={self.user_id!r}, key={self.key!r})"
 
-    def call(self, path: str, args: dict | None = None, method: str = "POST") -> dict:
+    def _catalog(
+        self,
+        path: str,
+        args: dict | None = None,
+        on_refresh: typing.Callable[[dict], None] | None = None,
+    ) -> dict:
+        """Call a catalog API method, using a saved response if there is one."""
+
+        if self.snapshots is None:
+            return self.call(path, args)
+        name = path if args is None else f"{path}-{args['sid']}"
+        return self.snapshots.fetch(
+            name, lambda: self.call(path, dict(args or {})), path, on_refresh
+        )
+
+    def _snapshot_owner(self) -> str:
+        """Identify the API URL, user and key the catalog is fetched for. The
+        key is hashed rather than written to disk."""
+
+        key = getattr(self, "_key", None)
+        key_hash = None if key is None else hashlib.sha256(key.encode()).hexdigest()
+        return f"{self.base_url} {getattr(self, '_user_id', None)} {key_hash}"
+
+    def _count(self, path: str, **counts: int) -> None:
+        with self._transfer_lock:
+            self._transfer[path].update(counts)
+
+    def _decode(
+        self, path: str, status: int, body: bytes, retry_after: str | None = None
+    ) -> dict:
+        """Decode a response body, or raise :exc:`RainwaveAPIError` if the API
+        failed. The API explains rejected requests (HTTP 4xx) in a JSON body,
+        which is returned like any other response."""
+
+        if status >= 500 or status == 429:
+            try:
+                seconds = float(retry_after) if retry_after else None
+            except ValueError:
+                seconds = None
+            reason = http.client.responses.get(status, "Server error")
+            raise RainwaveAPIError(path, status, reason, seconds)
+        start = time.perf_counter()
+        try:
+            return self.json_decoder(body)
+        except Exception as e:
+            raise RainwaveAPIError(path, status, f"Invalid JSON: {e}") from e
+        finally:
+            self.metrics.observe_decode(path, time.perf_counter() - start)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        data: bytes,
+        headers: dict,
+        timeout: float | None,
+        retry: bool,
+    ) -> dict:
+        attempt = 1
+        while True:
+            self.breaker.before_call(path)
+            try:
+                if self.rate_limiter is not None and self.rate_limiter.acquire(path):
+                    self._count(path, rate_limited=1)
+                log.debug(f"Calling {url}")
+                start = time.perf_counter()
+                status, response_headers, body, received = self.transport.request(
+                    method,
+                    url,
+                    body=data,
+                    headers=headers,
+                    decode_content=self.compress,
+                    timeout=timeout,
+                )
+                self.metrics.observe_call(
+                    path, status, time.perf_counter() - start, len(data), received
+                )
+                self._count(
+                    path, calls=1, received_bytes=received, decoded_bytes=len(body)
+                )
+                api_response = self._decode(
+                    path, status, body, response_headers.get("retry-after")
+                )
+            except Exception as e:
+                self.metrics.observe_error(path, e)
+                if not self.retry.retryable(e):
+                    self.breaker.record_abort(path)
+                    raise
+                self.breaker.record_failure(path)
+                self._count(path, errors=1)
+                if (
+                    not retry
+                    or attempt >= self.retry.attempts
+                    or not self.retry.safe_to_repeat(path, e)
+                ):
+                    raise
+                delay = self.retry.delay(attempt, e)
+                log.warning(f"Calling {url} failed ({e!r}), retrying in {delay:.1f} s")
+                self._count(path, retries=1)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self.breaker.record_abort(path)
+                raise
+            self.breaker.record_success(path)
+            log.debug(api_response)
+            return api_response
+
+    def call(
+        self,
+        path: str,
+        args: dict | None = None,
+        method: str = "POST",
+        timeout: float | None = None,
+        retry: bool = True,
+    ) -> dict:
         # noinspection PyUnresolvedReferences
         """Make a direct call to the API if you know the necessary path and
         arguments.
@@ -50,8 +316,23 @@ class RainwaveClient:
         :param method: (optional) the HTTP method to use for the API call,
             default `POST`
         :type method: str
+        :param timeout: (optional) the number of seconds to wait for the API,
+            default the ``timeout`` of the client.
+        :type timeout: float
+        :param retry: (optional) try failed calls again as :attr:`retry`
+            allows, default `True`.
+        :type retry: bool
         :return: The raw data returned from the API call.
         :rtype: dict
+        :raises RainwaveAPIError: if the API failed and the call was not
+            retried, or was retried as often as :attr:`retry` allows.
+        :raises RainwaveCircuitOpenError: if the API failed so often recently
+            that the call was not made, see :attr:`breaker`.
+
+        If another thread is already making a call with the same path, method,
+        and arguments, this call waits for it and returns the same result, or
+        raises the same exception, instead of sending its own request. Treat
+        the result as read-only, since other callers may hold it too.
 
         Usage::
 
@@ -72,16 +353,20 @@ class RainwaveClient:
             args["key"] = self.key
 
         data = urlencode(args).encode()
-        headers = {"user-agent": self.user_agent}
-        req = Request(url=url, data=data, headers=headers, method=method)  # noqa: S310
-        try:
-            log.debug(f"Calling {url}")
-            response = urlopen(req)  # noqa: S310
-        except HTTPError as e:
-            response = e
-        body = response.read().decode(encoding="utf-8")
-        api_response = json.loads(body)
-        log.debug(api_response)
+        headers = {
+            "content-type": "application/x-www-form-urlencoded",
+            "user-agent": self.user_agent,
+        }
+        if self.compress:
+            headers["accept-encoding"] = ACCEPT_ENCODING
+        if not self.coalesce:
+            return self._send(method, path, url, data, headers, timeout, retry)
+        key = (method, path, urlencode(sorted(args.items())))
+        api_response, shared = self._flights.do(
+            key, lambda: self._send(method, path, url, data, headers, timeout, retry)
+        )
+        if shared:
+            self._count(path, coalesced=1)
         return api_response
 
     @property
@@ -90,7 +375,7 @@ class RainwaveClient:
         :class:`RainwaveClient` object."""
 
         if self._raw_channels is None:
-            d = self.call("stations")
+            d = self._catalog("stations")
             if "stations" in d:
                 self._raw_channels = d["stations"]
             else:
@@ -114,6 +399,27 @@ class RainwaveClient:
     def key(self, value: str) -> None:
         self._key = value
 
+    @property
+    def transfer_stats(self) -> dict[str, dict[str, int]]:
+        """A dictionary of transfer counters for each API path called, for
+        example::
+
+            >>> rw.transfer_stats["all_albums"]
+            {'calls': 1, 'received_bytes': 118843, 'decoded_bytes': 1226093}
+
+        ``received_bytes`` counts response body bytes as they arrived, which is
+        less than ``decoded_bytes`` when ``compress`` is on and the API
+        compressed the responses. ``coalesced`` counts calls that shared the
+        request of an identical call in flight. ``rate_limited`` counts attempts
+        that waited for the :attr:`rate_limiter`. Once calls fail, ``errors``
+        counts failed attempts and ``retries`` the attempts that were tried
+        again; a sync loop that waits before syncing again after a failure
+        counts ``sync_backoffs``. See :attr:`breaker` for the state of each
+        circuit, and :attr:`metrics` for latencies, statuses, and errors."""
+
+        with self._transfer_lock:
+            return {path: dict(counts) for path, counts in self._transfer.items()}
+
     @property
     def user_id(self) -> int:
         """The User ID to use when communicating with the API. Find your User ID
@@ -0,0 +1,39 @@
+"""
+JSON decoders for API responses. A decoder is any callable that takes the
+response body as :class:`bytes` and returns the decoded object.
+"""
+
+import json
+import typing
+
+#: The type of a JSON decoder.
+JSONDecoder = typing.Callable[[bytes], typing.Any]
+
+
+def stdlib_decoder(data: bytes) -> typing.Any:  # noqa: ANN401
+    """Decode JSON with the standard library :func:`json.loads`."""
+
+    return json.loads(data)
+
+
+def default_decoder() -> JSONDecoder:
+    """Return the fastest JSON decoder available: :func:`orjson.loads` if
+    `orjson <https://pypi.org/project/orjson/>`_ is installed, otherwise
+    :func:`msgspec.json.decode` if `msgspec
+    <https://pypi.org/project/msgspec/>`_ is installed, otherwise
+    :func:`stdlib_decoder`. The first two parse the bytes directly; all of them
+    return the same objects."""
+
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return orjson.loads
+    try:
+        import msgspec.json
+    except ImportError:
+        pass
+    else:
+        return msgspec.json.decode
+    return stdlib_decoder
@@ -13,14 +13,145 @@ To use, either register a callable using your target signal's
     @receiver(post_sync)
     def on_post_sync(signal, sender, **kwargs):
         ## do something here
+
+Receivers are called in the thread that sends the signal, so a slow receiver
+delays whatever sent it, such as the next ``sync`` call. Pass ``queue_size`` to
+have a receiver called on a worker thread instead:
+
+    @receiver(post_sync, queue_size=10, overflow=LATEST)
+    def on_post_sync(signal, sender, **kwargs):
+        ## write to a database here
 """
 
+import collections
+import concurrent.futures
+import logging
 import threading
+import time
 import typing
 
 if typing.TYPE_CHECKING:
     from .channel import RainwaveChannel
 
+log = logging.getLogger(__name__)
+
+#: Overflow policy: wait until the receiver has caught up.
+BLOCK = "block"
+
+#: Overflow policy: discard the oldest queued call.
+DROP_OLDEST = "drop_oldest"
+
+#: Overflow policy: discard every queued call, keeping only the latest.
+LATEST = "latest"
+
+# The number of worker threads of the executor shared by queued receivers
+_MAX_WORKERS = 4
+
+
+class QueuedReceiver:
+    """Calls a receiver on an executor through a bounded queue, one call at a
+    time and in order.
+
+    :param func: the receiver.
+    :type func: callable
+    :param queue_size: the maximum number of calls waiting in the queue.
+    :type queue_size: int
+    :param overflow: what to do with a new call when the queue is full:
+        :data:`BLOCK`, :data:`DROP_OLDEST`, or :data:`LATEST`.
+    :type overflow: str
+    :param executor: the executor to call the receiver on.
+    :type executor: concurrent.futures.Executor
+    """
+
+    def __init__(
+        self,
+        func: typing.Callable,
+        queue_size: int,
+        overflow: str,
+        executor: concurrent.futures.Executor,
+    ) -> None:
+        if overflow not in (BLOCK, DROP_OLDEST, LATEST):
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        self.func = func
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.executor = executor
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._running = False
+        self._stats = {
+            "delivered": 0,
+            "failed": 0,
+            "dropped": 0,
+            "blocked": 0,
+            "latency": 0.0,
+            "max_latency": 0.0,
+        }
+
+    def __call__(self, **kwargs: typing.Any) -> None:  # noqa: ANN401
+        with self._cond:
+            if len(self._queue) >= self.queue_size:
+                if self.overflow == BLOCK:
+                    self._stats["blocked"] += 1
+                    self._cond.wait_for(lambda: len(self._queue) < self.queue_size)
+                elif self.overflow == DROP_OLDEST:
+                    self._queue.popleft()
+                    self._stats["dropped"] += 1
+                else:
+                    self._stats["dropped"] += len(self._queue)
+                    self._queue.clear()
+            self._queue.append((time.monotonic(), kwargs))
+            if not self._running:
+                self._running = True
+                self.executor.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue:
+                    self._running = False
+                    self._cond.notify_all()
+                    return
+                queued, kwargs = self._queue.popleft()
+                self._cond.notify_all()
+            try:
+                self.func(**kwargs)
+            except Exception:
+                log.exception(f"Signal receiver {self.name} failed")
+                failed = 1
+            else:
+                failed = 0
+            latency = time.monotonic() - queued
+            with self._cond:
+                self._stats["delivered"] += 1
+                self._stats["failed"] += failed
+                self._stats["latency"] = latency
+                self._stats["max_latency"] = max(self._stats["max_latency"], latency)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until every queued call has been made. Return ``False`` if the
+        timeout expired first."""
+
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._running, timeout)
+
+    @property
+    def name(self) -> str:
+        """The qualified name of the receiver."""
+        return f"{self.func.__module__}.{self.func.__qualname__}"
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """A dictionary of counters: ``delivered`` (calls made), ``failed``
+        (calls that raised an exception), ``dropped`` (calls discarded because
+        the queue was full), ``blocked`` (sends that waited for room in the
+        queue), ``queued`` (calls waiting now), ``latency`` (the number of
+        seconds from sending to the end of the last call), and ``max_latency``
+        (the longest such time)."""
+
+        with self._cond:
+            return dict(self._stats, queued=len(self._queue))
+
 
 class Signal:
     """A signal is triggered each time a particular event happens."""
@@ -28,10 +159,35 @@ class Signal:
     def __init__(self) -> None:
         self.receivers = set()
         self.lock = threading.Lock()
-
-    def connect(self, _receiver: typing.Callable) -> None:
-        """Add a receiver to the signal."""
-
+        self._queued = {}
+        self._executor = None
+
+    def connect(
+        self,
+        _receiver: typing.Callable,
+        queue_size: int | None = None,
+        overflow: str = BLOCK,
+        executor: concurrent.futures.Executor | None = None,
+    ) -> None:
+        """Add a receiver to the signal. By default the receiver is called in
+        the thread that sends the signal. If ``queue_size`` is given, it is
+        called on ``executor`` instead, through a :class:`QueuedReceiver` that
+        holds up to ``queue_size`` calls and handles more as ``overflow`` says.
+        The default executor is shared by the queued receivers of the signal."""
+
+        if queue_size is not None:
+            with self.lock:
+                if executor is None:
+                    if self._executor is None:
+                        self._executor = concurrent.futures.ThreadPoolExecutor(
+                            _MAX_WORKERS, thread_name_prefix="rainwave-signal"
+                        )
+                    executor = self._executor
+                queued = QueuedReceiver(_receiver, queue_size, overflow, executor)
+                self.receivers.discard(self._queued.get(_receiver))
+                self._queued[_receiver] = queued
+                self.receivers.add(queued)
+            return
         with self.lock:
             self.receivers.add(_receiver)
 
@@ -39,14 +195,38 @@ class Signal:
         """Remove a receiver from the signal."""
 
         with self.lock:
-            self.receivers.remove(_receiver)
+            self.receivers.remove(self._queued.pop(_receiver, _receiver))
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until the queued receivers have made every call sent so far.
+        Return ``False`` if the timeout expired first."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            queued = list(self._queued.values())
+        for receiver_ in queued:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if not receiver_.join(remaining):
+                return False
+        return True
 
     def send(self, sender: "RainwaveChannel", **kwargs: typing.Any) -> None:  # noqa: ANN401
         """Send the signal to all connected receivers."""
 
-        for _receiver in self.receivers:
+        with self.lock:
+            receivers = list(self.receivers)
+        for _receiver in receivers:
             _receiver(signal=self, sender=sender, **kwargs)
 
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """The :attr:`QueuedReceiver.stats` of each queued receiver, by
+        :attr:`QueuedReceiver.name`."""
+
+        with self.lock:
+            queued = list(self._queued.values())
+        return {receiver_.name: receiver_.stats for receiver_ in queued}
+
 
 def receiver(signal: "Signal", **kwargs: typing.Any) -> typing.Callable:  # noqa: ANN401
     """Decorator for registering a signal."""
@@ -0,0 +1,82 @@
+"""
+Coalescing of identical concurrent API calls, for internal use.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import threading
+import typing
+
+T = typing.TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one call per key at a time. Threads that ask for a key while
+    a call for it is in flight wait for that call and share its result or its
+    exception instead of making their own."""
+
+    def __init__(self) -> None:
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: typing.Hashable, fn: typing.Callable[[], T]) -> tuple[T, bool]:
+        """Return the result of ``fn()``, or of the call already in flight for
+        ``key``, and whether the result was shared with another caller."""
+
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = concurrent.futures.Future()
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._flights[key]
+        return result, False
+
+
+class AsyncSingleFlight:
+    """The asyncio equivalent of :class:`SingleFlight`, for coroutines running
+    on one event loop. A shared call is cancelled only when every coroutine
+    waiting for it has been cancelled."""
+
+    def __init__(self) -> None:
+        self._flights = {}
+        self._waiters = collections.Counter()
+
+    def _forget(self, key: typing.Hashable, future: asyncio.Future) -> None:
+        if self._flights.get(key) is future:
+            del self._flights[key]
+
+    async def do(
+        self, key: typing.Hashable, fn: typing.Callable[[], typing.Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Return the result of ``await fn()``, or of the call already in flight
+        for ``key``, and whether the result was shared with another caller."""
+
+        future = self._flights.get(key)
+        shared = future is not None
+        if not shared:
+            future = self._flights[key] = asyncio.ensure_future(fn())
+            future.add_done_callback(lambda _: self._forget(key, future))
+        self._waiters[future] += 1
+        try:
+            # a waiter that is cancelled must not cancel the call for the others
+            return await asyncio.shield(future), shared
+        except asyncio.CancelledError:
+            if self._waiters[future] == 1:
+                future.cancel()
+            raise
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
@@ -0,0 +1,75 @@
+"""
+In-memory indexes over the albums and artists of a channel, for internal use.
+"""
+
+import bisect
+import collections
+import collections.abc
+import typing
+import unicodedata
+
+
+def normalize_name(name: str) -> str:
+    """Return ``name`` casefolded, without punctuation, and with runs of
+    whitespace collapsed to single spaces, so that names typed by people match
+    the names in the catalog."""
+
+    name = "".join(
+        c for c in name.casefold() if not unicodedata.category(c).startswith("P")
+    )
+    return " ".join(name.split())
+
+
+class RainwaveIndex:
+    """Lookup tables for a list of objects that have an ``id`` and a
+    ``name``."""
+
+    def __init__(self, objects: collections.abc.Iterable) -> None:
+        self.by_id = {}
+        self.by_name = {}
+        self.by_normalized_name = collections.defaultdict(list)
+        self._prefix_keys = None
+        self._prefix_values = None
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def _sorted(self) -> tuple[list[str], list]:
+        if self._prefix_keys is None:
+            entries = sorted(self.by_normalized_name.items())
+            self._prefix_keys = [key for key, _ in entries]
+            self._prefix_values = [objs for _, objs in entries]
+        return self._prefix_keys, self._prefix_values
+
+    def add(self, obj: typing.Any) -> None:  # noqa: ANN401
+        """Add an object to the index. When two objects share a name, the one
+        added first is returned by :attr:`by_name`."""
+
+        self.by_id[obj.id] = obj
+        self.by_name.setdefault(obj.name, obj)
+        self.by_normalized_name[normalize_name(obj.name)].append(obj)
+        self._prefix_keys = None
+        self._prefix_values = None
+
+    def find(self, name: str) -> list:
+        """Return the objects whose normalized name equals the normalized form
+        of ``name``."""
+
+        return list(self.by_normalized_name.get(normalize_name(name), []))
+
+    def find_prefix(self, prefix: str, limit: int | None = None) -> list:
+        """Return the objects whose normalized name starts with the normalized
+        form of ``prefix``, sorted by normalized name."""
+
+        prefix = normalize_name(prefix)
+        keys, values = self._sorted()
+        found = []
+        for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+            found.extend(values[i])
+            if limit is not None and len(found) >= limit:
+                return found[:limit]
+        return found
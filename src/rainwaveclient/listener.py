@@ -1,15 +1,35 @@
 import typing
 
+from .model import RainwaveModel
+
 if typing.TYPE_CHECKING:
     from . import RainwaveChannel
 
 
-class RainwaveListener(dict):
+class RainwaveListener(RainwaveModel):
     """A :class:`RainwaveListener` object represents a radio listener."""
 
     #: The :class:`RainwaveChannel` the listener belongs to.
     channel: "RainwaveChannel" = None
 
+    _attributes = ("channel",)
+    _fields = (
+        "avatar",
+        "colour",
+        "id",
+        "losing_requests",
+        "losing_votes",
+        "mind_changes",
+        "name",
+        "rank",
+        "total_ratings",
+        "total_requests",
+        "total_votes",
+        "user_id",
+        "winning_requests",
+        "winning_votes",
+    )
+
     def __init__(self, channel: "RainwaveChannel", raw_info: dict) -> None:
         self.channel = channel
         super().__init__(raw_info)
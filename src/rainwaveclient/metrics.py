@@ -0,0 +1,226 @@
+import bisect
+import collections
+import threading
+
+#: The default upper bounds in seconds of the latency histogram buckets. The
+#: largest ones hold long-poll ``sync`` calls.
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 600)
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+class RainwaveMetrics:
+    """Records what :class:`RainwaveClient` does on the wire, for each API
+    path: calls, a latency histogram, request and response sizes, JSON decode
+    time, HTTP statuses, and errors by exception class; and for each channel,
+    the iterations of its sync loop.
+
+    Recording only adds to a few counters, so it costs next to nothing;
+    :meth:`as_dict` and :meth:`render` do the rest of the work when the metrics
+    are read.
+
+    :param buckets: (optional) the upper bounds in seconds of the latency
+        histogram buckets, default :data:`DEFAULT_BUCKETS`.
+    :type buckets: tuple
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._paths = collections.defaultdict(self._new_path)
+        self._syncs = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<RainwaveMetrics [{len(self._paths)} paths]>"
+
+    def _new_path(self) -> dict:
+        return {
+            "calls": 0,
+            # one count per bucket, the last one for calls slower than all
+            "latency": [0] * (len(self.buckets) + 1),
+            "latency_sum": 0.0,
+            "request_bytes": 0,
+            "response_bytes": 0,
+            "decodes": 0,
+            "decode_seconds": 0.0,
+            "statuses": collections.Counter(),
+            "errors": collections.Counter(),
+        }
+
+    def as_dict(self) -> dict:
+        """Return the metrics as a dictionary with two keys. ``paths`` holds,
+        for each API path, ``calls``, ``latency`` (with the cumulative count of
+        calls in each bucket by upper bound, and their ``sum`` and ``count``),
+        ``request_bytes``, ``response_bytes``, ``decodes``,
+        ``decode_seconds``, ``statuses`` (calls by HTTP status), and
+        ``errors`` (failed attempts by exception class). ``syncs`` holds, for
+        each channel ID, the number of ``ok`` and ``failed`` sync
+        iterations."""
+
+        with self._lock:
+            paths = {
+                path: dict(
+                    m,
+                    latency=list(m["latency"]),
+                    statuses=dict(m["statuses"]),
+                    errors=dict(m["errors"]),
+                )
+                for path, m in self._paths.items()
+            }
+            syncs = {channel: dict(c) for channel, c in self._syncs.items()}
+        for m in paths.values():
+            counts = m["latency"]
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                buckets[bound] = cumulative
+            m["latency"] = {
+                "buckets": buckets,
+                "sum": m.pop("latency_sum"),
+                "count": cumulative,
+            }
+        return {"paths": paths, "syncs": syncs}
+
+    def observe_call(
+        self,
+        path: str,
+        status: int,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+    ) -> None:
+        """Record an API call that got a response.
+
+        :param path: the API path called.
+        :type path: str
+        :param status: the HTTP status of the response.
+        :type status: int
+        :param seconds: the time from sending the request to receiving the
+            whole response.
+        :type seconds: float
+        :param request_bytes: the size of the request body.
+        :type request_bytes: int
+        :param response_bytes: the size of the response body as received.
+        :type response_bytes: int
+        """
+
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            m = self._paths[path]
+            m["calls"] += 1
+            m["latency"][bucket] += 1
+            m["latency_sum"] += seconds
+            m["request_bytes"] += request_bytes
+            m["response_bytes"] += response_bytes
+            m["statuses"][status] += 1
+
+    def observe_decode(self, path: str, seconds: float) -> None:
+        """Record the time spent decoding the JSON response of a call.
+
+        :param path: the API path called.
+        :type path: str
+        :param seconds: the decode time.
+        :type seconds: float
+        """
+
+        with self._lock:
+            m = self._paths[path]
+            m["decodes"] += 1
+            m["decode_seconds"] += seconds
+
+    def observe_error(self, path: str, error: BaseException) -> None:
+        """Record a failed attempt to call an API path.
+
+        :param path: the API path called.
+        :type path: str
+        :param error: the exception the attempt failed with.
+        :type error: Exception
+        """
+
+        with self._lock:
+            self._paths[path]["errors"][type(error).__name__] += 1
+
+    def observe_sync(self, channel: int, ok: bool) -> None:
+        """Record one iteration of the sync loop of a channel.
+
+        :param channel: the :attr:`RainwaveChannel.id` of the channel.
+        :type channel: int
+        :param ok: ``True`` if the timeline was updated.
+        :type ok: bool
+        """
+
+        with self._lock:
+            self._syncs[channel]["ok" if ok else "failed"] += 1
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format, for
+        example to serve them from a ``/metrics`` endpoint."""
+
+        d = self.as_dict()
+        paths = sorted(d["paths"].items())
+        lines = [
+            "# HELP rainwave_api_calls_total API calls that got a response.",
+            "# TYPE rainwave_api_calls_total counter",
+        ]
+        lines.extend(
+            f"rainwave_api_calls_total{_labels(path=path)} {m['calls']}"
+            for path, m in paths
+        )
+        lines.append("# HELP rainwave_api_latency_seconds API call latency.")
+        lines.append("# TYPE rainwave_api_latency_seconds histogram")
+        for path, m in paths:
+            latency = m["latency"]
+            for bound, count in latency["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                labels = _labels(path=path, le=le)
+                lines.append(f"rainwave_api_latency_seconds_bucket{labels} {count}")
+            labels = _labels(path=path)
+            lines.append(f"rainwave_api_latency_seconds_sum{labels} {latency['sum']}")
+            lines.append(
+                f"rainwave_api_latency_seconds_count{labels} {latency['count']}"
+            )
+        for name, key, help_text in (
+            ("request_bytes_total", "request_bytes", "Request body bytes sent."),
+            ("response_bytes_total", "response_bytes", "Response body bytes received."),
+            ("decodes_total", "decodes", "JSON responses decoded."),
+            ("decode_seconds_total", "decode_seconds", "Time spent decoding JSON."),
+        ):
+            lines.append(f"# HELP rainwave_api_{name} {help_text}")
+            lines.append(f"# TYPE rainwave_api_{name} counter")
+            lines.extend(
+                f"rainwave_api_{name}{_labels(path=path)} {m[key]}" for path, m in paths
+            )
+        lines.append("# HELP rainwave_api_responses_total API responses by status.")
+        lines.append("# TYPE rainwave_api_responses_total counter")
+        for path, m in paths:
+            for status, count in sorted(m["statuses"].items()):
+                labels = _labels(path=path, status=status)
+                lines.append(f"rainwave_api_responses_total{labels} {count}")
+        lines.append("# HELP rainwave_api_errors_total Failed API call attempts.")
+        lines.append("# TYPE rainwave_api_errors_total counter")
+        for path, m in paths:
+            for error, count in sorted(m["errors"].items()):
+                labels = _labels(path=path, error=error)
+                lines.append(f"rainwave_api_errors_total{labels} {count}")
+        lines.append("# HELP rainwave_sync_iterations_total Sync loop iterations.")
+        lines.append("# TYPE rainwave_sync_iterations_total counter")
+        for channel, results in sorted(d["syncs"].items()):
+            for result, count in sorted(results.items()):
+                labels = _labels(channel=channel, result=result)
+                lines.append(f"rainwave_sync_iterations_total{labels} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+
+        with self._lock:
+            self._paths.clear()
+            self._syncs.clear()
@@ -0,0 +1,230 @@
+"""
+The base class of the objects that wrap API data, and the compact variant of
+those objects, for internal use.
+"""
+
+import collections.abc
+import itertools
+import typing
+
+_compact_classes = {}
+
+
+def compact_class(cls: type) -> type:
+    """Return the compact variant of a :class:`RainwaveModel` subclass, which
+    keeps the keys listed in its ``_fields`` and the instance attributes listed
+    in its ``_attributes`` in slots."""
+
+    if issubclass(cls, CompactMapping):
+        return cls
+    compact = _compact_classes.get(cls)
+    if compact is None:
+        slots = {key: f"_f_{key}" for key in cls._fields}
+        namespace = {
+            "__slots__": (*slots.values(), *cls._attributes),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__,
+            "_slots": slots,
+        }
+        compact = type(cls.__name__, (cls, CompactMapping), namespace)
+        compact = _compact_classes.setdefault(cls, compact)
+    return compact
+
+
+class RainwaveModel(dict):
+    """A dictionary of data from the API. Subclasses add properties for the
+    documented keys and list the keys those properties read in ``_fields``.
+
+    When the :class:`RainwaveClient` was created with ``compact=True``, its
+    channels create objects from the compact variant of their class instead
+    (see :func:`compact_class`)."""
+
+    #: The keys the properties of the class read.
+    _fields: typing.ClassVar[tuple[str, ...]] = ()
+
+    #: The instance attributes the class sets, kept in slots by the compact
+    #: variant.
+    _attributes: typing.ClassVar[tuple[str, ...]] = ()
+
+
+class _KeysView(collections.abc.KeysView):
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return CompactMapping._size(self._mapping)
+
+
+class _ItemsView(collections.abc.ItemsView):
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return CompactMapping._size(self._mapping)
+
+
+class _ValuesView(collections.abc.ValuesView):
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return CompactMapping._size(self._mapping)
+
+
+_MISSING = object()
+
+
+class CompactMapping(dict):
+    """A dictionary that keeps the keys in ``_slots`` in fixed slots of the
+    object and only the rest in the dictionary itself. An object with every
+    value in slots needs no hash table at all, which is most of the memory of
+    a small dictionary."""
+
+    __slots__ = ()
+
+    #: Maps each key kept in a slot to the name of the slot.
+    _slots: typing.ClassVar[dict[str, str]] = {}
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:  # noqa: ANN401
+        self.update(*args, **kwargs)
+
+    def __contains__(self, key: object) -> bool:
+        slot = self._slots.get(key)
+        if slot is None:
+            return dict.__contains__(self, key)
+        return hasattr(self, slot)
+
+    def __delitem__(self, key: typing.Any) -> None:  # noqa: ANN401
+        slot = self._slots.get(key)
+        if slot is None:
+            dict.__delitem__(self, key)
+            return
+        try:
+            delattr(self, slot)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, collections.abc.Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:  # noqa: ANN401
+        slot = self._slots.get(key)
+        if slot is None:
+            return dict.__getitem__(self, key)
+        value = getattr(self, slot, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __ior__(self, other: typing.Any) -> "CompactMapping":  # noqa: ANN401
+        self.update(other)
+        return self
+
+    def __iter__(self) -> typing.Iterator:
+        for key, slot in self._slots.items():
+            if hasattr(self, slot):
+                yield key
+        yield from dict.__iter__(self)
+
+    def __len__(self) -> int:
+        return self._size()
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __or__(self, other: typing.Any) -> dict:  # noqa: ANN401
+        if not isinstance(other, collections.abc.Mapping):
+            return NotImplemented
+        return dict(self.items()) | dict(other.items())
+
+    def __ror__(self, other: typing.Any) -> dict:  # noqa: ANN401
+        if not isinstance(other, collections.abc.Mapping):
+            return NotImplemented
+        return dict(other.items()) | dict(self.items())
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:  # noqa: ANN401
+        slot = self._slots.get(key)
+        if slot is None:
+            dict.__setitem__(self, key, value)
+        else:
+            setattr(self, slot, value)
+
+    def _size(self) -> int:
+        # not __len__, which models such as RainwaveSong redefine
+        n = dict.__len__(self)
+        for slot in self._slots.values():
+            if hasattr(self, slot):
+                n += 1
+        return n
+
+    def clear(self) -> None:
+        for slot in self._slots.values():
+            if hasattr(self, slot):
+                delattr(self, slot)
+        dict.clear(self)
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def get(self, key: typing.Any, default: typing.Any = None) -> typing.Any:  # noqa: ANN401
+        slot = self._slots.get(key)
+        if slot is None:
+            return dict.get(self, key, default)
+        return getattr(self, slot, default)
+
+    def items(self) -> collections.abc.ItemsView:
+        return _ItemsView(self)
+
+    def keys(self) -> collections.abc.KeysView:
+        return _KeysView(self)
+
+    def pop(self, key: typing.Any, default: typing.Any = _MISSING) -> typing.Any:  # noqa: ANN401
+        slot = self._slots.get(key)
+        if slot is None:
+            if default is _MISSING:
+                return dict.pop(self, key)
+            return dict.pop(self, key, default)
+        value = getattr(self, slot, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        delattr(self, slot)
+        return value
+
+    def popitem(self) -> tuple:
+        if dict.__len__(self):
+            return dict.popitem(self)
+        for key, slot in reversed(self._slots.items()):
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                delattr(self, slot)
+                return key, value
+        raise KeyError("popitem(): dictionary is empty")
+
+    def setdefault(self, key: typing.Any, default: typing.Any = None) -> typing.Any:  # noqa: ANN401
+        slot = self._slots.get(key)
+        if slot is None:
+            return dict.setdefault(self, key, default)
+        value = getattr(self, slot, _MISSING)
+        if value is _MISSING:
+            setattr(self, slot, default)
+            return default
+        return value
+
+    def update(self, other: typing.Any = (), /, **kwargs: typing.Any) -> None:  # noqa: ANN401
+        if isinstance(other, collections.abc.Mapping):
+            other = other.items()
+        elif hasattr(other, "keys"):
+            other = [(key, other[key]) for key in other.keys()]
+        slots = self._slots
+        for key, value in itertools.chain(other, kwargs.items()):
+            slot = slots.get(key)
+            if slot is None:
+                dict.__setitem__(self, key, value)
+            else:
+                setattr(self, slot, value)
+
+    def values(self) -> collections.abc.ValuesView:
+        return _ValuesView(self)
@@ -0,0 +1,316 @@
+import base64
+import collections
+import http.client
+import select
+import socket
+import threading
+import time
+import typing
+import urllib.request
+import zlib
+from urllib.parse import unquote, urlsplit
+
+if typing.TYPE_CHECKING:
+    from email.message import Message
+
+# Errors that mean a kept-alive connection was closed by the server while it sat idle
+_STALE_ERRORS = (BrokenPipeError, ConnectionResetError)
+
+#: The value of the ``Accept-Encoding`` header for the encodings
+#: :class:`ContentDecoder` supports.
+ACCEPT_ENCODING = "gzip, deflate"
+
+# The number of bytes to read from a compressed response at a time
+_CHUNK_SIZE = 65536
+
+
+def _dropped(sock: socket.socket | None) -> bool:
+    """Return True if the server has closed an idle connection: there is
+    nothing to read from it unless the server hung up."""
+
+    if sock is None:
+        return True
+    if hasattr(select, "poll"):
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        return bool(poller.poll(0))
+    return bool(select.select([sock], [], [], 0)[0])
+
+
+def _proxy_for(scheme: str, host: str) -> tuple[str, int, dict] | None:
+    """Return the host, port, and request headers of the proxy to use for
+    ``scheme`` requests to ``host``, as set in the environment (such as
+    ``HTTPS_PROXY`` and ``NO_PROXY``), or ``None`` to connect directly."""
+
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urlsplit(proxy)
+    headers = {}
+    if parts.username:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(credentials.encode()).decode()
+        headers["Proxy-Authorization"] = f"Basic {token}"
+    return parts.hostname, parts.port or 80, headers
+
+
+class ContentDecoder:
+    """Incrementally decompress a response body sent with a
+    ``Content-Encoding`` of `gzip` or `deflate`.
+
+    :param encoding: the content encoding of the response.
+    :type encoding: str
+    """
+
+    def __init__(self, encoding: str) -> None:
+        encoding = encoding.strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            self._decompressor = zlib.decompressobj()
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+        self._encoding = encoding
+        self._started = False
+
+    @staticmethod
+    def supports(encoding: str | None) -> bool:
+        """Return ``True`` if responses with the given content encoding can be
+        decompressed."""
+
+        return encoding is not None and encoding.strip().lower() in (
+            "deflate",
+            "gzip",
+            "x-gzip",
+        )
+
+    def decompress(self, data: bytes) -> bytes:
+        """Return the decompressed bytes available after adding ``data``."""
+
+        if not self._started and data:
+            self._started = True
+            if self._encoding == "deflate":
+                try:
+                    return self._decompressor.decompress(data)
+                except zlib.error:
+                    # some servers send raw deflate data without the zlib header
+                    self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decompressor.decompress(data)
+
+    def flush(self) -> bytes:
+        """Return any remaining decompressed bytes."""
+
+        return self._decompressor.flush()
+
+
+class RainwaveConnectionPool:
+    """A thread-safe pool of persistent HTTP(S) connections. A
+    :class:`RainwaveClient` uses one of these to avoid a new TCP connection and
+    TLS handshake for every API call. Connections go through the proxy set in
+    the ``HTTPS_PROXY`` or ``HTTP_PROXY`` environment variable, unless the host
+    is listed in ``NO_PROXY``.
+
+    :param max_size: (optional) the maximum number of idle connections to keep
+        open, default `10`.
+    :type max_size: int
+    :param idle_timeout: (optional) the number of seconds a connection may sit
+        unused before it is closed, default `60`.
+    :type idle_timeout: float
+    :param timeout: (optional) the number of seconds to wait for a connection
+        or for data before :exc:`TimeoutError` is raised. By default requests
+        wait indefinitely.
+    :type timeout: float
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10,
+        idle_timeout: float = 60.0,
+        timeout: float | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = collections.defaultdict(collections.deque)
+        self._idle_count = 0
+        self._lock = threading.Lock()
+        self._counters = {"opened": 0, "reused": 0, "evicted": 0, "discarded": 0}
+
+    def __repr__(self) -> str:
+        return f"<RainwaveConnectionPool [{self._idle_count}/{self.max_size} idle]>"
+
+    def _acquire(self, origin: tuple) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            self._evict_expired()
+            idle = self._idle[origin]
+            while idle:
+                conn, _ = idle.pop()
+                self._idle_count -= 1
+                if not _dropped(conn.sock):
+                    return conn, True
+                conn.close()
+                self._counters["evicted"] += 1
+            self._counters["opened"] += 1
+        scheme, host, port = origin
+        proxy = _proxy_for(scheme, host)
+        if proxy is None:
+            if scheme == "https":
+                return http.client.HTTPSConnection(host, port), False
+            return http.client.HTTPConnection(host, port), False
+        proxy_host, proxy_port, proxy_headers = proxy
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port)
+            conn.set_tunnel(host, port, proxy_headers)
+            return conn, False
+        # plain HTTP requests are sent to the proxy with the absolute URL
+        return http.client.HTTPConnection(proxy_host, proxy_port), False
+
+    def _evict_expired(self) -> None:
+        # caller must hold self._lock
+        cutoff = time.monotonic() - self.idle_timeout
+        for idle in self._idle.values():
+            while idle and idle[0][1] < cutoff:
+                conn, _ = idle.popleft()
+                conn.close()
+                self._idle_count -= 1
+                self._counters["evicted"] += 1
+
+    @staticmethod
+    def _read_decoded(
+        response: http.client.HTTPResponse, encoding: str
+    ) -> tuple[bytes, int]:
+        decoder = ContentDecoder(encoding)
+        received = 0
+        parts = []
+        while chunk := response.read(_CHUNK_SIZE):
+            received += len(chunk)
+            parts.append(decoder.decompress(chunk))
+        parts.append(decoder.flush())
+        return b"".join(parts), received
+
+    def _release(self, origin: tuple, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._evict_expired()
+            if self._idle_count < self.max_size:
+                self._idle[origin].append((conn, time.monotonic()))
+                self._idle_count += 1
+                return
+            self._counters["discarded"] += 1
+        conn.close()
+
+    @staticmethod
+    def _set_timeout(conn: http.client.HTTPConnection, timeout: float | None) -> None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+
+    def clear(self) -> None:
+        """Close all idle connections."""
+
+        with self._lock:
+            for idle in self._idle.values():
+                while idle:
+                    conn, _ = idle.pop()
+                    conn.close()
+            self._idle.clear()
+            self._idle_count = 0
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict | None = None,
+        decode_content: bool = False,
+        timeout: float | None = None,
+    ) -> tuple[int, "Message", bytes, int]:
+        """Send an HTTP request over a pooled connection and read the full
+        response.
+
+        :param method: the HTTP method to use.
+        :type method: str
+        :param url: the absolute URL to request.
+        :type url: str
+        :param body: (optional) the request body.
+        :type body: bytes
+        :param headers: (optional) additional request headers.
+        :type headers: dict
+        :param decode_content: (optional) decompress a `gzip` or `deflate`
+            response body while it is read, default `False`.
+        :type decode_content: bool
+        :param timeout: (optional) the socket timeout for this request, default
+            :attr:`timeout`.
+        :type timeout: float
+        :return: The HTTP status, the response headers, the response body, and
+            the number of body bytes received, which is smaller than the body
+            if it was compressed.
+        :rtype: tuple
+        """
+
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        if headers is None:
+            headers = {}
+        if parts.scheme == "http":
+            proxy = _proxy_for(parts.scheme, parts.hostname)
+            if proxy is not None:
+                target = url
+                headers = {**headers, **proxy[2]}
+        if timeout is None:
+            timeout = self.timeout
+
+        while True:
+            conn, reused = self._acquire(origin)
+            self._set_timeout(conn, timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+            except _STALE_ERRORS:
+                conn.close()
+                if reused:
+                    # the server closed an idle connection before the request
+                    # was sent, so it is safe to send it again on another one
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            break
+
+        # once the request is sent, whether it may be sent again is up to the
+        # caller: the server may have acted on it before the connection broke
+        try:
+            response = conn.getresponse()
+            encoding = response.getheader("content-encoding")
+            if decode_content and ContentDecoder.supports(encoding):
+                data, received = self._read_decoded(response, encoding)
+            else:
+                data = response.read()
+                received = len(data)
+        except Exception:
+            conn.close()
+            raise
+
+        if reused:
+            with self._lock:
+                self._counters["reused"] += 1
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(origin, conn)
+        return response.status, response.headers, data, received
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """A dictionary of connection counters: ``opened`` (new connections),
+        ``reused`` (requests answered over an existing connection), ``evicted``
+        (idle connections closed after :attr:`idle_timeout` or by the server),
+        ``discarded`` (connections closed because the pool was full), and
+        ``idle`` (the number of connections currently waiting in the pool)."""
+
+        with self._lock:
+            return dict(self._counters, idle=self._idle_count)
@@ -0,0 +1,230 @@
+import asyncio
+import bisect
+import collections
+import itertools
+import threading
+import time
+import typing
+
+#: Rate class of calls that change something, such as votes and requests.
+#: They wait ahead of reads.
+WRITE = "write"
+
+#: Rate class of calls that only fetch data. This is the default class.
+READ = "read"
+
+#: Rate class of calls that are never limited, such as the long-poll ``sync``.
+EXEMPT = "exempt"
+
+_PRIORITIES = {WRITE: 0, READ: 1}
+
+_WRITE_PATHS = (
+    "clear_rating",
+    "clear_requests",
+    "delete_request",
+    "fave_album",
+    "fave_song",
+    "order_requests",
+    "rate",
+    "request",
+    "vote",
+)
+
+
+class _Waiter(typing.NamedTuple):
+    priority: int
+    seq: int
+    rate_class: str
+    wake: typing.Callable[[], None]
+
+
+class RainwaveRateLimiter:
+    """Limits how fast :class:`RainwaveClient` calls the API with a token
+    bucket: each call takes a token, the bucket holds up to ``burst`` tokens,
+    and ``rate`` tokens are added per second. A call that finds the bucket
+    empty waits for a token. Calls in the :data:`WRITE` class wait ahead of
+    calls in the :data:`READ` class, so a vote is not stuck behind a burst of
+    song lookups, and calls in the :data:`EXEMPT` class never wait.
+
+    Pass the same limiter to several clients, with the ``rate_limiter``
+    argument of :class:`RainwaveClient`, to keep all their calls within one
+    limit.
+
+    :param rate: (optional) the number of calls per second allowed in the long
+        run, default `5`.
+    :type rate: float
+    :param burst: (optional) the number of calls that may be made at once after
+        a quiet period, default `10`.
+    :type burst: int
+    :param classes: (optional) the rate class of API paths, added to the
+        defaults: ``sync`` is :data:`EXEMPT`, calls that vote, request, fave,
+        or rate are :data:`WRITE`, and any other path is :data:`READ`.
+    :type classes: dict
+    """
+
+    def __init__(
+        self, rate: float = 5.0, burst: int = 10, classes: dict | None = None
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.classes = dict.fromkeys(_WRITE_PATHS, WRITE)
+        self.classes["sync"] = EXEMPT
+        self.classes.update(classes or {})
+        for rate_class in self.classes.values():
+            if rate_class not in (WRITE, READ, EXEMPT):
+                raise ValueError(f"Unknown rate class: {rate_class!r}")
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = collections.defaultdict(self._new_stats)
+
+    def __repr__(self) -> str:
+        return f"<RainwaveRateLimiter [{self.rate:g}/s, burst {self.burst}]>"
+
+    @staticmethod
+    def _new_stats() -> dict:
+        return {"calls": 0, "waited": 0, "wait_time": 0.0, "max_wait": 0.0}
+
+    def _enter(
+        self, rate_class: str, wake: typing.Callable[[], None]
+    ) -> _Waiter | None:
+        """Take a token and return ``None`` if no one is waiting and one is
+        available, otherwise join the line and return the new waiter."""
+
+        with self._lock:
+            if not self._waiters and self._token() == 0:
+                return None
+            priority = _PRIORITIES[rate_class]
+            waiter = _Waiter(priority, next(self._seq), rate_class, wake)
+            bisect.insort(self._waiters, waiter)
+            return waiter
+
+    def _leave(self, waiter: _Waiter) -> None:
+        # caller must hold self._lock; the next waiter in line is now first
+        self._waiters.remove(waiter)
+        if self._waiters:
+            self._waiters[0].wake()
+
+    def _poll(self, waiter: _Waiter) -> float | None:
+        """Take a token for ``waiter`` and return `0`, or return the number of
+        seconds until one is available, or ``None`` if others are ahead in
+        line."""
+
+        with self._lock:
+            if self._waiters[0] is not waiter:
+                return None
+            delay = self._token()
+            if delay == 0:
+                self._leave(waiter)
+            return delay
+
+    def _record(self, rate_class: str, waited: float) -> float:
+        with self._lock:
+            stats = self._stats[rate_class]
+            stats["calls"] += 1
+            if waited:
+                stats["waited"] += 1
+                stats["wait_time"] += waited
+                stats["max_wait"] = max(stats["max_wait"], waited)
+        return waited
+
+    def _token(self) -> float:
+        # caller must hold self._lock
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        self._tokens -= 1
+        return 0
+
+    def acquire(self, path: str) -> float:
+        """Wait until a call to ``path`` is allowed. Return the number of
+        seconds waited.
+
+        :param path: the API path about to be called.
+        :type path: str
+        """
+
+        rate_class = self.classify(path)
+        if rate_class == EXEMPT:
+            return self._record(rate_class, 0.0)
+        event = threading.Event()
+        waiter = self._enter(rate_class, event.set)
+        if waiter is None:
+            return self._record(rate_class, 0.0)
+        start = time.monotonic()
+        try:
+            while True:
+                event.clear()
+                delay = self._poll(waiter)
+                if delay == 0:
+                    waiter = None
+                    return self._record(rate_class, time.monotonic() - start)
+                event.wait(delay)
+        finally:
+            if waiter is not None:
+                with self._lock:
+                    self._leave(waiter)
+
+    async def acquire_async(self, path: str) -> float:
+        """The awaitable equivalent of :meth:`acquire`, which waits without
+        blocking the event loop.
+
+        :param path: the API path about to be called.
+        :type path: str
+        """
+
+        rate_class = self.classify(path)
+        if rate_class == EXEMPT:
+            return self._record(rate_class, 0.0)
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        # the waiter may be woken from another thread
+        waiter = self._enter(rate_class, lambda: loop.call_soon_threadsafe(event.set))
+        if waiter is None:
+            return self._record(rate_class, 0.0)
+        start = time.monotonic()
+        try:
+            while True:
+                event.clear()
+                delay = self._poll(waiter)
+                if delay == 0:
+                    waiter = None
+                    return self._record(rate_class, time.monotonic() - start)
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    # not the built-in TimeoutError before Python 3.11
+                    pass
+        finally:
+            if waiter is not None:
+                with self._lock:
+                    self._leave(waiter)
+
+    def classify(self, path: str) -> str:
+        """Return the rate class of ``path``: :data:`WRITE`, :data:`READ`, or
+        :data:`EXEMPT`.
+
+        :param path: the API path.
+        :type path: str
+        """
+
+        return self.classes.get(path.lstrip("/"), READ)
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """A dictionary of counters for each rate class used: ``calls``,
+        ``waited`` (calls that had to wait for a token), ``wait_time`` (the
+        total number of seconds they waited), ``max_wait`` (the longest wait),
+        and ``queued`` (calls waiting now). A high ``wait_time`` means calls
+        are bound by the limiter rather than by the API."""
+
+        with self._lock:
+            queued = collections.Counter(w.rate_class for w in self._waiters)
+            return {
+                name: dict(stats, queued=queued[name])
+                for name, stats in self._stats.items()
+            }
@@ -10,11 +10,13 @@ class RainwaveRequest(RainwaveSong):
     """A :class:`RainwaveRequest` object is a subclass of :class:`RainwaveSong`
     representing a song that has been requested to play on the radio."""
 
+    _fields = (*RainwaveSong._fields, "requester", "requester_id", "requester_name")
+
     @classmethod
     def request_from_song(
         cls, _song: RainwaveSong, requester: "RainwaveListener"
     ) -> "RainwaveRequest":
-        request = cls(_song.album, dict(_song.items()))
+        request = _song.album.channel._model(cls)(_song.album, _song)
         request["requester"] = requester
         return request
 
@@ -24,14 +26,28 @@ class RainwaveRequest(RainwaveSong):
     @property
     def requester(self) -> "RainwaveListener":
         """The :class:`RainwaveListener` who made the request."""
+        if "requester" not in self:
+            channel = self.album.channel
+            self["requester"] = channel.get_listener_by_id(self["requester_id"])
         return self["requester"]
 
+    @property
+    def requester_name(self) -> str:
+        """The name of the listener who made the request. Unlike
+        :attr:`requester`, this does not need an extra API call for requests
+        in :attr:`RainwaveChannel.requests`."""
+        if self.get("requester_name") is None:
+            return self.requester.name
+        return self["requester_name"]
+
 
 class RainwaveUserRequest(RainwaveSong):
     """A :class:`RainwaveUserRequest` object is a subclass of
     :class:`RainwaveSong` representing a song in the authenticating listener's
     requests queue."""
 
+    _fields = (*RainwaveSong._fields, "elec_blocked_by")
+
     def __repr__(self) -> str:
         return f"<RainwaveUserRequest [{self}]>"
 
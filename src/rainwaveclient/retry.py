@@ -0,0 +1,264 @@
+import asyncio
+import collections
+import http.client
+import random
+import socket
+import threading
+import time
+
+from .ratelimit import _WRITE_PATHS
+
+
+class RainwaveAPIError(Exception):
+    """Raised by :meth:`RainwaveClient.call` when the API answers with an HTTP
+    error status, or with a body that is not JSON.
+
+    :param path: the API path that was called.
+    :type path: str
+    :param status: the HTTP status of the response.
+    :type status: int
+    :param message: a description of the error.
+    :type message: str
+    :param retry_after: (optional) the number of seconds the server asked the
+        client to wait before trying again.
+    :type retry_after: float
+    """
+
+    def __init__(
+        self, path: str, status: int, message: str, retry_after: float | None = None
+    ) -> None:
+        super().__init__(f"{path}: HTTP {status}: {message}")
+        self.path = path
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def transient(self) -> bool:
+        """``True`` if the same call may succeed later: the server failed or
+        asked the client to slow down, rather than rejecting the request."""
+        return self.status >= 500 or self.status == 429 or self.status < 400
+
+
+class RainwaveCircuitOpenError(Exception):
+    """Raised by :meth:`RainwaveClient.call` without calling the API while the
+    circuit for the API path is open, see :class:`RainwaveCircuitBreaker`."""
+
+
+class RainwaveRetryPolicy:
+    """Decides which failed API calls :class:`RainwaveClient` tries again, and
+    how long it waits first. The wait grows exponentially with each attempt and
+    is drawn at random between zero and that limit ("full jitter"), so that
+    many clients recovering from the same outage do not retry in lockstep.
+
+    Connection errors, timeouts, and transient :class:`RainwaveAPIError`\\ s are
+    retried. Calls that change something, such as votes, requests, faves, and
+    ratings, are only retried if the API cannot have received them, see
+    :meth:`safe_to_repeat`.
+
+    :param attempts: (optional) the maximum number of times to try a call,
+        default `3`. Use `1` to disable retries.
+    :type attempts: int
+    :param backoff: (optional) the upper limit in seconds of the wait before
+        the first retry, default `0.5`. The limit doubles for each retry.
+    :type backoff: float
+    :param max_backoff: (optional) the largest upper limit in seconds of any
+        wait, default `30`.
+    :type max_backoff: float
+    """
+
+    def __init__(
+        self, attempts: int = 3, backoff: float = 0.5, max_backoff: float = 30.0
+    ) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def __repr__(self) -> str:
+        return (
+            f"RainwaveRetryPolicy(attempts={self.attempts!r}, "
+            f"backoff={self.backoff!r}, max_backoff={self.max_backoff!r})"
+        )
+
+    def delay(self, failures: int, error: Exception | None = None) -> float:
+        """Return the number of seconds to wait after ``failures`` consecutive
+        failures. A ``Retry-After`` time sent by the server is honoured, up to
+        :attr:`max_backoff`.
+
+        :param failures: the number of consecutive failures so far, at least
+            `1`.
+        :type failures: int
+        :param error: (optional) the exception of the last failure.
+        :type error: Exception
+        """
+
+        limit = min(self.max_backoff, self.backoff * 2 ** (failures - 1))
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(self.max_backoff, max(retry_after, 0.0))
+        return random.uniform(0, limit)  # noqa: S311
+
+    def retryable(self, error: Exception) -> bool:
+        """Return ``True`` if a call that raised ``error`` should be tried again.
+
+        :param error: the exception raised by the call.
+        :type error: Exception
+        """
+
+        if isinstance(error, RainwaveAPIError):
+            return error.transient
+        # asyncio.TimeoutError is not an OSError before Python 3.11
+        retryable = (OSError, http.client.HTTPException, asyncio.TimeoutError)
+        return isinstance(error, retryable)
+
+    def safe_to_repeat(self, path: str, error: Exception) -> bool:
+        """Return ``True`` if a call to ``path`` that raised a retryable
+        ``error`` can be tried again without the risk of applying it twice:
+        either the path only reads data, or the call failed before the request
+        was sent (the connection was refused or the host name was not found),
+        or the API turned it away with HTTP 429. A call that timed out or lost
+        its connection after the request was sent may already have been
+        applied.
+
+        :param path: the API path called.
+        :type path: str
+        :param error: the exception raised by the call.
+        :type error: Exception
+        """
+
+        if path.lstrip("/") not in _WRITE_PATHS:
+            return True
+        if isinstance(error, RainwaveAPIError):
+            return error.status == 429
+        return isinstance(error, (ConnectionRefusedError, socket.gaierror))
+
+
+class RainwaveCircuitBreaker:
+    """Stops calling an API path that keeps failing. After
+    ``failure_threshold`` consecutive failures of one path its circuit opens,
+    and calls to that path raise :exc:`RainwaveCircuitOpenError` immediately
+    instead of waiting on a server that is down. After ``reset_timeout``
+    seconds one trial call is let through: if it succeeds the circuit closes
+    again, otherwise (or if the trial is cancelled or ends in an error that
+    says nothing about the server) it stays open for another
+    ``reset_timeout``.
+
+    :param failure_threshold: (optional) the number of consecutive failures
+        that open the circuit of a path, default `5`.
+    :type failure_threshold: int
+    :param reset_timeout: (optional) the number of seconds a circuit stays open
+        before a trial call, default `30`.
+    :type reset_timeout: float
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = collections.defaultdict(self._new_circuit)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<RainwaveCircuitBreaker [{len(self._circuits)} paths]>"
+
+    @staticmethod
+    def _new_circuit() -> dict:
+        return {
+            "state": "closed",
+            "consecutive_failures": 0,
+            "failures": 0,
+            "opened": 0,
+            "recovered": 0,
+            "rejected": 0,
+            "opened_at": None,
+        }
+
+    def before_call(self, path: str) -> None:
+        """Raise :exc:`RainwaveCircuitOpenError` if calls to ``path`` should
+        fail fast right now.
+
+        :param path: the API path about to be called.
+        :type path: str
+        """
+
+        with self._lock:
+            circuit = self._circuits[path]
+            if circuit["state"] == "closed":
+                return
+            waited = time.monotonic() - circuit["opened_at"]
+            if circuit["state"] == "open" and waited >= self.reset_timeout:
+                # let one trial call through
+                circuit["state"] = "half-open"
+                return
+            circuit["rejected"] += 1
+        retry_in = max(self.reset_timeout - waited, 0.0)
+        err = f"Circuit for {path} is open, retry in {retry_in:.0f} s"
+        raise RainwaveCircuitOpenError(err)
+
+    def record_abort(self, path: str) -> None:
+        """Record a call to ``path`` that ended without a success or a
+        failure, for example because it was cancelled. A trial call ending this
+        way leaves the circuit open for another :attr:`reset_timeout`.
+
+        :param path: the API path that was called.
+        :type path: str
+        """
+
+        with self._lock:
+            circuit = self._circuits[path]
+            if circuit["state"] == "half-open":
+                circuit["state"] = "open"
+                circuit["opened_at"] = time.monotonic()
+
+    def record_failure(self, path: str) -> None:
+        """Record a failed call to ``path``.
+
+        :param path: the API path that was called.
+        :type path: str
+        """
+
+        with self._lock:
+            circuit = self._circuits[path]
+            circuit["failures"] += 1
+            circuit["consecutive_failures"] += 1
+            if circuit["state"] == "half-open" or (
+                circuit["state"] == "closed"
+                and circuit["consecutive_failures"] >= self.failure_threshold
+            ):
+                if circuit["state"] == "closed":
+                    circuit["opened"] += 1
+                circuit["state"] = "open"
+                circuit["opened_at"] = time.monotonic()
+
+    def record_success(self, path: str) -> None:
+        """Record a successful call to ``path``.
+
+        :param path: the API path that was called.
+        :type path: str
+        """
+
+        with self._lock:
+            circuit = self._circuits[path]
+            if circuit["state"] != "closed":
+                circuit["recovered"] += 1
+            circuit["state"] = "closed"
+            circuit["consecutive_failures"] = 0
+            circuit["opened_at"] = None
+
+    def reset(self) -> None:
+        """Close every circuit and clear all counters."""
+
+        with self._lock:
+            self._circuits.clear()
+
+    @property
+    def stats(self) -> dict[str, dict]:
+        """A dictionary of counters for each API path called: ``state``
+        (`closed`, `open`, or `half-open`), ``consecutive_failures``,
+        ``failures`` (in total), ``opened`` (times the circuit opened),
+        ``recovered`` (times it closed again after a successful trial call),
+        and ``rejected`` (calls that failed fast while it was open)."""
+
+        with self._lock:
+            return {
+                path: {k: v for k, v in circuit.items() if k != "opened_at"}
+                for path, circuit in self._circuits.items()
+            }
@@ -1,13 +1,14 @@
 import datetime
 import typing
 
+from .model import RainwaveModel
 from .song import RainwaveCandidate, RainwaveSong
 
 if typing.TYPE_CHECKING:
     from . import RainwaveChannel
 
 
-class RainwaveSchedule(dict):
+class RainwaveSchedule(RainwaveModel):
     """A :class:`RainwaveSchedule` object represents an event on a channel.
 
     .. note::
@@ -18,6 +19,9 @@ class RainwaveSchedule(dict):
         :attr:`RainwaveChannel.schedule_history`.
     """
 
+    _attributes = ("_channel",)
+    _fields = ("end", "id", "length", "songs", "start", "start_actual", "type")
+
     def __init__(self, channel: "RainwaveChannel", raw_info: dict) -> None:
         self._channel = channel
         super().__init__(raw_info)
@@ -81,6 +85,8 @@ class RainwaveElection(RainwaveSchedule):
     """A :class:`RainwaveElection` object is a subclass of
     :class:`RainwaveSchedule` and represents an election event on a channel."""
 
+    _fields = (*RainwaveSchedule._fields, "candidate_objects")
+
     def __repr__(self) -> str:
         return f"<RainwaveElection [{self.channel.name}]>"
 
@@ -88,11 +94,13 @@ class RainwaveElection(RainwaveSchedule):
     def candidates(self) -> list["RainwaveCandidate"]:
         """A list of :class:`RainwaveCandidate` objects in the election."""
         if "candidate_objects" not in self:
-            self["candidate_objects"] = []
+            candidates = []
+            candidate_cls = self.channel._model(RainwaveCandidate)
             for raw_song in self["songs"]:
-                alb = self.channel.get_album_by_id(raw_song["albums"][0]["id"])
-                tmp_song = RainwaveCandidate(alb, self, raw_song)
-                self["candidate_objects"].append(tmp_song)
+                alb = self.channel._album_from_stub(raw_song["albums"][0])
+                candidates.append(candidate_cls(alb, self, raw_song))
+            # if another thread got here first, use its candidates
+            return self.setdefault("candidate_objects", candidates)
         return self["candidate_objects"]
 
     @property
@@ -113,6 +121,8 @@ class RainwaveOneTimePlay(RainwaveSchedule):
     :class:`RainwaveSchedule` and represents a song added directly to the
     timeline by a manager."""
 
+    _fields = (*RainwaveSchedule._fields, "name", "song_object")
+
     def __repr__(self) -> str:
         return f"<RainwaveOneTimePlay [{self.channel.name}]>"
 
@@ -125,9 +135,12 @@ class RainwaveOneTimePlay(RainwaveSchedule):
     @property
     def song(self) -> RainwaveSong:
         """The :class:`RainwaveSong` for the event."""
-        album_id = self["songs"][0]["albums"][0]["id"]
-        tmp_album = self.channel.get_album_by_id(album_id)
-        return RainwaveSong(tmp_album, self["songs"][0])
+        if "song_object" not in self:
+            raw_song = self["songs"][0]
+            alb = self.channel._album_from_stub(raw_song["albums"][0])
+            song_cls = self.channel._model(RainwaveSong)
+            self["song_object"] = song_cls(alb, raw_song)
+        return self["song_object"]
 
     @property
     def songs(self) -> list[RainwaveSong]:
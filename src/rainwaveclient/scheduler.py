@@ -0,0 +1,236 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+import typing
+
+from .channel import post_sync, pre_sync
+
+if typing.TYPE_CHECKING:
+    from . import RainwaveChannel, RainwaveClient
+    from .aio import AsyncRainwaveClient
+    from .dispatch import Signal
+
+log = logging.getLogger(__name__)
+
+
+class RainwaveSyncScheduler:
+    """Syncs the timelines of many channels with two threads in total instead
+    of one thread per channel. An event loop in one thread keeps the long-poll
+    ``sync`` call of every channel open at once, and a single dispatch thread
+    applies the updates and sends :data:`pre_sync` and :data:`post_sync` in the
+    order the responses arrive, so every channel gets its turn and a channel
+    that syncs often cannot starve the others. Failed syncs are retried after a
+    backoff, as in :meth:`RainwaveChannel.start_sync`.
+
+    Each :class:`RainwaveClient` has one, used by
+    :meth:`RainwaveChannel.start_sync`; pass the same scheduler to several
+    clients to sync the channels of many accounts with the same two threads.
+    The threads start with the first channel and run until :meth:`close`.
+    """
+
+    def __init__(self) -> None:
+        self._async_clients = {}
+        self._channels = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    def __repr__(self) -> str:
+        return f"<RainwaveSyncScheduler [{len(self._channels)} channels]>"
+
+    def _apply(self, state: dict, d: dict, received: float) -> None:
+        # runs on the dispatch thread
+        channel = state["channel"]
+        if self._channels.get(id(channel)) is not state:
+            # the channel was stopped while its update waited for its turn
+            return
+        lag = time.monotonic() - received
+        with self._lock:
+            stats = state["stats"]
+            stats["syncs"] += 1
+            stats["lag"] = lag
+            stats["max_lag"] = max(stats["max_lag"], lag)
+        try:
+            diff = channel._update_timeline(d)
+        except Exception:
+            log.exception(f"Cannot apply the sync response for {channel!r}")
+            return
+        self._send(post_sync, channel, channel=channel, diff=diff)
+
+    def _async_client(
+        self, client: "RainwaveClient", channels: int
+    ) -> "AsyncRainwaveClient":
+        # runs on the event loop thread; every channel keeps a long-poll call
+        # open, so allow one connection for each started channel of the client
+        from .aio import AsyncRainwaveClient
+
+        async_client = self._async_clients.get(id(client))
+        if async_client is None:
+            async_client = AsyncRainwaveClient(max_connections=channels, client=client)
+            self._async_clients[id(client)] = async_client
+        else:
+            async_client._grow(channels)
+        return async_client
+
+    def _ensure_running(self) -> None:
+        # caller must hold self._lock
+        if self._thread is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="rainwave-dispatch"
+        )
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="rainwave-sync", daemon=True
+        )
+        self._thread.start()
+
+    async def _run(self, state: dict) -> None:
+        loop = asyncio.get_running_loop()
+        channel = state["channel"]
+        client = channel.client
+        async_client = self._async_client(client, state["channels"])
+        failures = 0
+        while True:
+            await loop.run_in_executor(self._executor, self._send, pre_sync, channel)
+            error = None
+            try:
+                d = await async_client.call(
+                    "sync",
+                    channel._sync_args(),
+                    timeout=client.sync_timeout,
+                    retry=False,
+                )
+            except Exception as e:
+                log.error(f"Sync failed: {e!r}")
+                d = {}
+                error = e
+            synced = error is None and channel._timeline_complete(d)
+            client.metrics.observe_sync(channel.id, synced)
+            if synced:
+                failures = 0
+                received = time.monotonic()
+                await loop.run_in_executor(
+                    self._executor, self._apply, state, d, received
+                )
+                continue
+            # wait longer after each failure instead of calling again at once
+            failures += 1
+            with self._lock:
+                state["stats"]["failures"] += 1
+            client._count("sync", sync_backoffs=1)
+            await asyncio.sleep(client.retry.delay(failures, error))
+
+    @staticmethod
+    def _send(signal: "Signal", sender: "RainwaveChannel", **kwargs: object) -> None:
+        # a failing receiver must not stop the updates of every channel
+        try:
+            signal.send(sender, **kwargs)
+        except Exception:
+            log.exception(f"Signal receiver failed for {sender!r}")
+
+    def close(self) -> None:
+        """Stop syncing every channel, close the connections, and stop the
+        threads. The scheduler starts again if another channel is started."""
+
+        with self._lock:
+            if self._thread is None:
+                return
+            loop, thread, executor = self._loop, self._thread, self._executor
+            self._channels.clear()
+            self._loop = self._thread = self._executor = None
+
+        async def shutdown() -> None:
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for async_client in self._async_clients.values():
+                await async_client.close()
+            self._async_clients.clear()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        executor.shutdown()
+
+    def running(self, channel: "RainwaveChannel") -> bool:
+        """Return ``True`` if the scheduler is syncing ``channel``.
+
+        :param channel: the channel.
+        :type channel: RainwaveChannel
+        """
+
+        state = self._channels.get(id(channel))
+        return state is not None and state["channel"] is channel
+
+    def start(self, channel: "RainwaveChannel") -> None:
+        """Begin syncing the timeline of ``channel``. Nothing happens if it is
+        syncing already.
+
+        :param channel: the channel to sync.
+        :type channel: RainwaveChannel
+        """
+
+        with self._lock:
+            if self.running(channel):
+                return
+            self._ensure_running()
+            state = {
+                "channel": channel,
+                "stats": {"syncs": 0, "failures": 0, "lag": 0.0, "max_lag": 0.0},
+                "task": None,
+            }
+            self._channels[id(channel)] = state
+            # not len(client.channels), which may call the API on the loop thread
+            state["channels"] = sum(
+                s["channel"].client is channel.client for s in self._channels.values()
+            )
+            loop = self._loop
+
+        def create_task() -> None:
+            if self._channels.get(id(channel)) is state:
+                state["task"] = loop.create_task(self._run(state))
+
+        loop.call_soon_threadsafe(create_task)
+
+    def stop(self, channel: "RainwaveChannel") -> None:
+        """Stop syncing the timeline of ``channel``. An update that arrived
+        before is not applied.
+
+        :param channel: the channel to stop syncing.
+        :type channel: RainwaveChannel
+        """
+
+        with self._lock:
+            if not self.running(channel):
+                return
+            state = self._channels.pop(id(channel))
+            loop = self._loop
+
+        def cancel() -> None:
+            if state["task"] is not None:
+                state["task"].cancel()
+
+        loop.call_soon_threadsafe(cancel)
+
+    def stats(self, channel: "RainwaveChannel") -> dict[str, float] | None:
+        """Return the sync counters of ``channel``, or ``None`` if the scheduler
+        is not syncing it: ``syncs`` (timeline updates applied), ``failures``
+        (failed or incomplete syncs), ``lag`` (the number of seconds the last
+        update waited between arriving and being applied, while the updates of
+        other channels were applied), and ``max_lag`` (the longest such wait).
+
+        :param channel: the channel.
+        :type channel: RainwaveChannel
+        """
+
+        with self._lock:
+            state = self._channels.get(id(channel))
+            if state is None or state["channel"] is not channel:
+                return None
+            return dict(state["stats"])
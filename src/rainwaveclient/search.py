@@ -0,0 +1,336 @@
+import bisect
+import collections
+import collections.abc
+import heapq
+import itertools
+import threading
+import typing
+
+from .index import normalize_name
+
+
+class RainwaveSearchResult(typing.NamedTuple):
+    """One match returned by :meth:`RainwaveSearch.search`."""
+
+    #: How well the item matches the query. Higher is better; an exact match
+    #: scores above `1`.
+    score: float
+
+    #: The kind of item: `album`, `artist`, or `song`.
+    kind: str
+
+    #: The matching :class:`RainwaveAlbum`, :class:`RainwaveArtist`, or
+    #: :class:`RainwaveSong`.
+    item: typing.Any
+
+
+def _text(kind: str, item: typing.Any) -> str:  # noqa: ANN401
+    if kind == "song":
+        return item.title
+    return item.name
+
+
+def _deletes(word: str) -> set[str]:
+    """Return every string made by deleting one character from ``word``."""
+
+    return {word[:i] + word[i + 1 :] for i in range(len(word))}
+
+
+class RainwaveSearch:
+    """A local full-text index over album names, artist names, and song titles.
+    No API calls are made to answer a query.
+
+    Items are indexed by word. Each word of a query matches indexed words that
+    are the same, that start with it (for the last word of the query, which may
+    still be being typed), or that are one typo away from it (a missing, extra,
+    wrong, or swapped letter). Items containing every query word are preferred,
+    then items missing one of them, then items containing any of them. Shorter
+    names and names that equal or start with the query rank higher.
+
+    Each :class:`RainwaveChannel` keeps one of these as
+    :attr:`RainwaveChannel.search_index`; see :meth:`RainwaveChannel.search`.
+
+    :param min_score: (optional) results scoring lower than this are dropped,
+        default `0.3`.
+    :type min_score: float
+    """
+
+    #: The maximum number of indexed words a partly typed query word expands to.
+    max_prefix_expansions = 50
+
+    #: Words shorter than this must be spelled correctly to match.
+    min_typo_length = 4
+
+    def __init__(self, min_score: float = 0.3) -> None:
+        self.min_score = min_score
+        self._docs = {}
+        # word -> (kind, number of words in the item) -> keys of items
+        self._postings = {}
+        # one-letter deletion -> indexed words it was made from
+        self._typos = collections.defaultdict(set)
+        # (kind, number of words in the item) -> number of items
+        self._groups = collections.Counter()
+        self._vocabulary = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __repr__(self) -> str:
+        return f"<RainwaveSearch [{len(self)} items]>"
+
+    @staticmethod
+    def _bounds(groups: list[tuple], top: int, m: int, n: int) -> list[float]:
+        """Return, for each group of items and those after it, the highest
+        score an item matching at most ``top`` of the ``m`` usable query words
+        (out of ``n``) could get."""
+
+        bounds = []
+        for _, length in groups:
+            bonus = 0.0
+            if m == n and top == m:
+                bonus = 1.0 if length == n else 0.5 if length > n else 0.0
+            elif m == n and top == m - 1 and length >= n:
+                # a name can start with the query without matching its last
+                # word if that word is the start of too many words to expand
+                bonus = 0.5
+            bounds.append(2 * top / (m + length) + bonus)
+        for i in range(len(bounds) - 2, -1, -1):
+            bounds[i] = max(bounds[i], bounds[i + 1])
+        return bounds
+
+    @staticmethod
+    def _candidates(per_word: list[set], need: int) -> set:
+        """Return the keys of items that match at least ``need`` of the query
+        words, given the keys of the items matching each word."""
+
+        if need == 1:
+            return set().union(*per_word)
+        found = set()
+        for subset in itertools.combinations(per_word, need):
+            found.update(set.intersection(*subset))
+        return found
+
+    def _keys_per_word(self, expansions: list[dict], group: tuple) -> list[set]:
+        """Return the keys of items in ``group`` that match each query word.
+        The returned sets must not be changed. Caller must hold self._lock."""
+
+        per_word = []
+        for matches in expansions:
+            sets = [
+                keys
+                for word in matches
+                if (keys := self._postings[word].get(group)) is not None
+            ]
+            # most words expand to one indexed word; use its keys as they are
+            per_word.append(sets[0] if len(sets) == 1 else set().union(*sets))
+        return per_word
+
+    def _expand(self, word: str, prefix: bool) -> dict[str, float]:
+        """Return the indexed words that ``word`` could mean, with how close
+        each one is. Caller must hold self._lock."""
+
+        matches = {}
+        if len(word) >= self.min_typo_length - 1:
+            for candidate in self._typos.get(word, ()):
+                matches[candidate] = 0.7
+        if len(word) >= self.min_typo_length:
+            for variant in _deletes(word):
+                if variant in self._postings:
+                    matches[variant] = 0.7
+                for candidate in self._typos.get(variant, ()):
+                    matches[candidate] = 0.7
+        if prefix:
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._postings)
+            i = bisect.bisect_left(self._vocabulary, word)
+            end = min(i + self.max_prefix_expansions, len(self._vocabulary))
+            for candidate in itertools.islice(self._vocabulary, i, end):
+                if not candidate.startswith(word):
+                    break
+                matches[candidate] = 0.9
+        if word in self._postings:
+            matches[word] = 1.0
+        return matches
+
+    def _remove(self, key: tuple) -> None:
+        # caller must hold self._lock
+        _, _, words = self._docs.pop(key)
+        group = (key[0], len(words))
+        self._groups[group] -= 1
+        if not self._groups[group]:
+            del self._groups[group]
+        for word in set(words):
+            postings = self._postings[word]
+            postings[group].discard(key)
+            if not postings[group]:
+                del postings[group]
+            if not postings:
+                del self._postings[word]
+                self._vocabulary = None
+                if len(word) >= self.min_typo_length:
+                    for variant in _deletes(word):
+                        self._typos[variant].discard(word)
+                        if not self._typos[variant]:
+                            del self._typos[variant]
+
+    def add(self, kind: str, item: typing.Any) -> None:  # noqa: ANN401
+        """Add an item to the index, or re-index it if an item of the same kind
+        and ID is already indexed.
+
+        :param kind: the kind of item: `album`, `artist`, or `song`.
+        :type kind: str
+        :param item: the object to index.
+        """
+
+        key = (kind, item.id)
+        text = normalize_name(_text(kind, item))
+        words = tuple(text.split())
+        group = (kind, len(words))
+        with self._lock:
+            if key in self._docs:
+                self._remove(key)
+            self._docs[key] = (item, text, words)
+            self._groups[group] += 1
+            for word in words:
+                postings = self._postings.get(word)
+                if postings is None:
+                    postings = self._postings[word] = {}
+                    self._vocabulary = None
+                    if len(word) >= self.min_typo_length:
+                        for variant in _deletes(word):
+                            self._typos[variant].add(word)
+                postings.setdefault(group, set()).add(key)
+
+    def remove(self, kind: str, item_id: int) -> None:
+        """Remove an item from the index if it is there.
+
+        :param kind: the kind of item: `album`, `artist`, or `song`.
+        :type kind: str
+        :param item_id: the ID of the item.
+        :type item_id: int
+        """
+
+        with self._lock:
+            if (kind, item_id) in self._docs:
+                self._remove((kind, item_id))
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kinds: collections.abc.Iterable[str] | None = None,
+    ) -> list[RainwaveSearchResult]:
+        """Return the items that best match ``query``, best match first.
+
+        :param query: the text to search for.
+        :type query: str
+        :param limit: (optional) the maximum number of results, default `10`.
+        :type limit: int
+        :param kinds: (optional) only return items of these kinds.
+        :type kinds: iterable of str
+        """
+
+        text = normalize_name(query)
+        query_words = text.split()
+        if not query_words or limit < 1:
+            return []
+        if kinds is not None:
+            kinds = set(kinds)
+        n = len(query_words)
+
+        with self._lock:
+            expansions = []
+            for i, word in enumerate(query_words):
+                matches = self._expand(word, prefix=i == n - 1)
+                # words that match nothing, like "the" or gibberish, are ignored
+                if matches:
+                    expansions.append(matches)
+            m = len(expansions)
+            if not m:
+                return []
+
+            # Items are visited in groups of the same kind and word count, from
+            # short names to long. A group can be skipped once no item in it
+            # could beat the results already found.
+            groups = sorted(
+                (g for g in self._groups if kinds is None or g[0] in kinds),
+                key=lambda g: g[1],
+            )
+
+            # prefer items matching every query word, then all but one, then any
+            best = []
+            per_group = {}
+            # the most query words an item visited in this round can match
+            top = m
+            for need in sorted({m, max(m - 1, 1), 1}, reverse=True):
+                bounds = self._bounds(groups, top, m, n)
+                top = need - 1
+                for group, bound in zip(groups, bounds):
+                    if len(best) >= limit and best[0][0] >= bound:
+                        break
+                    per_word = per_group.get(group)
+                    if per_word is None:
+                        per_word = per_group[group] = self._keys_per_word(
+                            expansions, group
+                        )
+                    for key in self._candidates(per_word, need):
+                        item, doc_text, doc_words = self._docs[key]
+                        total = 0.0
+                        for matches in expansions:
+                            total += max(matches.get(w, 0.0) for w in doc_words)
+                        score = 2 * total / (m + len(doc_words))
+                        if doc_text == text:
+                            score += 1.0
+                        elif doc_text.startswith(text):
+                            score += 0.5
+                        if score < self.min_score:
+                            continue
+                        entry = (score, -len(doc_text), key, item)
+                        if len(best) < limit:
+                            heapq.heappush(best, entry)
+                        elif entry[:3] > best[0][:3]:
+                            heapq.heapreplace(best, entry)
+                if best:
+                    break
+
+        best.sort(key=lambda x: x[:3], reverse=True)
+        return [
+            RainwaveSearchResult(score, key[0], item) for score, _, key, item in best
+        ]
+
+    def sync(self, kind: str, items: collections.abc.Iterable) -> None:
+        """Make the indexed items of one kind match ``items``: index new items,
+        re-index items whose name changed, and remove items that are gone.
+        Syncing albums also removes the songs of albums that are gone.
+
+        :param kind: the kind of item: `album`, `artist`, or `song`.
+        :type kind: str
+        :param items: all current items of that kind.
+        :type items: iterable
+        """
+
+        items = {item.id: item for item in items}
+        with self._lock:
+            gone = [k for k in self._docs if k[0] == kind and k[1] not in items]
+            if kind == "album":
+                gone.extend(
+                    key
+                    for key, (song, _, _) in self._docs.items()
+                    if key[0] == "song"
+                    and song.album is not None
+                    and song.album.id not in items
+                )
+            for key in gone:
+                self._remove(key)
+            changed = []
+            for item_id, item in items.items():
+                doc = self._docs.get((kind, item_id))
+                if (
+                    doc is None
+                    or doc[0] is not item
+                    or doc[1] != normalize_name(_text(kind, item))
+                ):
+                    changed.append(item)
+        for item in changed:
+            self.add(kind, item)
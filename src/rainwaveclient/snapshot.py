@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import typing
+
+from .decoder import JSONDecoder, stdlib_decoder
+
+log = logging.getLogger(__name__)
+
+#: The version of the snapshot file format. Snapshots written with a different
+#: version are ignored and replaced.
+FORMAT_VERSION = 1
+
+
+class RainwaveSnapshotCache:
+    """A directory of catalog API responses (`stations`, `all_albums`, and
+    `all_artists`) saved with the time they were fetched, so that a new process
+    can start without downloading the catalog again.
+
+    A snapshot younger than ``max_age`` is used as is. An older snapshot is
+    still used, but a fresh copy is fetched in a background thread and saved
+    for next time. Snapshots from a different file format version, API URL, or
+    user are ignored.
+
+    Pass ``cache_dir`` to :class:`RainwaveClient` to use one.
+
+    :param directory: the directory to keep snapshots in. It is created if it
+        does not exist.
+    :type directory: str or path-like
+    :param max_age: (optional) the number of seconds after which a snapshot is
+        revalidated, default `86400` (one day).
+    :type max_age: float
+    :param owner: (optional) a value identifying the API URL and user the
+        snapshots belong to, or a callable returning it; snapshots saved for a
+        different owner are ignored.
+    :type owner: str or callable
+    :param decoder: (optional) the JSON decoder to read snapshots with, default
+        :func:`rainwaveclient.decoder.stdlib_decoder`.
+    :type decoder: callable
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        max_age: float = 86400.0,
+        owner: str | typing.Callable[[], str] = "",
+        decoder: JSONDecoder | None = None,
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.decoder = decoder or stdlib_decoder
+        self.max_age = max_age
+        self.owner = owner
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<RainwaveSnapshotCache [{self.directory}]>"
+
+    def _owner(self, owner: str | None) -> str:
+        if owner is not None:
+            return owner
+        return self.owner() if callable(self.owner) else self.owner
+
+    def _file(self, name: str) -> pathlib.Path:
+        return self.directory / f"{name}.json"
+
+    def _refresh(
+        self,
+        name: str,
+        fetch: typing.Callable[[], dict],
+        key: str,
+        on_refresh: typing.Callable[[dict], None] | None,
+        owner: str | None,
+    ) -> None:
+        try:
+            d = fetch()
+            if key in d:
+                self.save(name, d, owner)
+                if on_refresh is not None:
+                    on_refresh(d)
+        except Exception:
+            log.exception(f"Could not revalidate snapshot {name}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(name)
+
+    def clear(self) -> None:
+        """Delete all snapshots."""
+
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def fetch(
+        self,
+        name: str,
+        fetch: typing.Callable[[], dict],
+        key: str,
+        on_refresh: typing.Callable[[dict], None] | None = None,
+    ) -> dict:
+        """Return the snapshot called ``name``, calling ``fetch`` to get and
+        save it if there is no usable snapshot. If the snapshot is older than
+        :attr:`max_age`, it is returned and revalidated in the background;
+        ``on_refresh`` is called with the new response once it arrives.
+
+        :param name: the name of the snapshot.
+        :type name: str
+        :param fetch: a callable that calls the API and returns its response.
+        :param key: the key a successful API response contains; responses
+            without it are not saved.
+        :type key: str
+        :param on_refresh: (optional) a callable to receive revalidated data.
+        """
+
+        # the owner may change while a snapshot is revalidated; keep this one
+        owner = self._owner(None)
+        snapshot = self.load(name, owner)
+        if snapshot is None:
+            d = fetch()
+            if key in d:
+                self.save(name, d, owner)
+            return d
+        d, saved = snapshot
+        if time.time() - saved > self.max_age:
+            with self._lock:
+                start = name not in self._refreshing
+                self._refreshing.add(name)
+            if start:
+                args = (name, fetch, key, on_refresh, owner)
+                thread = threading.Thread(target=self._refresh, args=args)
+                thread.daemon = True
+                thread.start()
+        return d
+
+    def load(self, name: str, owner: str | None = None) -> tuple[dict, float] | None:
+        """Return the data and save time of the snapshot called ``name``, or
+        ``None`` if there is no usable snapshot.
+
+        :param name: the name of the snapshot.
+        :type name: str
+        :param owner: (optional) the owner of the snapshot, default
+            :attr:`owner`.
+        :type owner: str
+        """
+
+        try:
+            snapshot = self.decoder(self._file(name).read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception:
+            log.warning(f"Ignoring unreadable snapshot {name}")
+            return None
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("version") != FORMAT_VERSION
+            or snapshot.get("owner") != self._owner(owner)
+        ):
+            log.debug(f"Ignoring outdated snapshot {name}")
+            return None
+        return snapshot["data"], snapshot["saved"]
+
+    def save(self, name: str, data: dict, owner: str | None = None) -> None:
+        """Save ``data`` as the snapshot called ``name``. The file is replaced
+        atomically, so readers never see a partly written snapshot.
+
+        :param name: the name of the snapshot.
+        :type name: str
+        :param data: the API response to save.
+        :type data: dict
+        :param owner: (optional) the owner of the snapshot, default
+            :attr:`owner`.
+        :type owner: str
+        """
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        snapshot = {
+            "version": FORMAT_VERSION,
+            "owner": self._owner(owner),
+            "saved": time.time(),
+            "data": data,
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp, self._file(name))
+        except BaseException:
+            pathlib.Path(tmp).unlink(missing_ok=True)
+            raise
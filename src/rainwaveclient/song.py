@@ -1,12 +1,13 @@
 import typing
 
 from .category import RainwaveCategory
+from .model import RainwaveModel
 
 if typing.TYPE_CHECKING:
     from . import RainwaveAlbum, RainwaveArtist, RainwaveElection, RainwaveListener
 
 
-class RainwaveSong(dict):
+class RainwaveSong(RainwaveModel):
     """A :class:`RainwaveSong` object represents one song.
 
     .. note::
@@ -16,11 +17,38 @@ class RainwaveSong(dict):
         :attr:`RainwaveArtist.songs`, or some other object.
     """
 
+    _attributes = ("_album",)
+    _fields = (
+        "albums",
+        "artist_objects",
+        "artists",
+        "category_objects",
+        "cool",
+        "fave",
+        "groups",
+        "id",
+        "length",
+        "link_text",
+        "origin_sid",
+        "rating",
+        "rating_allowed",
+        "rating_count",
+        "rating_histogram",
+        "rating_rank",
+        "rating_user",
+        "request_count",
+        "sid",
+        "title",
+        "url",
+    )
+
     def __init__(self, album: "RainwaveAlbum", raw_info: dict) -> None:
         self._album = album
         super().__init__(raw_info)
 
     def __len__(self) -> int:
+        if "length" not in self:
+            self._update()
         return self["length"]
 
     def __repr__(self) -> str:
@@ -29,6 +57,29 @@ class RainwaveSong(dict):
     def __str__(self) -> str:
         return f"{self.album} // {self.title} // {self.artist_string}"
 
+    def _update(self) -> None:
+        channel = self.album.channel
+        songs = self.album.get("song_objects", [])
+        if not any(song is self for song in songs):
+            self._update_from(channel.get_song_by_id(self.id))
+            return
+        # a song of an album is cached once it is complete, so that lookups by
+        # ID and the album share one object
+        cached = channel.cache.get("song", self.id)
+        if cached is None:
+            self._update_from(channel._get_song_raw_info(self.id))
+            cached = channel.cache.put("song", self.id, self)
+        else:
+            self._update_from(cached)
+        if cached is not self:
+            for i, song in enumerate(songs):
+                if song is self:
+                    songs[i] = cached
+
+    def _update_from(self, song: "RainwaveSong | dict") -> None:
+        # take the song data, but not the objects another song built from it
+        self.update((k, v) for k, v in song.items() if not k.endswith("_objects"))
+
     @property
     def album(self) -> "RainwaveAlbum":
         """The :class:`RainwaveAlbum` object the song belongs to."""
@@ -45,8 +96,7 @@ class RainwaveSong(dict):
         if "artist_objects" not in self:
             self["artist_objects"] = []
             if "artists" not in self:
-                song_obj = self.album.channel.get_song_by_id(self.id)
-                self["artists"] = song_obj["artists"]
+                self._update()
             for raw_artist in self["artists"]:
                 artist_id = raw_artist["id"]
                 channel = self.album.channel
@@ -66,6 +116,8 @@ class RainwaveSong(dict):
         categories the song belongs to."""
         if "category_objects" not in self:
             self["category_objects"] = []
+            if "groups" not in self:
+                self._update()
             for raw_cat in self["groups"]:
                 chan = self.album.channel
                 cat_id = raw_cat["id"]
@@ -77,12 +129,16 @@ class RainwaveSong(dict):
     @property
     def channel_id(self) -> int:
         """The :attr:`RainwaveChannel.id` of the channel the song belongs to."""
+        if "sid" not in self:
+            self._update()
         return self["sid"]
 
     @property
     def cool(self) -> bool:
         """A boolean representing whether the song is on cooldown. Opposite of
         :attr:`available`."""
+        if "cool" not in self:
+            self._update()
         return self["cool"]
 
     @property
@@ -90,6 +146,8 @@ class RainwaveSong(dict):
         """A boolean representing whether the song is marked as a fave or not.
         Change whether the song is a fave by assigning a boolean value to this
         attribute."""
+        if "fave" not in self:
+            self._update()
         return self["fave"]
 
     @fave.setter
@@ -117,6 +175,8 @@ class RainwaveSong(dict):
     @property
     def link_text(self) -> str:
         """The link text that corresponds with :attr:`url`."""
+        if "link_text" not in self:
+            self._update()
         return self["link_text"]
 
     @property
@@ -124,6 +184,8 @@ class RainwaveSong(dict):
         """The :attr:`RainwaveChannel.id` of the home channel for the song. This
         could be different from :attr:`channel_id` if the song is in the
         playlist of multiple channels."""
+        if "origin_sid" not in self:
+            self._update()
         return self["origin_sid"]
 
     @property
@@ -135,6 +197,8 @@ class RainwaveSong(dict):
     def rating(self) -> float:
         """The rating given to the song by the listener authenticating to the
         API. Change the rating by assigning a new value to this attribute."""
+        if "rating_user" not in self:
+            self._update()
         return self["rating_user"]
 
     @rating.setter
@@ -159,16 +223,22 @@ class RainwaveSong(dict):
     def rating_allowed(self) -> bool:
         """A boolean representing whether the listener can currently rate the
         song."""
+        if "rating_allowed" not in self:
+            self._update()
         return self["rating_allowed"]
 
     @property
     def rating_avg(self) -> float:
         """The average of all ratings given to the song by all listeners."""
+        if "rating" not in self:
+            self._update()
         return self["rating"]
 
     @property
     def rating_count(self) -> int:
         """The total number of ratings given to the song by all listeners."""
+        if "rating_count" not in self:
+            self._update()
         return self["rating_count"]
 
     @property
@@ -179,12 +249,16 @@ class RainwaveSong(dict):
             >>> song.rating_histogram
             {'1.0': 4, '1.5': 4, '2.0': 6, ..., '4.5': 46, '5.0': 26}
         """
+        if "rating_histogram" not in self:
+            self._update()
         return self["rating_histogram"]
 
     @property
     def rating_rank(self) -> int:
         """The position of the album when albums on the channel are ranked by
         rating. The highest-rated album will have :attr:`rating_rank` == 1."""
+        if "rating_rank" not in self:
+            self._update()
         return self["rating_rank"]
 
     @property
@@ -196,6 +270,8 @@ class RainwaveSong(dict):
     def request_count(self) -> int:
         """The total number of times the song has been requested by any
         listener."""
+        if "request_count" not in self:
+            self._update()
         return self["request_count"]
 
     @property
@@ -203,6 +279,8 @@ class RainwaveSong(dict):
         """The position of the song when songs on the channel are ranked by how
         often they are requested. The most-requested song will have
         :attr:`rating_rank` == 1."""
+        if "rating_rank" not in self:
+            self._update()
         return self["rating_rank"]
 
     @property
@@ -218,6 +296,8 @@ class RainwaveSong(dict):
     @property
     def url(self) -> str:
         """The URL of more information about the song."""
+        if "url" not in self:
+            self._update()
         return self["url"]
 
     def request(self) -> None:
@@ -230,6 +310,14 @@ class RainwaveCandidate(RainwaveSong):
     :class:`RainwaveSong` representing a song that is a candidate in an
     election."""
 
+    _attributes = (*RainwaveSong._attributes, "election")
+    _fields = (
+        *RainwaveSong._fields,
+        "elec_request_user_id",
+        "entry_id",
+        "entry_votes",
+    )
+
     def __init__(
         self, album: "RainwaveAlbum", election: "RainwaveElection", raw_info: dict
     ) -> None:
@@ -0,0 +1,74 @@
+"""
+Columnar exports of catalog statistics, for internal use.
+"""
+
+import array
+import collections.abc
+import math
+import typing
+
+#: The columns of :meth:`RainwaveChannel.album_stats`. ``id`` is an integer
+#: column, the rest are floating point columns.
+ALBUM_STATS = (
+    "id",
+    "rating",
+    "rating_count",
+    "fave_count",
+    "request_count",
+    "vote_count",
+    "cool_lowest",
+    "played_last",
+)
+
+#: The album statistics that are only in the full album data, not in the
+#: catalog list.
+ALBUM_DETAIL_STATS = (
+    "fave_count",
+    "played_last",
+    "rating_count",
+    "request_count",
+    "vote_count",
+)
+
+
+def columns(
+    items: collections.abc.Iterable[typing.Mapping], keys: tuple[str, ...]
+) -> dict[str, array.array]:
+    """Return one typed array per key with the value of that key in every item,
+    in one pass over the items. ``id`` becomes a 64-bit integer column, every
+    other key a double column in which missing values are NaN."""
+
+    nan = math.nan
+    ids = []
+    values = {key: [] for key in keys if key != "id"}
+    for item in items:
+        ids.append(item["id"])
+        for key, column in values.items():
+            value = item.get(key)
+            column.append(nan if value is None else value)
+    result = {}
+    for key in keys:
+        if key == "id":
+            result[key] = array.array("q", ids)
+        else:
+            result[key] = array.array("d", values[key])
+    return result
+
+
+def to_numpy(cols: dict[str, array.array]) -> typing.Any:  # noqa: ANN401
+    """Return a NumPy structured array with one field per column. Raise
+    :exc:`ImportError` if NumPy is not installed."""
+
+    try:
+        import numpy
+    except ImportError as e:
+        err = "NumPy is required for structured array exports: pip install numpy"
+        raise ImportError(err) from e
+
+    dtypes = {"q": numpy.int64, "d": numpy.float64}
+    dtype = [(key, dtypes[column.typecode]) for key, column in cols.items()]
+    length = len(next(iter(cols.values()), ()))
+    result = numpy.empty(length, dtype=dtype)
+    for key, column in cols.items():
+        result[key] = numpy.frombuffer(column, dtype=dtypes[column.typecode])
+    return result
@@ -0,0 +1,159 @@
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import RainwaveSchedule
+
+_EVENT_KEYS = ("sched_current", "sched_next", "sched_history")
+
+
+class RainwaveTimeline(typing.NamedTuple):
+    """The schedule of a channel as of one update, see
+    :attr:`RainwaveChannel.timeline`. The objects are built once per update and
+    shared by every reader until the next one."""
+
+    #: The current :class:`RainwaveSchedule`.
+    current: "RainwaveSchedule | None"
+
+    #: The next :class:`RainwaveSchedule` objects, soonest first.
+    next: tuple["RainwaveSchedule", ...]
+
+    #: The past :class:`RainwaveSchedule` objects, most recent first.
+    history: tuple["RainwaveSchedule", ...]
+
+
+class RainwaveTimelineDiff(typing.NamedTuple):
+    """What changed in the timeline of a channel with one update. Receivers of
+    :data:`post_sync` get one as the ``diff`` keyword argument.
+
+    Events, candidates, and request line entries are the raw API data, not
+    model objects. An event is matched across updates by its ID, a candidate by
+    its entry ID (or song ID outside elections), and a request line entry by
+    its user ID. An event that moved, for example from
+    :attr:`RainwaveChannel.schedule_next` to
+    :attr:`RainwaveChannel.schedule_current`, is changed only if its data
+    changed.
+    """
+
+    #: The new current event, if the current event changed, otherwise ``None``.
+    current: dict | None
+
+    #: The events that were not in the timeline before.
+    events_added: list[dict]
+
+    #: The events that are no longer in the timeline.
+    events_removed: list[dict]
+
+    #: The new data of events whose data changed, apart from their songs.
+    events_changed: list[dict]
+
+    #: ``(event_id, song)`` for each new candidate of an event that was
+    #: already in the timeline.
+    candidates_added: list[tuple[int, dict]]
+
+    #: ``(event_id, song)`` for each candidate that was removed from an event
+    #: that is still in the timeline.
+    candidates_removed: list[tuple[int, dict]]
+
+    #: ``(event_id, song)`` with the new data of each candidate whose data
+    #: changed, such as its number of votes.
+    candidates_changed: list[tuple[int, dict]]
+
+    #: The new entries of the request line.
+    requests_added: list[dict]
+
+    #: The entries that left the request line.
+    requests_removed: list[dict]
+
+    #: The new data of request line entries that changed, such as their
+    #: position or song.
+    requests_changed: list[dict]
+
+    @property
+    def empty(self) -> bool:
+        """``True`` if nothing changed."""
+        return self.current is None and not any(self[1:])
+
+
+def _candidate_key(song: dict) -> typing.Hashable:
+    return song.get("entry_id", song.get("id"))
+
+
+def _changed(old: dict, new: dict, ignore: str | None = None) -> bool:
+    if ignore is None:
+        return old != new
+    keys = old.keys() | new.keys()
+    return any(old.get(key) != new.get(key) for key in keys if key != ignore)
+
+
+def _diff(
+    old: dict, new: dict, ignore: str | None = None
+) -> tuple[list[dict], list[dict], list[dict], list[tuple[dict, dict]]]:
+    """Compare two dictionaries of items by key and return the added, removed,
+    and changed items, and the (old, new) pairs of items in both."""
+
+    added = [item for key, item in new.items() if key not in old]
+    removed = [item for key, item in old.items() if key not in new]
+    changed = []
+    both = []
+    for key, item in new.items():
+        if key in old:
+            both.append((old[key], item))
+            if _changed(old[key], item, ignore):
+                changed.append(item)
+    return added, removed, changed, both
+
+
+def _events(timeline: dict) -> dict:
+    events = {}
+    for key in _EVENT_KEYS:
+        value = timeline.get(key)
+        for event in value if isinstance(value, list) else [value]:
+            if event:
+                events[event.get("id")] = event
+    return events
+
+
+def diff_timeline(old: dict, new: dict) -> RainwaveTimelineDiff:
+    """Return the :class:`RainwaveTimelineDiff` between two timelines, each a
+    dictionary with the ``sched_current``, ``sched_next``, ``sched_history``,
+    and ``request_line`` data of a ``sync`` or ``info`` response."""
+
+    events_added, events_removed, events_changed, both = _diff(
+        _events(old), _events(new), ignore="songs"
+    )
+    candidates_added = []
+    candidates_removed = []
+    candidates_changed = []
+    for old_event, new_event in both:
+        if old_event.get("songs") == new_event.get("songs"):
+            continue
+        event_id = new_event.get("id")
+        added, removed, changed, _ = _diff(
+            {_candidate_key(song): song for song in old_event.get("songs") or []},
+            {_candidate_key(song): song for song in new_event.get("songs") or []},
+        )
+        candidates_added.extend((event_id, song) for song in added)
+        candidates_removed.extend((event_id, song) for song in removed)
+        candidates_changed.extend((event_id, song) for song in changed)
+
+    requests_added, requests_removed, requests_changed, _ = _diff(
+        {entry.get("user_id"): entry for entry in old.get("request_line") or []},
+        {entry.get("user_id"): entry for entry in new.get("request_line") or []},
+    )
+
+    current = new.get("sched_current") or None
+    old_current = old.get("sched_current") or {}
+    if current is not None and current.get("id") == old_current.get("id"):
+        current = None
+    return RainwaveTimelineDiff(
+        current,
+        events_added,
+        events_removed,
+        events_changed,
+        candidates_added,
+        candidates_removed,
+        candidates_changed,
+        requests_added,
+        requests_removed,
+        requests_changed,
+    )
@@ -0,0 +1,238 @@
+import base64
+import builtins
+import collections
+import gzip
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from .pool import RainwaveConnectionPool
+
+#: The request arguments left out of cassettes.
+SCRUBBED_ARGS = frozenset({"user_id", "key"})
+
+#: What the API key is replaced with in recorded responses.
+SCRUBBED_KEY = "<key>"
+
+# the response headers the client reads
+_HEADERS = ("content-type", "retry-after")
+
+_VERSION = 1
+
+
+class RainwaveCassetteError(LookupError):
+    """Raised by :class:`RainwavePlayer` when its cassette has no response left
+    for a request, or the cassette cannot be read."""
+
+
+def _request_key(method: str, url: str, body: bytes | None) -> tuple:
+    args = parse_qsl((body or b"").decode(), keep_blank_values=True)
+    args = sorted((k, v) for k, v in args if k not in SCRUBBED_ARGS)
+    return method, urlsplit(url).path, tuple(map(tuple, args))
+
+
+class RainwaveRecorder:
+    """A transport for :class:`RainwaveClient` that sends requests through
+    another transport and records each request and response in a cassette
+    file, to be replayed later by :class:`RainwavePlayer`. The ``user_id`` and
+    ``key`` arguments are left out, and the key is replaced in text responses,
+    so a cassette can be shared. Other user details in responses, such as the
+    user's ID and name, are recorded as they are. The cassette is compressed
+    JSON lines, written as the responses arrive.
+
+    Usage::
+
+        >>> rw = RainwaveClient(5049, 'abcde12345')
+        >>> rw.transport = RainwaveRecorder('sync.cassette', rw.pool)
+        >>> rw.channels[0].start_sync()
+        ...
+        >>> rw.channels[0].stop_sync()
+        >>> rw.transport.close()
+
+    :param path: the cassette file to write.
+    :type path: str or path-like
+    :param transport: (optional) the transport that sends the requests,
+        default a new :class:`RainwaveConnectionPool`.
+    :type transport: RainwaveConnectionPool
+    """
+
+    def __init__(
+        self, path: str | os.PathLike, transport: RainwaveConnectionPool | None = None
+    ) -> None:
+        self.path = path
+        self.transport = transport or RainwaveConnectionPool(10, 60.0, 30.0)
+        #: The number of requests recorded.
+        self.count = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({"version": _VERSION}) + "\n")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+
+    def __enter__(self) -> "RainwaveRecorder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<RainwaveRecorder [{self.count} requests]>"
+
+    def _write(self, record: dict) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self.count += 1
+
+    def close(self) -> None:
+        """Finish the cassette file. Later requests are sent but not
+        recorded."""
+
+        with self._lock:
+            self._file.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict | None = None,
+        decode_content: bool = False,
+        timeout: float | None = None,
+    ) -> tuple:
+        """Send a request with :attr:`transport` and record it, see
+        :meth:`RainwaveConnectionPool.request`."""
+
+        _, path, args = _request_key(method, url, body)
+        keys = [v for k, v in parse_qsl((body or b"").decode()) if k == "key" and v]
+        record = {"method": method, "path": path, "args": args}
+        start = time.monotonic()
+        record["at"] = round(start - self._start, 6)
+        try:
+            status, response_headers, data, received = self.transport.request(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                decode_content=decode_content,
+                timeout=timeout,
+            )
+        except OSError as e:
+            record["elapsed"] = round(time.monotonic() - start, 6)
+            record["error"] = [type(e).__name__, str(e)]
+            self._write(record)
+            raise
+        record["elapsed"] = round(time.monotonic() - start, 6)
+        record["status"] = status
+        record["headers"] = {
+            name: response_headers[name]
+            for name in _HEADERS
+            if response_headers.get(name) is not None
+        }
+        record["received"] = received
+        try:
+            text = data.decode()
+            for key in keys:
+                text = text.replace(key, SCRUBBED_KEY)
+            record["body"] = text
+        except UnicodeDecodeError:
+            record["body_b64"] = base64.b64encode(data).decode()
+        self._write(record)
+        return status, response_headers, data, received
+
+
+class RainwavePlayer:
+    """A transport for :class:`RainwaveClient` that answers requests with the
+    responses recorded in a cassette by :class:`RainwaveRecorder`, without
+    network access. A request gets the next recorded response to the same
+    method, path, and arguments (apart from ``user_id`` and ``key``), so
+    repeated calls such as ``sync`` replay in the order they were recorded.
+    Failed requests replay as the same kind of :exc:`OSError`.
+
+    Usage::
+
+        >>> player = RainwavePlayer('sync.cassette')
+        >>> rw = RainwaveClient(5049, 'abcde12345', transport=player)
+        >>> rw.channels[0].start_sync()
+
+    :param path: the cassette file to read.
+    :type path: str or path-like
+    :param timing: (optional) replay at the recorded pace, default `False`,
+        which answers at once. Each response is returned no earlier than it
+        arrived while recording, counted from when the recorder and the player
+        were created, and never sooner than the original request took.
+    :type timing: bool
+    :raises RainwaveCassetteError: if the file is not a cassette.
+    """
+
+    def __init__(self, path: str | os.PathLike, timing: bool = False) -> None:
+        self.path = path
+        self.timing = timing
+        self._start = time.monotonic()
+        self._responses = collections.defaultdict(collections.deque)
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+            except (OSError, ValueError) as e:
+                raise RainwaveCassetteError(f"Not a cassette: {path}") from e
+            if header.get("version") != _VERSION:
+                err = f"Unsupported cassette version: {header.get('version')!r}"
+                raise RainwaveCassetteError(err)
+            for line in f:
+                record = json.loads(line)
+                key = (
+                    record["method"],
+                    record["path"],
+                    tuple(map(tuple, record["args"])),
+                )
+                self._responses[key].append(record)
+
+    def __repr__(self) -> str:
+        return f"<RainwavePlayer [{self.remaining} responses]>"
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict | None = None,
+        decode_content: bool = False,
+        timeout: float | None = None,
+    ) -> tuple:
+        """Return the next recorded response to the request, in the form of
+        :meth:`RainwaveConnectionPool.request`.
+
+        :raises RainwaveCassetteError: if no response is left for the request.
+        """
+
+        key = _request_key(method, url, body)
+        with self._lock:
+            responses = self._responses.get(key)
+            record = responses.popleft() if responses else None
+        if record is None:
+            _, path, args = key
+            err = f"No recorded response left for {method} {path} {dict(args)}"
+            raise RainwaveCassetteError(err)
+        if self.timing:
+            due = self._start + record["at"] + record["elapsed"]
+            time.sleep(max(due - time.monotonic(), record["elapsed"]))
+        if "error" in record:
+            name, message = record["error"]
+            error = getattr(builtins, name, None)
+            if not (isinstance(error, type) and issubclass(error, OSError)):
+                error = OSError
+            raise error(message)
+        if "body_b64" in record:
+            data = base64.b64decode(record["body_b64"])
+        else:
+            data = record["body"].encode()
+        return record["status"], record["headers"], data, record["received"]
+
+    @property
+    def remaining(self) -> int:
+        """The number of recorded responses not replayed yet."""
+        with self._lock:
+            return sum(len(responses) for responses in self._responses.values())
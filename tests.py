@@ -1,14 +1,25 @@
+import asyncio
 import datetime
+import gzip
+import http.server
+import json
 import logging
 import os
 import random
 import secrets
 import sys
+import tempfile
+import threading
+import time
 import unittest
+import unittest.mock
+import zlib
 
 import notch
 
+from benchmarks.mock_api import MockRainwaveAPI
 from src import rainwaveclient
+from src.rainwaveclient import aio
 
 log = logging.getLogger(__name__)
 
@@ -56,6 +67,730 @@ class TestRainwaveClient(unittest.TestCase):
     def test_channel_count(self) -> None:
         self.assertEqual(len(self.rw.channels), 6)
 
+    def test_pool_reuse(self) -> None:
+        self.rw.call("stations")
+        reused = self.rw.pool.stats["reused"]
+        self.rw.call("stations")
+        self.assertEqual(self.rw.pool.stats["reused"], reused + 1)
+
+    def test_compact(self) -> None:
+        rw = rainwaveclient.RainwaveClient(USER_ID, KEY, compact=True)
+        album = rw.channels[0].albums[0]
+        self.assertIsInstance(album, rainwaveclient.RainwaveAlbum)
+        self.assertEqual(dict(album)["name"], album.name)
+        self.assertEqual(album.songs[0].album, album)
+
+    def test_snapshot_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rw = rainwaveclient.RainwaveClient(USER_ID, KEY, cache_dir=cache_dir)
+            names = [c.name for c in rw.channels]
+            self.assertIsNotNone(rw.snapshots.load("stations"))
+            rw = rainwaveclient.RainwaveClient(USER_ID, KEY, cache_dir=cache_dir)
+            rw.call = None
+            self.assertEqual([c.name for c in rw.channels], names)
+
+
+DOCUMENT = {"stations": [{"id": i, "name": f"Channel {i}"} for i in range(500)]}
+
+
+class FixtureAPI(MockRainwaveAPI):
+    """The stand-in API of ``benchmarks/mock_api.py``, with a few more paths for
+    the offline tests. ``gzip`` and ``deflate`` answer with :data:`DOCUMENT`,
+    compressed with that encoding if the client accepts it. A path that is an
+    HTTP status, like ``503``, answers with that status and a JSON error body,
+    and ``retry-after: 0`` for ``429`` and ``503``.
+    The ``framing`` argument of any call picks how the response body is sent:
+    with a ``content-length`` (the default), as ``chunked`` transfer encoding,
+    until the connection is closed (``close``), or with a ``content-length``
+    after which the connection is closed without notice (``drop``), as servers
+    do with idle connections. The client port of each call is added to
+    :attr:`ports`, to tell connections apart."""
+
+    def __init__(self) -> None:
+        super().__init__(sync_interval=0.05)
+        self.ports = []
+
+    def serve(
+        self, handler: http.server.BaseHTTPRequestHandler, path: str, args: dict
+    ) -> None:
+        self.ports.append(handler.client_address[1])
+        status = 200
+        encoding = "identity"
+        if path in ("gzip", "deflate"):
+            body = json.dumps(DOCUMENT).encode()
+            if path in handler.headers.get("accept-encoding", ""):
+                encoding = path
+                compress = gzip.compress if path == "gzip" else zlib.compress
+                body = compress(body)
+        elif path.isdigit():
+            status = int(path)
+            body = json.dumps({"error": {"code": status}}).encode()
+        else:
+            body = self.respond(path, args)
+        framing = args.get("framing", "length")
+        handler.send_response(status)
+        handler.send_header("content-type", "application/json")
+        if status in (429, 503):
+            handler.send_header("retry-after", "0")
+        handler.send_header("content-encoding", encoding)
+        if framing == "chunked":
+            handler.send_header("transfer-encoding", "chunked")
+            handler.end_headers()
+            half = len(body) // 2
+            for chunk in (body[:half], body[half:], b""):
+                handler.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        elif framing == "close":
+            handler.send_header("connection", "close")
+            handler.end_headers()
+            handler.wfile.write(body)
+            handler.close_connection = True
+        else:
+            handler.send_header("content-length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+            handler.close_connection = framing == "drop"
+
+
+class FixtureTestCase(unittest.TestCase):
+    """Run a :class:`FixtureAPI` for the tests of the class. The connections of
+    the clients made with :meth:`client` are closed after each test."""
+
+    api: FixtureAPI
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.api = FixtureAPI()
+        cls.api.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.api.stop()
+        super().tearDownClass()
+
+    def client(self, **kwargs: object) -> rainwaveclient.RainwaveClient:
+        rw = rainwaveclient.RainwaveClient(USER_ID, KEY, **kwargs)
+        rw.base_url = self.api.base_url
+        self.addCleanup(rw.pool.clear)
+        return rw
+
+
+class TestPool(FixtureTestCase):
+    def test_dropped(self) -> None:
+        rw = self.client()
+        rw.call("stations", {"framing": "drop"})
+        time.sleep(0.05)
+        # the closed connection is not used again
+        rw.call("stations")
+        stats = rw.pool.stats
+        self.assertEqual(
+            (stats["opened"], stats["evicted"], stats["reused"]), (2, 1, 0)
+        )
+        rw.call("stations")
+        self.assertEqual(rw.pool.stats["reused"], 1)
+
+    def test_event_loops(self) -> None:
+        rw = aio.AsyncRainwaveClient(client=self.client())
+        self.api.ports.clear()
+        first = asyncio.new_event_loop()
+        self.addCleanup(first.close)
+        first.run_until_complete(rw.call("stations"))
+
+        async def second() -> dict:
+            try:
+                return await rw.call("stations")
+            finally:
+                await rw.close()
+
+        # the connection kept for the first loop is not used on the second
+        self.assertEqual(len(asyncio.run(second())["stations"]), 6)
+        self.assertEqual(len(set(self.api.ports)), 2)
+        # let the first loop finish closing its connection
+        first.run_until_complete(asyncio.sleep(0))
+
+
+class TestCompression(FixtureTestCase):
+    def test_compressed(self) -> None:
+        rw = self.client(compress=True)
+        for encoding in ("gzip", "deflate"):
+            self.assertEqual(rw.call(encoding), DOCUMENT)
+            stats = rw.transfer_stats[encoding]
+            self.assertLess(stats["received_bytes"], stats["decoded_bytes"])
+
+    def test_json_decoder(self) -> None:
+        decoded = []
+
+        def decoder(data: bytes) -> dict:
+            decoded.append(data)
+            return json.loads(data)
+
+        rw = self.client(json_decoder=decoder)
+        self.assertEqual(rw.call("gzip"), DOCUMENT)
+        self.assertIsInstance(decoded[0], bytes)
+
+    def test_proxy(self) -> None:
+        # the test server answers requests for any host, as a proxy would
+        proxy = self.api.base_url.removesuffix("/api4/")
+        env = {"http_proxy": proxy, "no_proxy": ""}
+        with unittest.mock.patch.dict(os.environ, env):
+            rw = self.client()
+            rw.base_url = "http://rainwave.invalid/api4/"
+            self.assertEqual(rw.call("gzip"), DOCUMENT)
+
+    def test_uncompressed(self) -> None:
+        rw = self.client(compress=False)
+        self.assertEqual(rw.call("gzip"), DOCUMENT)
+        stats = rw.transfer_stats["gzip"]
+        self.assertEqual(stats["received_bytes"], stats["decoded_bytes"])
+
+
+class TestRetry(FixtureTestCase):
+    def retry_client(
+        self, attempts: int, failure_threshold: int = 5
+    ) -> rainwaveclient.RainwaveClient:
+        return self.client(
+            retry=rainwaveclient.RainwaveRetryPolicy(attempts, backoff=0.01),
+            breaker=rainwaveclient.RainwaveCircuitBreaker(failure_threshold, 60),
+        )
+
+    def test_circuit_breaker(self) -> None:
+        rw = self.retry_client(attempts=1, failure_threshold=2)
+        for _ in range(2):
+            with self.assertRaises(rainwaveclient.RainwaveAPIError):
+                rw.call("503")
+        with self.assertRaises(rainwaveclient.RainwaveCircuitOpenError):
+            rw.call("503")
+        stats = rw.breaker.stats["503"]
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual(stats["rejected"], 1)
+
+    def test_cancelled_trial(self) -> None:
+        rw = self.retry_client(attempts=1, failure_threshold=1)
+        rw.breaker.reset_timeout = 0
+        with self.assertRaises(rainwaveclient.RainwaveAPIError):
+            rw.call("503")
+        # the trial call waits for the rate limiter until it is cancelled
+        rw.rate_limiter = rainwaveclient.RainwaveRateLimiter(rate=0.001, burst=1)
+        rw.rate_limiter.acquire("503")
+
+        async def cancel_trial() -> None:
+            trial = asyncio.ensure_future(
+                aio.AsyncRainwaveClient(client=rw).call("503")
+            )
+            await asyncio.sleep(0.05)
+            trial.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await trial
+
+        asyncio.run(cancel_trial())
+        self.assertEqual(rw.breaker.stats["503"]["state"], "open")
+        rw.rate_limiter = None
+        with self.assertRaises(rainwaveclient.RainwaveAPIError):
+            rw.call("503")
+
+    def test_client_error(self) -> None:
+        rw = self.retry_client(attempts=3)
+        self.assertEqual(rw.call("404"), {"error": {"code": 404}})
+        self.assertNotIn("retries", rw.transfer_stats["404"])
+
+    def test_retryable(self) -> None:
+        policy = rainwaveclient.RainwaveRetryPolicy()
+        self.assertTrue(policy.retryable(asyncio.TimeoutError()))
+        self.assertTrue(policy.retryable(ConnectionResetError()))
+        self.assertFalse(policy.retryable(ValueError()))
+
+    def test_writes_not_repeated(self) -> None:
+        policy = rainwaveclient.RainwaveRetryPolicy()
+        self.assertTrue(policy.safe_to_repeat("song", TimeoutError()))
+        self.assertFalse(policy.safe_to_repeat("vote", TimeoutError()))
+        self.assertTrue(policy.safe_to_repeat("vote", ConnectionRefusedError()))
+        busy = rainwaveclient.RainwaveAPIError("vote", 429, "Too Many Requests")
+        self.assertTrue(policy.safe_to_repeat("vote", busy))
+        failed = rainwaveclient.RainwaveAPIError("vote", 503, "Service Unavailable")
+        self.assertFalse(policy.safe_to_repeat("vote", failed))
+
+    def test_server_error(self) -> None:
+        rw = self.retry_client(attempts=3)
+        with self.assertRaises(rainwaveclient.RainwaveAPIError) as cm:
+            rw.call("503")
+        self.assertEqual(cm.exception.status, 503)
+        stats = rw.transfer_stats["503"]
+        self.assertEqual(stats["errors"], 3)
+        self.assertEqual(stats["retries"], 2)
+
+
+class TestCassette(FixtureTestCase):
+    def test_record_replay(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calls.cassette")
+            rw = self.client()
+            with rainwaveclient.RainwaveRecorder(path, rw.pool) as recorder:
+                rw.transport = recorder
+                recorded = [rw.call("200", {"id": 1}), rw.call("404", {"id": 2})]
+            with gzip.open(path, "rt") as f:
+                self.assertNotIn(KEY, f.read())
+
+            player = rainwaveclient.RainwavePlayer(path)
+            rw = rainwaveclient.RainwaveClient(USER_ID, KEY, transport=player)
+            replayed = [rw.call("200", {"id": 1}), rw.call("404", {"id": 2})]
+            self.assertEqual(replayed, recorded)
+            self.assertEqual(player.remaining, 0)
+            with self.assertRaises(rainwaveclient.RainwaveCassetteError):
+                rw.call("200", {"id": 1})
+
+    def test_scrub_timing(self) -> None:
+        class Transport:
+            def request(self, *args: object, **kwargs: object) -> tuple:
+                time.sleep(0.05)
+                return 200, {}, b'{"user": {"api_key": "secret"}}', 31
+
+        body = b"user_id=1&key=secret"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calls.cassette")
+            with rainwaveclient.RainwaveRecorder(path, Transport()) as recorder:
+                recorder.request("POST", "http://api/info", body)
+                time.sleep(0.2)
+                recorder.request("POST", "http://api/info", body)
+            with gzip.open(path, "rt") as f:
+                self.assertNotIn("secret", f.read())
+
+            player = rainwaveclient.RainwavePlayer(path, timing=True)
+            start = time.monotonic()
+            _, _, data, _ = player.request("POST", "http://api/info", body)
+            self.assertGreaterEqual(time.monotonic() - start, 0.05)
+            self.assertEqual(json.loads(data)["user"]["api_key"], "<key>")
+            player.request("POST", "http://api/info", body)
+            self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_metrics(self) -> None:
+        metrics = rainwaveclient.RainwaveMetrics(buckets=(0.1, 1))
+        metrics.observe_call("song", 200, 0.05, 30, 400)
+        metrics.observe_call("song", 503, 2.0, 30, 100)
+        metrics.observe_decode("song", 0.001)
+        metrics.observe_error("song", rainwaveclient.RainwaveAPIError("song", 503, ""))
+        metrics.observe_sync(1, ok=True)
+        d = metrics.as_dict()
+        song = d["paths"]["song"]
+        self.assertEqual(song["calls"], 2)
+        self.assertEqual(song["latency"]["buckets"], {0.1: 1, 1: 1, float("inf"): 2})
+        self.assertEqual(song["response_bytes"], 500)
+        self.assertEqual(song["statuses"], {200: 1, 503: 1})
+        self.assertEqual(song["errors"], {"RainwaveAPIError": 1})
+        self.assertEqual(d["syncs"], {1: {"ok": 1}})
+        lines = metrics.render().splitlines()
+        self.assertIn('rainwave_api_latency_seconds_count{path="song"} 2', lines)
+        self.assertIn('rainwave_api_responses_total{path="song",status="503"} 1', lines)
+        self.assertIn(
+            'rainwave_sync_iterations_total{channel="1",result="ok"} 1', lines
+        )
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst(self) -> None:
+        limiter = rainwaveclient.RainwaveRateLimiter(rate=50, burst=2)
+        self.assertEqual(limiter.acquire("song"), 0)
+        self.assertEqual(limiter.acquire("song"), 0)
+        self.assertGreater(limiter.acquire("song"), 0)
+        self.assertEqual(limiter.acquire("sync"), 0)
+        stats = limiter.stats
+        self.assertEqual(stats["read"]["calls"], 3)
+        self.assertEqual(stats["read"]["waited"], 1)
+        self.assertEqual(stats["exempt"]["waited"], 0)
+
+    def test_async(self) -> None:
+        limiter = rainwaveclient.RainwaveRateLimiter(rate=50, burst=1)
+
+        async def acquire() -> list:
+            return [await limiter.acquire_async("song") for _ in range(3)]
+
+        waited = asyncio.run(acquire())
+        self.assertEqual(waited[0], 0)
+        self.assertGreater(waited[2], 0)
+        self.assertEqual(limiter.stats["read"]["waited"], 2)
+
+    def test_writes_first(self) -> None:
+        limiter = rainwaveclient.RainwaveRateLimiter(rate=20, burst=1)
+        limiter.acquire("song")
+        order = []
+        read = threading.Thread(target=lambda: order.append(limiter.acquire("song")))
+        read.start()
+        time.sleep(0.01)
+        limiter.acquire("vote")
+        order.append("vote")
+        read.join()
+        self.assertEqual(order[0], "vote")
+
+    def test_unknown_class(self) -> None:
+        with self.assertRaises(ValueError):
+            rainwaveclient.RainwaveRateLimiter(classes={"song": "fast"})
+
+
+class TestModel(unittest.TestCase):
+    def test_attributes(self) -> None:
+        raw_album = {"id": 1, "name": "Album"}
+        album = rainwaveclient.RainwaveAlbum(None, raw_album)
+        album.note = "set by the caller"
+        self.assertEqual(album.note, "set by the caller")
+        self.assertIsNone(rainwaveclient.RainwaveListener.channel)
+        compact = rainwaveclient.model.compact_class(rainwaveclient.RainwaveAlbum)
+        self.assertEqual(compact.__slots__[-1], "_channel")
+        self.assertEqual(dict(compact(None, raw_album)), raw_album)
+
+
+class TestSnapshotCache(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.cache = rainwaveclient.RainwaveSnapshotCache(self.dir, owner="me")
+
+    def test_save(self) -> None:
+        self.cache.save("stations", {"stations": [1]})
+        with unittest.mock.patch("json.dump", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.cache.save("stations", {"stations": [2]})
+        self.assertEqual(os.listdir(self.dir), ["stations.json"])
+        self.assertEqual(self.cache.load("stations")[0], {"stations": [1]})
+
+    def test_rejected(self) -> None:
+        self.cache.save("stations", {"stations": []})
+        self.assertIsNone(self.cache.load("stations", "someone else"))
+        with unittest.mock.patch.object(rainwaveclient.snapshot, "FORMAT_VERSION", 0):
+            self.assertIsNone(self.cache.load("stations"))
+        rw = rainwaveclient.RainwaveClient(1, "key", cache_dir=self.dir)
+        rw.snapshots.save("stations", {"stations": []})
+        self.assertIsNotNone(rw.snapshots.load("stations"))
+        rw.user_id = 2
+        self.assertIsNone(rw.snapshots.load("stations"))
+        rw.user_id, rw.key = 1, "other key"
+        self.assertIsNone(rw.snapshots.load("stations"))
+
+    def test_refresh(self) -> None:
+        self.cache.save("stations", {"stations": [1]})
+        self.cache.max_age = 0
+        refreshed = threading.Event()
+        d = self.cache.fetch(
+            "stations",
+            lambda: {"stations": [2]},
+            "stations",
+            lambda d: refreshed.set(),
+        )
+        self.assertEqual(d, {"stations": [1]})
+        self.assertTrue(refreshed.wait(5))
+        self.assertEqual(self.cache.load("stations")[0], {"stations": [2]})
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_shared(self) -> None:
+        flights = rainwaveclient.flight.SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def fn() -> list:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return calls
+
+        def do() -> None:
+            results.append(flights.do("key", fn))
+
+        threads = [threading.Thread(target=do) for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [0, 1, 1, 1])
+        self.assertTrue(all(result is calls for result, _ in results))
+        self.assertEqual(flights.do("key", fn), (calls, False))
+
+
+class TestSyncScheduler(FixtureTestCase):
+    def test_channels(self) -> None:
+        scheduler = rainwaveclient.RainwaveSyncScheduler()
+        rw = self.client(sync_scheduler=scheduler)
+        rw._raw_channels = [{"id": i, "name": f"Channel {i}"} for i in range(1, 7)]
+        synced = threading.Semaphore(0)
+
+        def on_post_sync(signal: object, sender: object, **kwargs: object) -> None:
+            synced.release()
+
+        rainwaveclient.channel.post_sync.connect(on_post_sync)
+        try:
+            for channel in rw.channels[:4]:
+                channel.start_sync()
+            for _ in range(12):
+                self.assertTrue(synced.acquire(timeout=5))
+            # one connection for each channel that syncs
+            self.assertEqual(scheduler._async_clients[id(rw)].max_connections, 4)
+            names = {t.name for t in threading.enumerate()}
+            self.assertIn("rainwave-sync", names)
+            self.assertEqual(
+                len([name for name in names if name.startswith("rainwave-")]), 2
+            )
+            self.assertGreater(rw.channels[0].sync_stats["syncs"], 0)
+            rw.channels[0].stop_sync()
+            self.assertIsNone(rw.channels[0].sync_stats)
+            self.assertGreater(rw.channels[1].schedule_current.id, 10)
+        finally:
+            rainwaveclient.channel.post_sync.disconnect(on_post_sync)
+            scheduler.close()
+        self.assertIsNone(rw.channels[1].sync_stats)
+
+
+class TestAsyncClient(FixtureTestCase, unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.rw = aio.AsyncRainwaveClient(USER_ID, KEY)
+        self.rw.base_url = self.api.base_url
+        self.api.ports.clear()
+
+    async def asyncTearDown(self) -> None:
+        await self.rw.close()
+
+    async def test_call(self) -> None:
+        d = await self.rw.call("stations")
+        self.assertEqual([s["id"] for s in d["stations"]], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(self.rw.client.transfer_stats["stations"]["calls"], 1)
+
+    async def test_chunked(self) -> None:
+        d = await self.rw.call("album", {"id": 7, "framing": "chunked"})
+        self.assertEqual(d["album"]["id"], 7)
+        d = await self.rw.call("album", {"id": 8})
+        self.assertEqual(d["album"]["id"], 8)
+        self.assertEqual(len(set(self.api.ports)), 1)
+
+    async def test_keep_alive(self) -> None:
+        for _ in range(3):
+            await self.rw.call("stations")
+        self.assertEqual(len(set(self.api.ports)), 1)
+        d = await self.rw.call("album", {"id": 7, "framing": "close"})
+        self.assertEqual(d["album"]["id"], 7)
+        await self.rw.call("stations")
+        self.assertEqual(len(set(self.api.ports)), 2)
+
+    async def test_retry_after(self) -> None:
+        with self.assertRaises(rainwaveclient.RainwaveAPIError) as cm:
+            await self.rw.call("503", retry=False)
+        self.assertEqual(cm.exception.retry_after, 0)
+
+    async def test_status_line(self) -> None:
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"HTTP/1.1 200\r\ncontent-length: 2\r\n\r\n{}")
+        response = await aio.AsyncRainwaveClient._read_response(reader)
+        self.assertEqual(response, (200, {"content-length": "2"}, True, b"{}"))
+
+    async def test_channels(self) -> None:
+        channels = await self.rw.channels()
+        self.assertEqual(channels[0].name, "Game Radio")
+        self.assertEqual(len(channels), 6)
+        self.assertIs(await self.rw.channels(), channels)
+        self.assertIs(channels[0].channel, self.rw.client.channels[0])
+
+    async def test_get_by_id(self) -> None:
+        channel = (await self.rw.channels())[0]
+        album = await channel.get_album_by_id(7)
+        self.assertEqual(album.name, "Album 7: Original Soundtrack")
+        self.assertIs(await channel.get_album_by_id(7), album)
+        artist = await channel.get_artist_by_id(3)
+        self.assertEqual(artist.name, "Artist 3")
+        listener = await channel.get_listener_by_id(5)
+        self.assertEqual(listener.name, "listener5")
+        song = await channel.get_song_by_id(701)
+        self.assertIs(song.album, album)
+        self.assertIs(await channel.get_song_by_id(701), song)
+
+    async def test_schedule(self) -> None:
+        channel = (await self.rw.channels())[0]
+        current = await channel.schedule_current()
+        self.assertEqual(current.id, 10)
+        self.assertEqual([e.id for e in await channel.schedule_next()], [11, 12])
+        history = await channel.schedule_history()
+        self.assertEqual([e.id for e in history], [9, 8, 7, 6, 5])
+        self.assertEqual(self.rw.client.transfer_stats["info"]["calls"], 1)
+
+
+class TestCatalog(FixtureTestCase):
+    def test_album_songs(self) -> None:
+        chan = self.client().channels[0]
+        raw_songs = [{"id": 701, "title": "One"}, {"id": 702, "title": "Two"}]
+        album = rainwaveclient.RainwaveAlbum(chan, {"id": 7, "songs": raw_songs})
+        first, second = album.songs
+        calls = self.api.calls["song"]
+        self.assertEqual(first.rating_count, 30 + 701 % 50)
+        self.assertEqual(self.api.calls["song"], calls + 1)
+        self.assertIs(chan.get_song_by_id(701), first)
+        # a song already looked up by ID takes the place of the album's copy
+        cached = chan.get_song_by_id(702)
+        self.assertEqual(second.rating_count, cached.rating_count)
+        self.assertIs(album.songs[1], cached)
+
+    def test_cached(self) -> None:
+        chan = self.client().channels[0]
+        album = chan.albums[0]
+        calls = self.api.calls["album"]
+        self.assertIs(chan.get_album_by_id(album.id), album)
+        self.assertEqual(self.api.calls["album"], calls)
+        chan.cache.invalidate("album", album.id)
+        fresh = chan.get_album_by_id(album.id)
+        self.assertIsNot(fresh, album)
+        self.assertIs(chan.get_album_by_id(album.id), fresh)
+        self.assertEqual(self.api.calls["album"], calls + 1)
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        names = ["Chrono Trigger", "Chrono Cross", "Final Fantasy VI", "Secret of Mana"]
+        self.albums = [
+            rainwaveclient.RainwaveAlbum(None, {"id": i, "name": name})
+            for i, name in enumerate(names, 1)
+        ]
+        self.artists = [
+            rainwaveclient.RainwaveArtist(None, {"id": 1, "name": "Yasunori Mitsuda"}),
+            rainwaveclient.RainwaveArtist(None, {"id": 2, "name": "Nobuo Uematsu"}),
+        ]
+        self.song = rainwaveclient.RainwaveSong(
+            self.albums[0], {"id": 1, "title": "Corridors of Time"}
+        )
+        self.search = rainwaveclient.RainwaveSearch()
+        self.search.sync("album", self.albums)
+        self.search.sync("artist", self.artists)
+        self.search.add("song", self.song)
+
+    def top(self, query: str, kinds: list[str] | None = None) -> object:
+        return self.search.search(query, kinds=kinds)[0].item
+
+    def test_typo(self) -> None:
+        self.assertIs(self.top("chrono trigegr"), self.albums[0])
+        self.assertIs(self.top("nobuo uematsy"), self.artists[1])
+
+    def test_prefix(self) -> None:
+        self.assertIs(self.top("secret of ma"), self.albums[3])
+        self.assertIs(self.top("corridors of ti"), self.song)
+
+    def test_multi_word(self) -> None:
+        self.assertIs(self.top("cross chrono"), self.albums[1])
+        self.assertIs(self.top("fantasy final vi"), self.albums[2])
+        self.assertEqual(self.search.search("chrono", kinds=["artist"]), [])
+
+    def test_sync(self) -> None:
+        self.search.sync("album", self.albums[1:])
+        results = self.search.search("chrono trigger corridors of time")
+        found = {(r.kind, r.item.id) for r in results}
+        self.assertIn(("album", 2), found)
+        self.assertNotIn(("album", 1), found)
+        self.assertNotIn(("song", 1), found)
+
+
+class TestSignal(unittest.TestCase):
+    def test_queued(self) -> None:
+        signal = rainwaveclient.dispatch.Signal()
+        release = threading.Event()
+        received = {"oldest": [], "latest": []}
+
+        def oldest(signal: object, sender: object, n: int) -> None:
+            release.wait(5)
+            received["oldest"].append(n)
+
+        def latest(signal: object, sender: object, n: int) -> None:
+            release.wait(5)
+            received["latest"].append(n)
+
+        signal.connect(
+            oldest, queue_size=2, overflow=rainwaveclient.dispatch.DROP_OLDEST
+        )
+        signal.connect(latest, queue_size=2, overflow=rainwaveclient.dispatch.LATEST)
+        signal.send(None, n=0)
+        time.sleep(0.1)
+        for n in range(1, 6):
+            signal.send(None, n=n)
+        release.set()
+        self.assertTrue(signal.join(5))
+        self.assertEqual(received["oldest"], [0, 4, 5])
+        self.assertEqual(received["latest"], [0, 5])
+        stats = signal.stats
+        self.assertEqual(stats[f"{__name__}.{oldest.__qualname__}"]["dropped"], 3)
+        self.assertEqual(stats[f"{__name__}.{latest.__qualname__}"]["delivered"], 2)
+
+
+class TestTimelineDiff(unittest.TestCase):
+    @staticmethod
+    def event(event_id: int, votes: int = 0) -> dict:
+        album = {"id": event_id, "name": f"Album {event_id}"}
+        songs = [
+            {
+                "id": 10 * event_id + i,
+                "entry_id": i,
+                "entry_votes": votes,
+                "albums": [album],
+            }
+            for i in (1, 2)
+        ]
+        return {"id": event_id, "type": "Election", "songs": songs}
+
+    def test_diff(self) -> None:
+        old = {
+            "sched_current": self.event(1),
+            "sched_next": [self.event(2)],
+            "sched_history": [self.event(0)],
+            "request_line": [
+                {"user_id": 7, "position": 1},
+                {"user_id": 8, "position": 2},
+            ],
+        }
+        new = {
+            "sched_current": self.event(2, votes=3),
+            "sched_next": [self.event(3)],
+            "sched_history": [self.event(1)],
+            "request_line": [{"user_id": 8, "position": 1}],
+        }
+        diff = rainwaveclient.timeline.diff_timeline(old, new)
+        self.assertEqual(diff.current["id"], 2)
+        self.assertEqual([e["id"] for e in diff.events_added], [3])
+        self.assertEqual([e["id"] for e in diff.events_removed], [0])
+        self.assertEqual(diff.events_changed, [])
+        self.assertEqual(
+            [(e, s["entry_id"]) for e, s in diff.candidates_changed], [(2, 1), (2, 2)]
+        )
+        self.assertEqual(diff.requests_removed, [{"user_id": 7, "position": 1}])
+        self.assertEqual(diff.requests_changed, [{"user_id": 8, "position": 1}])
+        self.assertFalse(diff.empty)
+        self.assertTrue(rainwaveclient.timeline.diff_timeline(new, new).empty)
+
+    def test_timeline_objects(self) -> None:
+        rw = rainwaveclient.RainwaveClient(USER_ID, KEY)
+        chan = rainwaveclient.RainwaveChannel(rw, {"id": 1, "name": "Game"})
+        current = dict(self.event(1), end=time.time() + 60)
+        timeline = {
+            "sched_current": current,
+            "sched_next": [self.event(2)],
+            "sched_history": [],
+            "request_line": [],
+            "requests": [],
+        }
+        chan._update_timeline(timeline)
+        election = chan.schedule_current
+        self.assertIs(chan.timeline.current, election)
+        self.assertIs(chan.schedule_next[0], chan.schedule_next[0])
+        with chan._sched_lock:
+            # readers do not wait for an update in progress
+            self.assertIs(chan.schedule_current, election)
+        candidates = election.candidates
+        self.assertIs(election.candidates, candidates)
+        chan._update_timeline(dict(timeline, sched_current=dict(current)))
+        self.assertIsNot(chan.schedule_current, election)
+        # a new timeline gets new candidates and leaves the old ones alone
+        self.assertIsNot(chan.schedule_current.candidates[0], candidates[0])
+        self.assertIs(candidates[0].election, election)
+
 
 class TestRainwaveChannel(unittest.TestCase):
     rw = rainwaveclient.RainwaveClient(USER_ID, KEY)
@@ -74,6 +809,12 @@ class TestRainwaveChannel(unittest.TestCase):
     def test_albums(self) -> None:
         self.assertTrue(len(self.chan.albums) > 1)
 
+    def test_album_stats(self) -> None:
+        stats = self.chan.album_stats()
+        self.assertEqual(len(stats["id"]), len(self.chan.albums))
+        self.assertEqual(stats["id"][0], self.chan.albums[0].id)
+        self.assertEqual(stats["rating"].typecode, "d")
+
     def test_artists(self) -> None:
         self.assertTrue(len(self.chan.artists) > 1)
 
@@ -95,11 +836,34 @@ class TestRainwaveChannel(unittest.TestCase):
         alb = self.chan.get_album_by_id(3324)
         self.assertEqual(alb.name, "2")
 
+    def test_get_album_by_id_cached(self) -> None:
+        # a new channel, so the album is fetched rather than taken from the catalog
+        chan = rainwaveclient.RainwaveClient(USER_ID, KEY).channels[4]
+        alb = chan.get_album_by_id(3324)
+        hits = chan.cache.stats["hits"]
+        self.assertIs(chan.get_album_by_id(3324), alb)
+        self.assertEqual(chan.cache.stats["hits"], hits + 1)
+
+    def test_get_album_by_id_catalog(self) -> None:
+        albums = {album.id: album for album in self.chan.albums}
+        self.assertIs(self.chan.get_album_by_id(3324), albums[3324])
+
     def test_get_album_by_name(self) -> None:
         self.assertRaises(IndexError, self.chan.get_album_by_name, "Mega Ran")
         alb = self.chan.get_album_by_name("2")
         self.assertEqual(alb.id, 3324)
 
+    def test_find_albums(self) -> None:
+        self.assertIn(self.chan.get_album_by_name("2"), self.chan.find_albums(" 2 "))
+        albums = self.chan.find_albums_by_prefix("final fantasy", limit=5)
+        self.assertTrue(0 < len(albums) <= 5)
+        self.assertTrue(all(a.name.lower().startswith("final fantasy") for a in albums))
+
+    def test_search(self) -> None:
+        results = self.chan.search("fnial fantasy", kinds=["album"])
+        self.assertTrue(len(results) > 0)
+        self.assertIn("final fantasy", results[0].item.name.lower())
+
     def test_get_artist_by_id(self) -> None:
         self.assertRaises(IndexError, self.chan.get_artist_by_id, 1)
         artist = self.chan.get_artist_by_id(22844)
@@ -121,6 +885,13 @@ class TestRainwaveChannel(unittest.TestCase):
         song = self.chan.get_song_by_id(8151)
         self.assertEqual(song.title, "This Treasure")
 
+    def test_get_songs_by_ids(self) -> None:
+        songs = self.chan.get_songs_by_ids([8151, 9999999, 8151])
+        self.assertEqual(len(songs), 3)
+        self.assertEqual(songs[0].title, "This Treasure")
+        self.assertIsInstance(songs[1], IndexError)
+        self.assertEqual(songs[2].id, 8151)
+
     def test_id(self) -> None:
         self.assertEqual(self.chan.id, 5)
 
@@ -143,10 +914,18 @@ class TestRainwaveChannel(unittest.TestCase):
     def test_requests(self) -> None:
         self.assertTrue(len(self.chan.requests) > 0)
 
+    def test_requests_requester(self) -> None:
+        rq = self.chan.requests[0]
+        self.assertEqual(rq.requester_name, rq.requester.name)
+
     def test_schedule_current(self) -> None:
         title = self.chan.schedule_current.songs[0].title
         self.assertIsInstance(title, str)
 
+    def test_schedule_current_candidates_reused(self) -> None:
+        candidates = self.chan.schedule_current.candidates
+        self.assertIs(self.chan.schedule_current.candidates[0], candidates[0])
+
     def test_schedule_history(self) -> None:
         title = self.chan.schedule_history[0].songs[0].title
         self.assertIsInstance(title, str)
@@ -252,6 +1031,21 @@ class TestRainwaveAlbum(unittest.TestCase):
     def test_songs(self) -> None:
         self.assertTrue(len(self.alb.songs) > 0)
 
+    def test_songs_album(self) -> None:
+        song = self.alb.songs[0]
+        self.assertIs(song.album, self.alb)
+        self.assertIsInstance(song.rating_count, int)
+
+    def test_songs_cached(self) -> None:
+        song = self.alb.songs[-1]
+        self.assertIsInstance(song.rating_count, int)
+        self.assertIs(self.alb.channel.get_song_by_id(song.id), song)
+
+    def test_songs_not_duplicated(self) -> None:
+        songs = self.alb.songs
+        self.assertIs(self.alb["songs"], songs)
+        self.assertIsNone(self.alb.channel._raw_albums)
+
     def test_str(self) -> None:
         self.assertIsInstance(str(self.alb), str)
 